@@ -1,8 +1,19 @@
 #include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
+#include <pybind11/stl.h>
 #include "personaje.h"
+#include "entidades.h"
+#include "tienda.h"
+#include "misiones.h"
 
 namespace py = pybind11;
 
+// Vista NumPy (sin copia) sobre un arreglo del EntityStore; "dueno" mantiene vivo al store
+template <typename T>
+py::array_t<T> vista(const EntityStore& store, std::vector<T>& datos, py::handle dueno) {
+    return py::array_t<T>({ store.size() }, { sizeof(T) }, datos.data(), dueno);
+}
+
 PYBIND11_MODULE(personaje, m) {
     m.doc() = "Módulo de Personaje expuesto con Pybind11";
 
@@ -19,4 +30,150 @@ PYBIND11_MODULE(personaje, m) {
             "Atributo público que representa el movimiento del personaje")
         .def_readwrite("dinero", &Personaje::dinero,
             "Cantidad de dinero del personaje");
-}
\ No newline at end of file
+
+    py::class_<EntityStore>(m, "EntityStore")
+        // Constructor
+        .def(py::init<std::size_t>(), py::arg("capacidad"))
+
+        .def("agregar", &EntityStore::agregar,
+            py::arg("x"), py::arg("y"), py::arg("vx") = 0.0f, py::arg("vy") = 0.0f,
+            py::arg("dinero") = 0, py::arg("movimiento") = 0,
+            "Agrega una entidad y devuelve su índice")
+        .def("quitar", &EntityStore::quitar, py::arg("indice"),
+            "Quita una entidad moviendo la última a su lugar; devuelve el índice antiguo de la movida")
+
+        // Avanza todas las entidades sin el GIL
+        .def("step", &EntityStore::step, py::arg("dt"),
+            py::call_guard<py::gil_scoped_release>(),
+            "Avanza la posición de todas las entidades en movimiento")
+
+        // Instantáneas binarias para las partidas guardadas
+        .def("exportar", [](const EntityStore& s) { return py::bytes(s.exportar()); },
+            "Instantánea binaria de las entidades vivas")
+        .def("importar", &EntityStore::importar, py::arg("datos"),
+            "Reemplaza las entidades por las de una instantánea")
+
+        .def("__len__", &EntityStore::size)
+        .def_property_readonly("capacidad", &EntityStore::capacidad)
+
+        // Vistas NumPy sobre los arreglos contiguos (escribibles, sin copia)
+        .def_property_readonly("x", [](py::object self) {
+            EntityStore& s = self.cast<EntityStore&>();
+            return vista(s, s.x, self);
+        })
+        .def_property_readonly("y", [](py::object self) {
+            EntityStore& s = self.cast<EntityStore&>();
+            return vista(s, s.y, self);
+        })
+        .def_property_readonly("vx", [](py::object self) {
+            EntityStore& s = self.cast<EntityStore&>();
+            return vista(s, s.vx, self);
+        })
+        .def_property_readonly("vy", [](py::object self) {
+            EntityStore& s = self.cast<EntityStore&>();
+            return vista(s, s.vy, self);
+        })
+        .def_property_readonly("dinero", [](py::object self) {
+            EntityStore& s = self.cast<EntityStore&>();
+            return vista(s, s.dinero, self);
+        })
+        .def_property_readonly("movimiento", [](py::object self) {
+            EntityStore& s = self.cast<EntityStore&>();
+            return vista(s, s.movimiento, self);
+        });
+
+    py::class_<Producto, std::shared_ptr<Producto>>(m, "Producto")
+        .def(py::init<std::string, double>(), py::arg("nombre"), py::arg("precio"))
+        .def_property_readonly("nombre", &Producto::getNombre)
+        .def_property_readonly("precio", &Producto::getPrecio)
+        .def_property_readonly("tipo", &Producto::getTipo)
+        .def_property_readonly("id", &Producto::getId,
+            "Id asignado por la Tienda (-1 si no está en ninguna)");
+
+    py::class_<Bien, Producto, std::shared_ptr<Bien>>(m, "Bien")
+        .def(py::init<std::string, double>(), py::arg("nombre"), py::arg("precio"));
+
+    py::class_<Servicio, Producto, std::shared_ptr<Servicio>>(m, "Servicio")
+        .def(py::init<std::string, double>(), py::arg("nombre"), py::arg("precio"));
+
+    py::class_<Transaccion>(m, "Transaccion")
+        .def_readonly("compra", &Transaccion::compra)
+        .def_readonly("id_producto", &Transaccion::id_producto)
+        .def_readonly("cantidad", &Transaccion::cantidad)
+        .def_readonly("precio_unitario", &Transaccion::precio_unitario)
+        .def_readonly("total", &Transaccion::total);
+
+    py::class_<Tienda>(m, "Tienda")
+        // Constructor
+        .def(py::init<>())
+
+        // Catálogo indexado por id y por nombre
+        .def("agregar_producto", &Tienda::agregarProducto, py::arg("producto"),
+            "Agrega un producto al catálogo y devuelve su id (ValueError si ya está en una tienda)")
+        .def("buscar", &Tienda::buscar, py::arg("id"),
+            "Producto con ese id (None si no existe)")
+        .def("buscar_por_nombre", &Tienda::buscarPorNombre, py::arg("nombre"),
+            "Producto con ese nombre (None si no existe)")
+        .def("__len__", &Tienda::cantidadProductos)
+
+        // Compras por carrito completo
+        .def("precio_carrito", &Tienda::precioCarrito, py::arg("carrito"),
+            "Precio total de un carrito [(id, cantidad)]")
+        .def("comprar_carrito", &Tienda::comprarCarrito, py::arg("comprador"), py::arg("carrito"),
+            "Compra un carrito [(id, cantidad)] cobrando a comprador.dinero; todo o nada")
+        .def("comprar_carrito_por_nombre", &Tienda::comprarCarritoPorNombre,
+            py::arg("comprador"), py::arg("carrito"),
+            "Igual que comprar_carrito pero con [(nombre, cantidad)]")
+
+        // Registro de transacciones y agregados calculados en C++
+        .def_property_readonly("registro", &Tienda::getRegistro)
+        .def("total_gastado", &Tienda::totalGastado)
+        .def("numero_compras", &Tienda::numeroCompras)
+        .def("unidades_por_producto", &Tienda::unidadesPorProducto)
+        .def("ingresos_por_producto", &Tienda::ingresosPorProducto);
+
+    py::enum_<TipoEvento>(m, "TipoEvento")
+        .value("OBJETO_RECOGIDO", TipoEvento::ObjetoRecogido)
+        .value("NPC_HABLADO", TipoEvento::NpcHablado)
+        .value("COMPRA_RECHAZADA", TipoEvento::CompraRechazada)
+        .value("DINERO_GASTADO", TipoEvento::DineroGastado);
+
+    py::class_<mision>(m, "Mision")
+        // Constructor
+        .def(py::init<std::string, std::string, int, TipoEvento, std::string, int>(),
+            py::arg("descripcion"), py::arg("nombre"), py::arg("recompensa"),
+            py::arg("evento"), py::arg("objetivo") = "", py::arg("requerido") = 1)
+
+        .def("completar", &mision::completar,
+            "Marca la misión como completada y devuelve la recompensa")
+        .def("preguntafinal", &mision::preguntafinal,
+            "True si la misión está completada")
+        .def_property_readonly("nombre", &mision::getNombre)
+        .def_property_readonly("descripcion", &mision::getDescripcion)
+        .def_property_readonly("recompensa", &mision::getRecompensa)
+        .def_property_readonly("evento", &mision::getEvento)
+        .def_property_readonly("objetivo", &mision::getObjetivo)
+        .def_property_readonly("requerido", &mision::getRequerido)
+        .def_property_readonly("progreso", &mision::getProgreso);
+
+    py::class_<MotorMisiones>(m, "MotorMisiones")
+        // Constructor
+        .def(py::init<>())
+
+        .def("agregar", &MotorMisiones::agregar, py::arg("mision"),
+            "Agrega una misión, la suscribe a su evento y devuelve su id")
+        .def("emitir", &MotorMisiones::emitir,
+            py::arg("tipo"), py::arg("clave") = "", py::arg("cantidad") = 1,
+            py::arg("beneficiario") = nullptr,
+            "Emite un evento y devuelve los ids de las misiones completadas; "
+            "si hay beneficiario se le suma la recompensa")
+        .def("obtener", &MotorMisiones::obtener, py::arg("id"),
+            py::return_value_policy::copy)
+        .def("activas", &MotorMisiones::activas, py::arg("tipo"),
+            "Cantidad de misiones suscritas a ese tipo de evento")
+        .def("exportar_estado", [](const MotorMisiones& motor) { return py::bytes(motor.exportarEstado()); },
+            "Progreso y completado de todas las misiones, en binario")
+        .def("importar_estado", &MotorMisiones::importarEstado, py::arg("datos"),
+            "Restaura un estado exportado y rehace las suscripciones")
+        .def("__len__", &MotorMisiones::size);
+}
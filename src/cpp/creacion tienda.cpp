@@ -1,73 +1,144 @@
-#include "personaje.h"
+#include "tienda.h"
+#include <cmath>
 #include <iostream>
-#include <vector>
-#include <memory>
+#include <stdexcept>
 using namespace std;
 
-// Clase base Producto
-class Producto {
-protected:
-    string nombre;
-    double precio;
-public:
-    Producto(string n, double p) : nombre(n), precio(p) {}
-    virtual ~Producto() {}
-    virtual void mostrar() const { // Mostrar datos genéricos
-        cout << "Producto: " << nombre << " | Precio: " << precio << endl;
-    }
-    virtual double getPrecio() const { return precio; } // Retorna precio
-    virtual string getNombre() const { return nombre; } // Retorna nombre
-};
-
-// Clase Bien (hereda de Producto)
-class Bien : public Producto {
-public:
-    Bien(string n, double p) : Producto(n, p) {}
-    void mostrar() const override { // Muestra tipo Bien
-        cout << "Bien " << nombre << " | Precio: " << precio << endl;
+Producto::Producto(string n, double p) : nombre(n), precio(p) {}
+
+void Producto::mostrar() const { // Mostrar datos genéricos
+    cout << "Producto: " << nombre << " | Precio: " << precio << endl;
+}
+
+void Bien::mostrar() const { // Muestra tipo Bien
+    cout << "Bien " << nombre << " | Precio: " << precio << endl;
+}
+
+void Servicio::mostrar() const { // Muestra tipo Servicio
+    cout << "Servicio -> " << nombre << " | Tarifa: " << precio << endl;
+}
+
+int Tienda::agregarProducto(shared_ptr<Producto> p) { // Agrega productos
+    // El id es el índice en esta tienda: un producto de otra tienda perdería el suyo
+    if (p->id != -1) {
+        throw invalid_argument("El producto " + p->getNombre() + " ya pertenece a una tienda");
     }
-};
-
-// Clase Servicio (hereda de Producto)
-class Servicio : public Producto {
-public:
-    Servicio(string n, double p) : Producto(n, p) {}
-    void mostrar() const override { // Muestra tipo Servicio
-        cout << "Servicio -> " << nombre << " | Tarifa: " << precio << endl;
+    if (indice_nombres.count(p->getNombre())) {
+        throw invalid_argument("Ya existe un producto con el nombre " + p->getNombre());
     }
-};
-
-// Clase Tienda (gestiona productos y compras)
-class Tienda {
-private:
-    vector<shared_ptr<Producto>> productos; // Lista de productos
-    double totalCompras = 0; // Acumulado de compras
-public:
-    void agregarProducto(shared_ptr<Producto> p) { // Agrega productos
-        productos.push_back(p);
+    p->id = (int)productos.size();
+    productos.push_back(p);
+    indice_nombres[p->getNombre()] = p->id;
+    return p->id;
+}
+
+shared_ptr<Producto> Tienda::buscar(int id) const {
+    if (id < 0 || id >= (int)productos.size()) {
+        return nullptr;
     }
-    void mostrarProductos() { // Muestra lista de productos
-        cout << "\n--- Lista de productos y servicios disponibles ---\n";
-        for (size_t i = 0; i < productos.size(); i++) {
-            cout << i + 1 << ". ";
-            productos[i]->mostrar();
+    return productos[id];
+}
+
+shared_ptr<Producto> Tienda::buscarPorNombre(const string& nombre) const {
+    auto it = indice_nombres.find(nombre);
+    return it == indice_nombres.end() ? nullptr : productos[it->second];
+}
+
+double Tienda::precioCarrito(const vector<pair<int, int>>& carrito) const {
+    double total = 0;
+    for (const auto& linea : carrito) {
+        if (!buscar(linea.first)) {
+            throw out_of_range("Producto inexistente: " + to_string(linea.first));
         }
-    }
-    void comprarProducto(int indice) { // Comprar producto por índice
-        if (indice >= 1 && indice <= (int)productos.size()) {
-            totalCompras += productos[indice - 1]->getPrecio();
-            cout << "Has comprado: " << productos[indice - 1]->getNombre()
-                << " por " << productos[indice - 1]->getPrecio() << endl;
+        if (linea.second <= 0) {
+            throw invalid_argument("La cantidad debe ser positiva");
         }
-        else {
-            cout << "Opción no válida.\n";
+        total += productos[linea.first]->getPrecio() * linea.second;
+    }
+    return total;
+}
+
+bool Tienda::comprarCarrito(Personaje& comprador, const vector<pair<int, int>>& carrito) {
+    if (carrito.empty()) {
+        return false; // Un carrito vacío no es una compra
+    }
+    double total = precioCarrito(carrito); // Valida todo el carrito antes de cobrar
+    int coste = (int)lround(total);
+    if (comprador.dinero < coste) {
+        return false;
+    }
+    comprador.dinero -= coste;
+    totalCompras += coste;
+    compras++;
+    // Se registra lo cobrado de verdad: el redondeo se reparte entre las líneas
+    // (cada una lleva la diferencia del acumulado redondeado), así la suma del
+    // registro es exactamente el coste descontado al comprador
+    double acumulado = 0;
+    long cobrado = 0;
+    for (const auto& linea : carrito) {
+        double precio = productos[linea.first]->getPrecio();
+        acumulado += precio * linea.second;
+        long hasta_aqui = lround(acumulado);
+        registro.push_back({ compras, linea.first, linea.second, precio, (double)(hasta_aqui - cobrado) });
+        cobrado = hasta_aqui;
+    }
+    return true;
+}
+
+bool Tienda::comprarCarritoPorNombre(Personaje& comprador, const vector<pair<string, int>>& carrito) {
+    vector<pair<int, int>> por_id;
+    por_id.reserve(carrito.size());
+    for (const auto& linea : carrito) {
+        auto it = indice_nombres.find(linea.first);
+        if (it == indice_nombres.end()) {
+            throw out_of_range("Producto inexistente: " + linea.first);
         }
+        por_id.emplace_back(it->second, linea.second);
+    }
+    return comprarCarrito(comprador, por_id);
+}
+
+unordered_map<int, int> Tienda::unidadesPorProducto() const {
+    unordered_map<int, int> unidades;
+    for (const auto& t : registro) {
+        unidades[t.id_producto] += t.cantidad;
     }
-    void mostrarTotal() const { // Muestra total gastado
-        cout << "\nTotal de la compra: " << totalCompras << endl;
+    return unidades;
+}
+
+unordered_map<int, double> Tienda::ingresosPorProducto() const {
+    unordered_map<int, double> ingresos;
+    for (const auto& t : registro) {
+        ingresos[t.id_producto] += t.total;
     }
-};
+    return ingresos;
+}
+
+void Tienda::mostrarProductos() const { // Muestra lista de productos
+    cout << "\n--- Lista de productos y servicios disponibles ---\n";
+    for (size_t i = 0; i < productos.size(); i++) {
+        cout << i + 1 << ". ";
+        productos[i]->mostrar();
+    }
+}
+
+void Tienda::comprarProducto(int indice) { // Comprar producto por índice
+    if (indice >= 1 && indice <= (int)productos.size()) {
+        totalCompras += productos[indice - 1]->getPrecio();
+        cout << "Has comprado: " << productos[indice - 1]->getNombre()
+            << " por " << productos[indice - 1]->getPrecio() << endl;
+    }
+    else {
+        cout << "Opción no válida.\n";
+    }
+}
+
+void Tienda::mostrarTotal() const { // Muestra total gastado
+    cout << "\nTotal de la compra: " << totalCompras << endl;
+}
 
+// Demo de consola (no forma parte del módulo): compilar con -DTIENDA_CONSOLA
+#ifdef TIENDA_CONSOLA
 int main() {
     Tienda tienda;
     // Se agregan bienes
@@ -92,3 +163,4 @@ int main() {
     tienda.mostrarTotal(); // Mostrar total al final
     return 0;
 }
+#endif
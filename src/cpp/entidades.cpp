@@ -0,0 +1,97 @@
+#include "entidades.h"
+#include <cstdint>
+#include <cstring>
+#include <stdexcept>
+using namespace std;
+
+EntityStore::EntityStore(size_t capacidad)
+    : x(capacidad), y(capacidad), vx(capacidad), vy(capacidad),
+      dinero(capacidad), movimiento(capacidad), cantidad(0) {}
+
+size_t EntityStore::agregar(float px, float py, float pvx, float pvy, int pdinero, int pmovimiento) {
+    if (cantidad == capacidad()) {
+        throw length_error("EntityStore lleno");
+    }
+    size_t i = cantidad++;
+    x[i] = px;
+    y[i] = py;
+    vx[i] = pvx;
+    vy[i] = pvy;
+    dinero[i] = pdinero;
+    movimiento[i] = pmovimiento;
+    return i;
+}
+
+size_t EntityStore::quitar(size_t indice) {
+    if (indice >= cantidad) {
+        throw out_of_range("Índice de entidad fuera de rango");
+    }
+    size_t ultima = --cantidad;
+    x[indice] = x[ultima];
+    y[indice] = y[ultima];
+    vx[indice] = vx[ultima];
+    vy[indice] = vy[ultima];
+    dinero[indice] = dinero[ultima];
+    movimiento[indice] = movimiento[ultima];
+    return ultima;
+}
+
+void EntityStore::step(float dt) {
+    // Bucle plano sobre arreglos contiguos (el compilador lo puede vectorizar)
+    float* px = x.data();
+    float* py = y.data();
+    const float* pvx = vx.data();
+    const float* pvy = vy.data();
+    const int* pmov = movimiento.data();
+    for (size_t i = 0; i < cantidad; i++) {
+        float activo = pmov[i] != 0 ? 1.0f : 0.0f;
+        px[i] += pvx[i] * dt * activo;
+        py[i] += pvy[i] * dt * activo;
+    }
+}
+
+
+// Bytes por entidad en la instantánea: los seis campos uno tras otro
+static const size_t BYTES_ENTIDAD = 4 * sizeof(float) + 2 * sizeof(int);
+
+string EntityStore::exportar() const {
+    uint32_t n = (uint32_t)cantidad;
+    string datos(sizeof(n) + cantidad * BYTES_ENTIDAD, '\0');
+    char* p = &datos[0];
+    memcpy(p, &n, sizeof(n));
+    p += sizeof(n);
+    // Copias en bloque de cada arreglo contiguo
+    for (const vector<float>* campo : { &x, &y, &vx, &vy }) {
+        memcpy(p, campo->data(), cantidad * sizeof(float));
+        p += cantidad * sizeof(float);
+    }
+    for (const vector<int>* campo : { &dinero, &movimiento }) {
+        memcpy(p, campo->data(), cantidad * sizeof(int));
+        p += cantidad * sizeof(int);
+    }
+    return datos;
+}
+
+void EntityStore::importar(const string& datos) {
+    uint32_t n = 0;
+    if (datos.size() < sizeof(n)) {
+        throw invalid_argument("Instantánea de entidades incompleta");
+    }
+    memcpy(&n, datos.data(), sizeof(n));
+    if (datos.size() != sizeof(n) + n * BYTES_ENTIDAD) {
+        throw invalid_argument("Instantánea de entidades con tamaño incorrecto");
+    }
+    if (n > capacidad()) {
+        throw length_error("La instantánea no cabe en el EntityStore");
+    }
+    const char* p = datos.data() + sizeof(n);
+    for (vector<float>* campo : { &x, &y, &vx, &vy }) {
+        memcpy(campo->data(), p, n * sizeof(float));
+        p += n * sizeof(float);
+    }
+    for (vector<int>* campo : { &dinero, &movimiento }) {
+        memcpy(campo->data(), p, n * sizeof(int));
+        p += n * sizeof(int);
+    }
+    cantidad = n;
+}
@@ -1,48 +1,180 @@
+#include "misiones.h"
+#include <algorithm>
+#include <cstdint>
+#include <cstring>
 #include <iostream>
-#include <stdlib.h>
+#include <stdexcept>
 using namespace std;
 
-class mision {
-private:
-    string nombre;
-    string descripcion;
-    int recompensa;
-    bool completada;
+mision::mision(string d, string n, int r)
+    : mision(d, n, r, TipoEvento::ObjetoRecogido, "", 1) {}
+
+mision::mision(string d, string n, int r, TipoEvento e, string obj, int req) {
+    nombre = n;
+    descripcion = d;
+    recompensa = r;
+    completada = false;
+    evento = e;
+    objetivo = obj;
+    requerido = req;
+    progreso = 0;
+}
+
+void mision::mostrarmision() const {
+
+    cout << "Mision: " << nombre << endl;
+    cout << "Descripcion :" << descripcion << endl;
+    cout << "Recompensa: " << recompensa << endl;
+    cout << "Estado: " << (completada ? "Completada" : "No completada") << endl;
+}
 
-public:
-    mision(string  d, string n, int r) {
-        nombre = n;
-        descripcion = d;
-        recompensa = r;
-        completada = false;
+int mision::completar() {
+    if (!completada) {
+        completada = true;
+        progreso = max(progreso, requerido);
+        return recompensa; // parte mas importante ya que devuelve los puntasos al player (ojo importante el manejo)
     }
-    void mostrarmision() {
+    else {
 
-        cout << "Mision: " << nombre << endl;
-        cout << "Descripcion :" << descripcion << endl;
-        cout << "Recompensa: " << recompensa << endl;
-        cout << "Estado: " << (completada ? "Completada" : "No completada") << endl;
+        cout << "Ya habías completado esta misión." << endl;
+        return 0;
     }
+}
 
-    int completar() {
-        if (!completada) {
-            completada = true;
-            return recompensa; // parte mas importante ya que devuelve los puntasos al player (ojo importante el manejo)
+bool mision::registrar(int cantidad) {
+    if (completada) {
+        return false;
+    }
+    progreso += cantidad;
+    return progreso >= requerido;
+}
+
+void mision::restaurar(int p, bool c) {
+    progreso = p;
+    completada = c;
+}
+
+int MotorMisiones::agregar(const mision& m) {
+    int id = (int)misiones.size();
+    misiones.push_back(m);
+    if (!m.preguntafinal()) {
+        suscripciones[(int)m.getEvento()][m.getObjetivo()].push_back(id);
+    }
+    return id;
+}
+
+void MotorMisiones::desuscribir(int id) {
+    const mision& m = misiones[id];
+    auto& lista = suscripciones[(int)m.getEvento()][m.getObjetivo()];
+    auto it = find(lista.begin(), lista.end(), id);
+    if (it != lista.end()) {
+        *it = lista.back();
+        lista.pop_back();
+    }
+}
+
+void MotorMisiones::despachar(vector<int>& lista, int cantidad, vector<int>& completadas) {
+    for (int id : lista) {
+        if (misiones[id].registrar(cantidad)) {
+            completadas.push_back(id);
         }
-        else {
+    }
+}
+
+vector<int> MotorMisiones::emitir(TipoEvento tipo, const string& clave, int cantidad, Personaje* beneficiario) {
+    if (cantidad <= 0) {
+        throw invalid_argument("La cantidad del evento debe ser positiva");
+    }
+    vector<int> completadas;
+    auto por_tipo = suscripciones.find((int)tipo);
+    if (por_tipo == suscripciones.end()) {
+        return completadas;
+    }
 
-            cout << "Ya habías completado esta misión." << endl;
-            return 0;
+    // Misiones de esa clave concreta y misiones de "cualquier clave"
+    auto exacta = por_tipo->second.find(clave);
+    if (exacta != por_tipo->second.end()) {
+        despachar(exacta->second, cantidad, completadas);
+    }
+    if (!clave.empty()) {
+        auto cualquiera = por_tipo->second.find("");
+        if (cualquiera != por_tipo->second.end()) {
+            despachar(cualquiera->second, cantidad, completadas);
         }
     }
 
-    bool preguntafinal() {
+    // Se desuscriben después de despachar para no invalidar las listas recorridas
+    for (int id : completadas) {
+        int puntos = misiones[id].completar();
+        desuscribir(id);
+        if (beneficiario) {
+            beneficiario->dinero += puntos;
+        }
+    }
+    return completadas;
+}
+
+const mision& MotorMisiones::obtener(int id) const {
+    if (id < 0 || id >= (int)misiones.size()) {
+        throw out_of_range("Misión inexistente: " + to_string(id));
+    }
+    return misiones[id];
+}
+
+string MotorMisiones::exportarEstado() const {
+    uint32_t n = (uint32_t)misiones.size();
+    string datos(sizeof(n) + misiones.size() * 5, '\0');
+    char* p = &datos[0];
+    memcpy(p, &n, sizeof(n));
+    p += sizeof(n);
+    for (const mision& m : misiones) {
+        int32_t progreso = m.getProgreso();
+        memcpy(p, &progreso, sizeof(progreso));
+        p[4] = m.preguntafinal() ? 1 : 0;
+        p += 5;
+    }
+    return datos;
+}
+
+void MotorMisiones::importarEstado(const string& datos) {
+    uint32_t n = 0;
+    if (datos.size() < sizeof(n)) {
+        throw invalid_argument("Estado de misiones incompleto");
+    }
+    memcpy(&n, datos.data(), sizeof(n));
+    if (n != misiones.size() || datos.size() != sizeof(n) + n * 5) {
+        throw invalid_argument("El estado guardado no corresponde a estas misiones");
+    }
+    const char* p = datos.data() + sizeof(n);
+    for (mision& m : misiones) {
+        int32_t progreso;
+        memcpy(&progreso, p, sizeof(progreso));
+        m.restaurar(progreso, p[4] != 0);
+        p += 5;
+    }
 
-        return completada;
+    // Las suscripciones se rehacen: solo las misiones sin completar escuchan eventos
+    suscripciones.clear();
+    for (int id = 0; id < (int)misiones.size(); id++) {
+        if (!misiones[id].preguntafinal()) {
+            suscripciones[(int)misiones[id].getEvento()][misiones[id].getObjetivo()].push_back(id);
+        }
     }
-};
+}
 
+size_t MotorMisiones::activas(TipoEvento tipo) const {
+    size_t total = 0;
+    auto por_tipo = suscripciones.find((int)tipo);
+    if (por_tipo != suscripciones.end()) {
+        for (const auto& par : por_tipo->second) {
+            total += par.second.size();
+        }
+    }
+    return total;
+}
 
+// Demo de consola (no forma parte del módulo): compilar con -DMISIONES_CONSOLA
+#ifdef MISIONES_CONSOLA
 int main (){
     mision m1("No comprar innecesario", "Ignora una tentación de compra", 89);
     m1.mostrarmision();
@@ -63,4 +195,4 @@ int main (){
 
     return 0;
 }
-
+#endif
@@ -0,0 +1,46 @@
+#ifndef ENTIDADES_H
+#define ENTIDADES_H
+
+#include <cstddef>
+#include <string>
+#include <vector>
+
+// Almacén structure-of-arrays de entidades (jugador, NPCs, vecinos del pueblo).
+// Cada campo vive en su propio arreglo contiguo de tamaño fijo (capacidad),
+// así los punteros no cambian nunca y Python puede verlos como arrays de NumPy
+// (cada vista tiene el tamaño que tenía el store cuando se pidió).
+class EntityStore {
+public:
+    std::vector<float> x;
+    std::vector<float> y;
+    std::vector<float> vx;          // velocidad en px por unidad de dt
+    std::vector<float> vy;
+    std::vector<int> dinero;
+    std::vector<int> movimiento;    // 0 = quieto, distinto de 0 = en movimiento
+
+    explicit EntityStore(std::size_t capacidad);
+
+    // Agrega una entidad y devuelve su índice (lanza si no hay capacidad)
+    std::size_t agregar(float px, float py, float pvx, float pvy, int pdinero, int pmovimiento);
+
+    // Quita la entidad moviendo la última a su lugar; devuelve el índice
+    // antiguo de la entidad movida (o el mismo índice si era la última)
+    std::size_t quitar(std::size_t indice);
+
+    // Avanza todas las entidades en movimiento
+    void step(float dt);
+
+    // Instantánea binaria de las entidades vivas (para las partidas guardadas):
+    // uint32 cantidad y después cada arreglo completo, en el orden de los campos
+    std::string exportar() const;
+    // Reemplaza todas las entidades por las de una instantánea (lanza si no caben)
+    void importar(const std::string& datos);
+
+    std::size_t size() const { return cantidad; }
+    std::size_t capacidad() const { return x.size(); }
+
+private:
+    std::size_t cantidad;
+};
+
+#endif
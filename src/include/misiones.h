@@ -0,0 +1,82 @@
+#ifndef MISIONES_H
+#define MISIONES_H
+
+#include "personaje.h"
+#include <string>
+#include <unordered_map>
+#include <vector>
+
+// Tipos de evento del juego a los que se puede suscribir una misión
+enum class TipoEvento {
+    ObjetoRecogido,
+    NpcHablado,
+    CompraRechazada,
+    DineroGastado
+};
+
+class mision {
+private:
+    std::string nombre;
+    std::string descripcion;
+    int recompensa;
+    bool completada;
+
+    // Condición de la misión: acumular "requerido" unidades del evento.
+    // objetivo vacío = cualquier clave (cualquier objeto, NPC, compra...)
+    TipoEvento evento;
+    std::string objetivo;
+    int requerido;
+    int progreso;
+
+public:
+    mision(std::string d, std::string n, int r);
+    mision(std::string d, std::string n, int r, TipoEvento e, std::string obj, int req);
+
+    void mostrarmision() const;
+    int completar();
+    bool preguntafinal() const { return completada; }
+
+    // Suma progreso; devuelve true si con esto la misión queda completa
+    bool registrar(int cantidad);
+    // Vuelve a un progreso guardado (sin pagar la recompensa)
+    void restaurar(int p, bool c);
+
+    std::string getNombre() const { return nombre; }
+    std::string getDescripcion() const { return descripcion; }
+    int getRecompensa() const { return recompensa; }
+    TipoEvento getEvento() const { return evento; }
+    std::string getObjetivo() const { return objetivo; }
+    int getRequerido() const { return requerido; }
+    int getProgreso() const { return progreso; }
+};
+
+// Motor de misiones por eventos: un índice (tipo, objetivo) -> misiones activas
+// hace que emitir un evento solo toque las misiones suscritas a él.
+class MotorMisiones {
+private:
+    std::vector<mision> misiones; // El id es el índice
+    std::unordered_map<int, std::unordered_map<std::string, std::vector<int>>> suscripciones;
+
+    void desuscribir(int id);
+    void despachar(std::vector<int>& lista, int cantidad, std::vector<int>& completadas);
+
+public:
+    int agregar(const mision& m); // Agrega y suscribe; devuelve el id
+
+    // Emite un evento; devuelve los ids de las misiones que se completaron.
+    // Si se pasa beneficiario, se le suma la recompensa de esas misiones.
+    // La cantidad debe ser positiva (invalid_argument si no).
+    std::vector<int> emitir(TipoEvento tipo, const std::string& clave, int cantidad, Personaje* beneficiario);
+
+    const mision& obtener(int id) const;
+
+    // Estado de las misiones para las partidas guardadas: uint32 cantidad y
+    // por misión int32 progreso + uint8 completada, en orden de id
+    std::string exportarEstado() const;
+    // Restaura un estado exportado sobre las mismas misiones (lanza si no coinciden)
+    void importarEstado(const std::string& datos);
+    std::size_t size() const { return misiones.size(); }
+    std::size_t activas(TipoEvento tipo) const; // Misiones suscritas a ese tipo
+};
+
+#endif
@@ -0,0 +1,88 @@
+#ifndef TIENDA_H
+#define TIENDA_H
+
+#include "personaje.h"
+#include <memory>
+#include <string>
+#include <unordered_map>
+#include <utility>
+#include <vector>
+
+// Clase base Producto
+class Producto {
+protected:
+    std::string nombre;
+    double precio;
+    int id = -1; // Lo asigna la Tienda al agregarlo
+    friend class Tienda;
+public:
+    Producto(std::string n, double p);
+    virtual ~Producto() {}
+    virtual void mostrar() const;                              // Mostrar datos genéricos
+    virtual double getPrecio() const { return precio; }       // Retorna precio
+    virtual std::string getNombre() const { return nombre; }  // Retorna nombre
+    virtual std::string getTipo() const { return "Producto"; }
+    int getId() const { return id; }
+};
+
+// Clase Bien (hereda de Producto)
+class Bien : public Producto {
+public:
+    Bien(std::string n, double p) : Producto(n, p) {}
+    void mostrar() const override;
+    std::string getTipo() const override { return "Bien"; }
+};
+
+// Clase Servicio (hereda de Producto)
+class Servicio : public Producto {
+public:
+    Servicio(std::string n, double p) : Producto(n, p) {}
+    void mostrar() const override;
+    std::string getTipo() const override { return "Servicio"; }
+};
+
+// Una línea del registro de transacciones
+struct Transaccion {
+    int compra;             // Número de compra (agrupa las líneas de un mismo carrito)
+    int id_producto;
+    int cantidad;
+    double precio_unitario;
+    double total;           // Lo cobrado por esta línea (ya redondeado)
+};
+
+// Clase Tienda (catálogo indexado, compras por carrito y registro de transacciones)
+class Tienda {
+private:
+    std::vector<std::shared_ptr<Producto>> productos;      // Catálogo, el id es el índice
+    std::unordered_map<std::string, int> indice_nombres;   // nombre -> id
+    std::vector<Transaccion> registro;                     // Solo se agregan entradas
+    double totalCompras = 0;                               // Acumulado de compras
+    int compras = 0;
+public:
+    int agregarProducto(std::shared_ptr<Producto> p);      // Agrega y devuelve el id (no si ya tiene uno)
+    std::shared_ptr<Producto> buscar(int id) const;        // nullptr si no existe
+    std::shared_ptr<Producto> buscarPorNombre(const std::string& nombre) const;
+    std::size_t cantidadProductos() const { return productos.size(); }
+
+    // Compra un carrito completo [(id, cantidad)] cobrando a comprador.dinero.
+    // Es todo o nada: si no alcanza el dinero (o el carrito está vacío) no se
+    // cobra ni se registra nada. El registro y los totales guardan lo cobrado
+    // (en unidades enteras de dinero), no el precio sin redondear.
+    bool comprarCarrito(Personaje& comprador, const std::vector<std::pair<int, int>>& carrito);
+    bool comprarCarritoPorNombre(Personaje& comprador, const std::vector<std::pair<std::string, int>>& carrito);
+    double precioCarrito(const std::vector<std::pair<int, int>>& carrito) const;
+
+    // Registro y agregados
+    const std::vector<Transaccion>& getRegistro() const { return registro; }
+    double totalGastado() const { return totalCompras; }
+    int numeroCompras() const { return compras; }
+    std::unordered_map<int, int> unidadesPorProducto() const;
+    std::unordered_map<int, double> ingresosPorProducto() const;
+
+    // Versión de consola
+    void mostrarProductos() const;
+    void comprarProducto(int indice);
+    void mostrarTotal() const;
+};
+
+#endif
@@ -0,0 +1,141 @@
+import json
+
+import numpy as np
+import pygame
+
+# Animaciones definidas como datos (assets/animaciones/<nombre>.json):
+#   {"duracion_frame_ms": 100, "estados": {"idle": [0], "left": [5, 6], ...}}
+# Cada estado es la secuencia de índices de frame del atlas. Un estado puede
+# traer su propia duración: {"frames": [5, 6], "duracion_frame_ms": 80}.
+RUTA_DEFINICIONES = "assets/animaciones"
+
+
+class DefinicionAnimacion:
+    """Estados de una animación ya registrados en un SistemaAnimacion (compartida)."""
+
+    def __init__(self, nombre, estados, frames):
+        self.nombre = nombre
+        self.estados = estados   # nombre del estado -> id global del estado
+        self.frames = frames     # nombre del estado -> lista de frames (solo lectura)
+
+
+class SistemaAnimacion:
+    """
+    Animaciones de todas las entidades en arrays de NumPy.
+    Cada entidad es un slot con un estado compacto (estado actual, posición
+    en la secuencia, ms transcurridos); avanzar(dt) mueve todas a la vez
+    con una sola lectura de reloj por frame (o ninguna si se le pasa dt).
+    """
+
+    def __init__(self, capacidad=64):
+        self.definiciones = {}
+        # Tabla global de estados: dónde empieza su secuencia, largo y duración de frame
+        self._inicio = []
+        self._largo = []
+        self._duracion = []
+        self._frames = []               # secuencias de todos los estados, una tras otra
+        self._tablas = None             # las mismas listas como arrays (se arman al avanzar)
+
+        # Estado compacto por entidad
+        self.estado = np.zeros(capacidad, dtype=np.int32)
+        self.posicion = np.zeros(capacidad, dtype=np.int32)
+        self.transcurrido = np.zeros(capacidad, dtype=np.float64)
+        self.activo = np.zeros(capacidad, dtype=bool)
+        self._libres = list(range(capacidad - 1, -1, -1))
+        self._ultimo_tick = None
+
+    # --- Definiciones ---
+
+    def registrar(self, nombre, datos):
+        """Registra una definición a partir de sus datos (ya parseados)."""
+        duracion_base = datos.get("duracion_frame_ms", 100)
+        estados, frames = {}, {}
+        for estado, valor in datos["estados"].items():
+            secuencia = valor["frames"] if isinstance(valor, dict) else valor
+            duracion = valor.get("duracion_frame_ms", duracion_base) if isinstance(valor, dict) else duracion_base
+            estados[estado] = len(self._inicio)
+            frames[estado] = list(secuencia) or [0]
+            self._inicio.append(len(self._frames))
+            self._largo.append(len(frames[estado]))
+            self._duracion.append(duracion)
+            self._frames.extend(frames[estado])
+        self._tablas = None
+        definicion = self.definiciones[nombre] = DefinicionAnimacion(nombre, estados, frames)
+        return definicion
+
+    def definicion(self, nombre):
+        """Definición por nombre; se lee de RUTA_DEFINICIONES una sola vez."""
+        definicion = self.definiciones.get(nombre)
+        if definicion is None:
+            with open(f"{RUTA_DEFINICIONES}/{nombre}.json", encoding="utf-8") as archivo:
+                definicion = self.registrar(nombre, json.load(archivo))
+        return definicion
+
+    # --- Entidades ---
+
+    def agregar(self, definicion, estado="idle"):
+        """Crea el estado de animación de una entidad y devuelve su slot."""
+        if not self._libres:
+            self._crecer()
+        slot = self._libres.pop()
+        self.estado[slot] = definicion.estados[estado]
+        self.posicion[slot] = 0
+        self.transcurrido[slot] = 0
+        self.activo[slot] = True
+        return slot
+
+    def quitar(self, slot):
+        """Libera el slot de una entidad para que lo reuse la próxima."""
+        if not self.activo[slot]:
+            return
+        self.activo[slot] = False
+        self._libres.append(slot)
+
+    def _crecer(self):
+        capacidad = len(self.estado)
+        for nombre in ("estado", "posicion", "transcurrido", "activo"):
+            viejo = getattr(self, nombre)
+            nuevo = np.zeros(capacidad * 2, dtype=viejo.dtype)
+            nuevo[:capacidad] = viejo
+            setattr(self, nombre, nuevo)
+        self._libres.extend(range(capacidad * 2 - 1, capacidad - 1, -1))
+
+    def cambiar(self, slot, id_estado):
+        """Pasa la entidad a otro estado (id global); reinicia la secuencia."""
+        if self.estado[slot] != id_estado:
+            self.estado[slot] = id_estado
+            self.posicion[slot] = 0
+
+    def frame(self, slot):
+        """Índice del frame del atlas que muestra la entidad."""
+        return self._frames[self._inicio[self.estado[slot]] + self.posicion[slot]]
+
+    # --- Avance por lotes ---
+
+    def avanzar(self, dt=None):
+        """
+        Avanza todas las animaciones dt ms. Sin dt se lee el reloj una vez
+        y se usa lo que pasó desde la llamada anterior.
+        """
+        if dt is None:
+            ahora = pygame.time.get_ticks()
+            dt = 0 if self._ultimo_tick is None else ahora - self._ultimo_tick
+            self._ultimo_tick = ahora
+        if not self._largo:
+            return
+        if self._tablas is None:
+            self._tablas = (np.array(self._largo, dtype=np.int32), np.array(self._duracion, dtype=np.float64))
+        largos, duraciones = self._tablas
+
+        # Los slots libres también avanzan (es más barato que filtrarlos); agregar() los reinicia
+        estado = self.estado
+        duracion = duraciones[estado]
+        self.transcurrido += dt
+        pasos = self.transcurrido // duracion
+        self.transcurrido -= pasos * duracion
+        self.posicion += pasos.astype(np.int32)
+        self.posicion %= largos[estado]
+
+
+# Sistema compartido por todos los personajes del juego
+SISTEMA = SistemaAnimacion()
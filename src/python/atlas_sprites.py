@@ -0,0 +1,52 @@
+import pygame
+
+
+class AtlasSprites:
+    """
+    Atlas de frames de animación.
+    Empaqueta todos los frames en una sola superficie con una fila por cada
+    variante de flip, generadas una única vez al cargar. Dibujar es solo un
+    blit por área desde el atlas, sin crear superficies durante el frame.
+    """
+
+    # Fila del atlas para cada combinación (flip_x, flip_y)
+    VARIANTES = ((False, False), (True, False), (False, True), (True, True))
+
+    def __init__(self, frames):
+        self.frames = list(frames)
+        self.ancho_celda = max(frame.get_width() for frame in self.frames)
+        self.alto_celda = max(frame.get_height() for frame in self.frames)
+
+        self.superficie = pygame.Surface(
+            (self.ancho_celda * len(self.frames), self.alto_celda * len(self.VARIANTES)), pygame.SRCALPHA
+        )
+        if pygame.display.get_surface() is not None:
+            self.superficie = self.superficie.convert_alpha()
+
+        # (indice, flip_x, flip_y) -> área del frame dentro del atlas
+        self.areas = {}
+        for fila, (flip_x, flip_y) in enumerate(self.VARIANTES):
+            for indice, frame in enumerate(self.frames):
+                pos = (indice * self.ancho_celda, fila * self.alto_celda)
+                # BLEND_RGBA_ADD sobre el atlas vacío copia los píxeles tal cual (alpha incluido)
+                self.superficie.blit(pygame.transform.flip(frame, flip_x, flip_y), pos,
+                                     special_flags=pygame.BLEND_RGBA_ADD)
+                self.areas[(indice, flip_x, flip_y)] = pygame.Rect(pos, frame.get_size())
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __getitem__(self, indice):
+        """Frame original (sin flip), igual que la lista de animaciones."""
+        return self.frames[indice]
+
+    def area(self, indice, flip_x=False, flip_y=False):
+        return self.areas[(indice, flip_x, flip_y)]
+
+    def zona(self, indice, pos):
+        """Rect que ocupa el frame dibujado en pos (todas las variantes miden igual)."""
+        return pygame.Rect(pos, self.areas[(indice, False, False)].size)
+
+    def dibujar(self, destino, indice, pos, flip_x=False, flip_y=False):
+        """Blit del frame (ya volteado) en pos; devuelve la zona de destino tocada."""
+        return destino.blit(self.superficie, pos, self.areas[(indice, flip_x, flip_y)])
@@ -0,0 +1,372 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+
+import pygame
+
+import animacion
+import atlas_sprites
+import cambio_escenarios as tel
+import colisiones
+import dialogos
+import dialogos_juego
+import fondo_chunks
+import inventario
+import navegacion
+import personaje2 as per
+import temporizadores
+import ui
+
+# Benchmark headless del bucle de juego.
+# Ejecuta el código real (Protagonista, SistemaColisiones, Teletransporte,
+# Dialogo, UI) con el driver "dummy" de SDL y entrada guionizada, y reporta
+# p50/p95/p99 del tiempo de frame y la memoria Python asignada por frame.
+# Ejecutar desde la raíz del repositorio:
+#   python src/python/benchmark_bucle.py                 -> compara con la base
+#   python src/python/benchmark_bucle.py --guardar-base  -> guarda una nueva base
+#   python src/python/benchmark_bucle.py --exigir-base   -> como en CI: falla si no hay base
+#
+# La base depende de la máquina, por eso no se sube al repositorio: en cada
+# máquina que mide (la de CI, el kiosco) se guarda una vez con --guardar-base
+# desde un commit sano y después se corre con --exigir-base. Sin base el
+# script sale con 2; con regresiones sale con 1.
+
+VALUES = (1200, 600)
+RUTA_BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_base.json")
+
+
+class TeclasGuion:
+    """Estado de teclas guionizado: se indexa como pygame.key.get_pressed()."""
+
+    def __init__(self, secuencia):
+        # secuencia: lista de (tecla o None, cantidad de ticks)
+        self.ticks = []
+        for tecla, cantidad in secuencia:
+            self.ticks.extend([tecla] * cantidad)
+        self.tick = 0
+
+    def avanzar(self):
+        self.tick += 1
+
+    def __getitem__(self, tecla):
+        return self.ticks[self.tick % len(self.ticks)] == tecla
+
+
+class Escenario:
+    """Mundo base: mapa del pueblo, hitboxes de los edificios, jugador y HUD."""
+
+    nombre = "base"
+    guion = [(pygame.K_d, 60), (pygame.K_s, 120), (pygame.K_a, 80), (pygame.K_w, 60)]
+
+    def __init__(self, pantalla, animaciones):
+        self.pantalla = pantalla
+        self.animaciones = animaciones
+        self.teclas = TeclasGuion(self.guion)
+
+        fondo = pygame.image.load("assets/pueblo_del_roble.png")
+        fondo = pygame.transform.scale(fondo, (1900, 1600)).convert_alpha()
+        self.fondo = fondo_chunks.FondoPorChunks(fondo)
+        self.mapa_rect = self.fondo.get_rect()
+
+        self.hitboxes = [
+            pygame.Rect(530, 230, 250, 240),
+            pygame.Rect(1115, 230, 245, 250),
+            pygame.Rect(530, 680, 230, 220),
+            pygame.Rect(1115, 650, 290, 240),
+        ]
+        self.sistema_col = colisiones.SistemaColisiones(self.hitboxes)
+        # Rueda propia por escenario: los temporizadores no pasan de una medición a otra
+        self.rueda = temporizadores.RuedaTemporizadores()
+        self.jugador = per.Protagonista(0, 1500, animaciones, 250, 350, 5, inventario.Inventario(10))
+        self.jugador.programar_necesidades(self.rueda)
+        self.ui = ui.UI(200, 0)
+        self.camara = pygame.Vector2(0, 0)
+
+    def mover(self, personaje, teclas):
+        rect_prev = personaje.rect.copy()
+        personaje.movimiento(teclas=teclas)
+        dx = personaje.rect.x - rect_prev.x
+        dy = personaje.rect.y - rect_prev.y
+        personaje.rect = self.sistema_col.prevenir_movimiento(rect_prev, dx, dy)
+        personaje.rect.clamp_ip(self.mapa_rect)
+        personaje.eje_x, personaje.eje_y = personaje.rect.x, personaje.rect.y
+
+    def actualizar(self, dt):
+        self.mover(self.jugador, self.teclas)
+        self.teclas.avanzar()
+        animacion.SISTEMA.avanzar(dt)
+        self.rueda.avanzar(dt)
+        self.camara.x = max(0, min(self.jugador.rect.centerx - VALUES[0] // 2, self.mapa_rect.width - VALUES[0]))
+        self.camara.y = max(0, min(self.jugador.rect.centery - VALUES[1] // 2, self.mapa_rect.height - VALUES[1]))
+
+    def dibujar(self):
+        self.fondo.dibujar(self.pantalla, self.camara)
+        self.jugador.dibujar(self.pantalla, self.camara)
+        self.ui.barras_estados(self.jugador.estados, self.pantalla, 900, 20)
+
+    def frame(self, dt):
+        self.actualizar(dt)
+        self.dibujar()
+        pygame.display.update()
+
+    def cerrar(self):
+        """Saca a los personajes del escenario y devuelve sus slots de animación."""
+        self.jugador.liberar()
+
+
+class CaminarMapa(Escenario):
+    nombre = "caminar_mapa"
+
+
+class CambioEscena(Escenario):
+    """El jugador cruza dos zonas de teletransporte una y otra vez."""
+
+    nombre = "cambio_escena"
+    guion = [(pygame.K_d, 90), (pygame.K_a, 90)]
+
+    def __init__(self, pantalla, animaciones):
+        super().__init__(pantalla, animaciones)
+        zonas = [
+            tel.ZonaTeleport(360, 300, 20, 300, "assets/imagen_nivel.jpg"),
+            tel.ZonaTeleport(740, 300, 20, 300, "assets/imagen_fondo2.jpg"),
+        ]
+        cache = tel.CacheEscenas(cargador=fondo_chunks.cargar_fondo_por_chunks)
+        self.teletransporte = tel.Teletransporte(zonas, cache, rueda=self.rueda)
+        # Sin edificios en el camino para que cruce las zonas
+        self.sistema_col.set_hitboxes([])
+
+    def actualizar(self, dt):
+        super().actualizar(dt)
+        nuevo_fondo = self.teletransporte.deteccion(self.jugador, [])
+        if nuevo_fondo:
+            self.fondo = nuevo_fondo
+
+
+class DialogoLargo(Escenario):
+    """Monólogo largo de un NPC con el efecto de máquina de escribir."""
+
+    nombre = "dialogo_largo"
+    guion = [(None, 1)]
+
+    def __init__(self, pantalla, animaciones):
+        super().__init__(pantalla, animaciones)
+        self.textos = dialogos_juego.dialogos_vendedor + [
+            " ".join(dialogos_juego.dialogos_vendedor) * 3,
+        ]
+        self.fuente = pygame.font.Font(None, 32)
+        self.abrir()
+
+    def abrir(self):
+        self.dialogo = dialogos.Dialogo(self.textos, self.fuente, 100, 450, 1000, 120, velocidad=120, rueda=self.rueda)
+
+    def actualizar(self, dt):
+        super().actualizar(dt)
+        if self.dialogo.visibles == len(self.dialogo.textos[self.dialogo.indice_texto]):
+            self.dialogo.siguiente_linea()
+        if not self.dialogo.en_dialogo:
+            self.abrir()
+
+    def dibujar(self):
+        super().dibujar()
+        self.dialogo.dibujar(self.pantalla)
+
+
+class EscenaConcurrida(Escenario):
+    """Muchos personajes animados y NPCs en pantalla a la vez."""
+
+    nombre = "escena_concurrida"
+    personajes = 40
+    npcs = 100
+
+    def __init__(self, pantalla, animaciones):
+        super().__init__(pantalla, animaciones)
+        sprite = pygame.transform.scale(pygame.image.load("assets/imagen_vendedor.png").convert_alpha(), (100, 120))
+        self.vecinos = []
+        for i in range(self.personajes):
+            vecino = per.Protagonista(0, 0, animaciones, 100 + (i % 8) * 130, 100 + (i // 8) * 150, 3,
+                                      inventario.Inventario(1))
+            # Cada vecino arranca su guion desfasado
+            teclas = TeclasGuion(self.guion)
+            teclas.tick = i * 17
+            self.vecinos.append((vecino, teclas))
+        self.npcs = [per.NPC(0, 0, (i * 97) % 1800, (i * 61) % 1500, [], sprite) for i in range(self.npcs)]
+
+    def actualizar(self, dt):
+        super().actualizar(dt)
+        # Los vecinos se mueven y después se resuelven todos juntos contra las hitboxes
+        x, y, ancho, alto, dx, dy = [], [], [], [], [], []
+        for vecino, teclas in self.vecinos:
+            x0, y0 = vecino.rect.topleft
+            vecino.movimiento(teclas=teclas)
+            teclas.avanzar()
+            x.append(x0)
+            y.append(y0)
+            ancho.append(vecino.rect.width)
+            alto.append(vecino.rect.height)
+            dx.append(vecino.rect.x - x0)
+            dy.append(vecino.rect.y - y0)
+        nuevo_x, nuevo_y = self.sistema_col.prevenir_movimiento_lote(x, y, ancho, alto, dx, dy)
+        for (vecino, _), px, py in zip(self.vecinos, nuevo_x.tolist(), nuevo_y.tolist()):
+            vecino.rect.topleft = (px, py)
+            vecino.rect.clamp_ip(self.mapa_rect)
+            vecino.eje_x, vecino.eje_y = vecino.rect.x, vecino.rect.y
+
+    def dibujar(self):
+        self.fondo.dibujar(self.pantalla, self.camara)
+        for npc in self.npcs:
+            self.pantalla.blit(npc.sprite, (npc.rect.x - self.camara.x, npc.rect.y - self.camara.y))
+        for vecino, _ in self.vecinos:
+            vecino.dibujar(self.pantalla, self.camara)
+        self.jugador.dibujar(self.pantalla, self.camara)
+        self.ui.barras_estados(self.jugador.estados, self.pantalla, 900, 20)
+
+    def cerrar(self):
+        for vecino, _ in self.vecinos:
+            vecino.liberar()
+        self.vecinos = []
+        super().cerrar()
+
+
+class Seguidores(Escenario):
+    """Muchos NPCs que siguen al jugador con un campo de flujo compartido."""
+
+    nombre = "seguidores"
+    npcs = 100
+
+    def __init__(self, pantalla, animaciones):
+        super().__init__(pantalla, animaciones)
+        sprite = pygame.transform.scale(pygame.image.load("assets/imagen_vendedor.png").convert_alpha(), (100, 120))
+        # Margen de medio sprite: con el centro en una celda libre el rect no entra en los edificios
+        rejilla = navegacion.RejillaNavegacion.desde_colisiones(self.sistema_col, *self.mapa_rect.size, margen=60)
+        self.campo = navegacion.CampoFlujo(rejilla)
+        self.npcs = [per.NPC(0, 0, (i * 97) % 1800, (i * 61) % 1500, [], sprite) for i in range(self.npcs)]
+
+    def actualizar(self, dt):
+        super().actualizar(dt)
+        self.campo.actualizar(*self.jugador.rect.center)
+        for npc in self.npcs:
+            navegacion.seguir(npc, self.campo, 2)
+
+    def dibujar(self):
+        self.fondo.dibujar(self.pantalla, self.camara)
+        for npc in self.npcs:
+            self.pantalla.blit(npc.sprite, (npc.rect.x - self.camara.x, npc.rect.y - self.camara.y))
+        self.jugador.dibujar(self.pantalla, self.camara)
+        self.ui.barras_estados(self.jugador.estados, self.pantalla, 900, 20)
+
+
+ESCENARIOS = [CaminarMapa, CambioEscena, DialogoLargo, EscenaConcurrida, Seguidores]
+
+
+def percentil(cuantiles, p):
+    return cuantiles[p - 1]
+
+
+def medir(clase, pantalla, animaciones, frames, calentamiento=30):
+    """Tiempos de frame (ms) y KB de memoria Python asignada por frame."""
+    dt = 1000 / 60
+
+    # Pasada 1: tiempos
+    escenario = clase(pantalla, animaciones)
+    for _ in range(calentamiento):
+        escenario.frame(dt)
+    tiempos = []
+    for _ in range(frames):
+        inicio = time.perf_counter()
+        escenario.frame(dt)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    escenario.cerrar()
+
+    # Pasada 2: memoria asignada por frame (pico de tracemalloc sobre lo ya vivo)
+    escenario = clase(pantalla, animaciones)
+    for _ in range(calentamiento):
+        escenario.frame(dt)
+    tracemalloc.start()
+    asignado = 0
+    for _ in range(frames):
+        antes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        escenario.frame(dt)
+        asignado += tracemalloc.get_traced_memory()[1] - antes
+    tracemalloc.stop()
+    escenario.cerrar()
+
+    cuantiles = statistics.quantiles(tiempos, n=100)
+    return {
+        "p50_ms": round(percentil(cuantiles, 50), 3),
+        "p95_ms": round(percentil(cuantiles, 95), 3),
+        "p99_ms": round(percentil(cuantiles, 99), 3),
+        "kb_por_frame": round(asignado / frames / 1024, 3),
+    }
+
+
+def comparar(resultados, base, tolerancia):
+    """Devuelve la lista de regresiones respecto a la base."""
+    regresiones = []
+    for nombre, actual in resultados.items():
+        anterior = base.get(nombre)
+        if anterior is None:
+            continue
+        # p99 se reporta pero no se compara: con pocos frames es demasiado ruidoso
+        for clave in ("p50_ms", "p95_ms"):
+            if actual[clave] > anterior[clave] * (1 + tolerancia):
+                regresiones.append(f"{nombre}: {clave} {anterior[clave]} -> {actual[clave]}")
+        # Holgura de 1 KB para no fallar por ruido en escenarios casi sin asignaciones
+        if actual["kb_por_frame"] > anterior["kb_por_frame"] * (1 + tolerancia) + 1:
+            regresiones.append(f"{nombre}: kb_por_frame {anterior['kb_por_frame']} -> {actual['kb_por_frame']}")
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark headless del bucle de juego")
+    parser.add_argument("--frames", type=int, default=600, help="frames medidos por escenario")
+    parser.add_argument("--escenario", action="append", help="solo estos escenarios (se puede repetir)")
+    parser.add_argument("--base", default=RUTA_BASE, help="archivo JSON con la base")
+    parser.add_argument("--guardar-base", action="store_true", help="guardar los resultados como nueva base")
+    parser.add_argument("--exigir-base", action="store_true",
+                        help="salir con error si no hay base con la que comparar (para CI)")
+    parser.add_argument("--tolerancia", type=float, default=0.25, help="regresión permitida (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    pantalla = pygame.display.set_mode(VALUES)
+    animaciones = atlas_sprites.AtlasSprites([
+        pygame.transform.scale(pygame.image.load(f"assets/{frame}-Photoroom.png").convert_alpha(), (110, 130))
+        for frame in range(7)
+    ])
+
+    resultados = {}
+    for clase in ESCENARIOS:
+        if args.escenario and clase.nombre not in args.escenario:
+            continue
+        resultados[clase.nombre] = medir(clase, pantalla, animaciones, args.frames)
+        r = resultados[clase.nombre]
+        print(f"{clase.nombre:<20} p50 {r['p50_ms']:8.3f} ms  p95 {r['p95_ms']:8.3f} ms  "
+              f"p99 {r['p99_ms']:8.3f} ms  {r['kb_por_frame']:8.3f} KB/frame")
+
+    if args.guardar_base:
+        with open(args.base, "w", encoding="utf-8") as archivo:
+            json.dump(resultados, archivo, indent=2)
+        print(f"Base guardada en {args.base}")
+        return 0
+
+    if not os.path.exists(args.base):
+        print("No hay base guardada; usar --guardar-base para crearla")
+        return 2 if args.exigir_base else 0
+
+    with open(args.base, encoding="utf-8") as archivo:
+        regresiones = comparar(resultados, json.load(archivo), args.tolerancia)
+    for regresion in regresiones:
+        print("REGRESIÓN", regresion)
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
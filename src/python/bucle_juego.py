@@ -0,0 +1,61 @@
+import pygame
+
+
+class BucleJuego:
+    """
+    Bucle de juego con paso de simulación fijo.
+    actualizar(dt) se llama siempre con el mismo dt (en ms) tantas veces
+    como pida el acumulador, y dibujar(alpha) recibe la fracción (0..1)
+    del siguiente paso para interpolar. Así la velocidad del juego no
+    depende de los FPS.
+    """
+
+    def __init__(self, actualizar, dibujar=None, hz=60, fps=60, max_pasos=5, escala_tiempo=1.0):
+        self.actualizar = actualizar
+        self.dibujar = dibujar
+        self.paso = 1000 / hz        # dt fijo de la simulación en ms
+        self.fps = fps               # límite de frames dibujados (0 = sin límite)
+        self.max_pasos = max_pasos   # pasos máximos por frame (evita la espiral de la muerte)
+        self.escala_tiempo = escala_tiempo  # >1 acelera la simulación (p. ej. al reproducir)
+        self.reloj = pygame.time.Clock()
+        self.corriendo = False
+        self.ticks = 0               # pasos de simulación ejecutados
+
+    def detener(self):
+        self.corriendo = False
+
+    def ejecutar(self):
+        """Bucle en tiempo real: simulación a paso fijo y render interpolado."""
+        self.corriendo = True
+        acumulador = 0
+        self.reloj.tick()
+        while self.corriendo:
+            acumulador += self.reloj.tick(self.fps) * self.escala_tiempo
+
+            pasos = 0
+            max_pasos = self.max_pasos * max(1, int(self.escala_tiempo))
+            while acumulador >= self.paso and pasos < max_pasos and self.corriendo:
+                self.actualizar(self.paso)
+                acumulador -= self.paso
+                pasos += 1
+                self.ticks += 1
+            # Si la máquina no da abasto se descarta el atraso en lugar de acumularlo
+            if pasos == max_pasos:
+                acumulador = min(acumulador, self.paso)
+
+            if self.dibujar and self.corriendo:
+                self.dibujar(acumulador / self.paso)
+
+    def ejecutar_headless(self, pasos=None):
+        """
+        Ejecuta solo la simulación, sin dibujar ni esperar al reloj, tan
+        rápido como permita la CPU. Con pasos=None corre hasta detener().
+        """
+        self.corriendo = True
+        hechos = 0
+        while self.corriendo and (pasos is None or hechos < pasos):
+            self.actualizar(self.paso)
+            hechos += 1
+            self.ticks += 1
+        self.corriendo = False
+        return hechos
@@ -0,0 +1,143 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+import pygame
+
+# Cache de assets ya escalados.
+# El paso de build decodifica y escala cada imagen del manifiesto una sola vez
+# y guarda sus píxeles en crudo (BGRA, el formato habitual de la pantalla) en
+# un único archivo. Al arrancar el juego ese archivo se lee con mmap, así
+# cargar una imagen es solo envolver sus bytes y convertirla, sin decodificar
+# PNG/JPG ni escalar. Cada entrada guarda el hash de su archivo de origen y
+# se ignora si el asset cambió.
+#
+# Construir (desde la raíz del repositorio):
+#   python src/python/cache_assets.py
+
+RUTA_PACK = "assets/.cache/assets.pak"
+MAGIA = b"EACH"
+VERSION = 1
+FORMATO = "BGRA"
+_CABECERA = struct.Struct("<4sHQI")  # magia, versión, offset y largo del índice JSON (al final)
+_ALINEACION = 64
+
+# (ruta, tamaño escalado o None, con alpha) de los assets que se cargan al arrancar
+MANIFIESTO = [(f"assets/{frame}-Photoroom.png", (110, 130), True) for frame in range(7)] + [
+    ("assets/pueblo_del_roble.png", (1900, 1600), True),
+    ("assets/imagen_fondo_principal.jpg", (1200, 600), False),
+    ("assets/imagen_vendedor.png", (100, 120), True),
+]
+
+
+def hash_archivo(ruta):
+    with open(ruta, "rb") as archivo:
+        return hashlib.sha1(archivo.read()).hexdigest()
+
+
+def clave_asset(ruta, tam, alpha):
+    return f"{ruta}|{tam[0]}x{tam[1]}|{int(alpha)}" if tam else f"{ruta}|original|{int(alpha)}"
+
+
+def cargar_sin_cache(ruta, tam=None, alpha=True):
+    """Carga normal: decodificar, escalar y convertir al formato de pantalla."""
+    imagen = pygame.image.load(ruta)
+    if tam:
+        imagen = pygame.transform.scale(imagen, tam)
+    if pygame.display.get_surface() is None:
+        return imagen
+    return imagen.convert_alpha() if alpha else imagen.convert()
+
+
+class CacheAssets:
+    """Lector del pack de assets (mmap); si una entrada falta o está vieja, carga normal."""
+
+    def __init__(self, ruta_pack=RUTA_PACK):
+        self.indice = {}
+        self.datos = None
+        self.faltantes = []  # claves que se cargaron sin cache (conviene reconstruir)
+        try:
+            with open(ruta_pack, "rb") as archivo:
+                self.datos = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_COPY)
+        except (OSError, ValueError):
+            return
+        try:
+            self.indice = self._leer_indice(self.datos)
+        except (struct.error, ValueError, KeyError, TypeError):
+            # Pack truncado o corrupto: todo se carga de la forma normal
+            self.datos = None
+            self.indice = {}
+
+    @staticmethod
+    def _leer_indice(datos):
+        magia, version, inicio_indice, largo = _CABECERA.unpack_from(datos, 0)
+        if magia != MAGIA or version != VERSION:
+            raise ValueError("no es un pack de assets de esta versión")
+        if inicio_indice + largo > len(datos):
+            raise ValueError("el índice del pack está fuera del archivo")
+        indice = json.loads(datos[inicio_indice:inicio_indice + largo])
+        if not isinstance(indice, dict):
+            raise ValueError("índice del pack inválido")
+        # Las entradas tienen que caer entre la cabecera y el índice
+        for entrada in indice.values():
+            if entrada["offset"] < _CABECERA.size or entrada["offset"] + entrada["bytes"] > inicio_indice:
+                raise ValueError("entrada del pack fuera de los datos")
+        return indice
+
+    def cargar(self, ruta, tam=None, alpha=True):
+        clave = clave_asset(ruta, tam, alpha)
+        entrada = self.indice.get(clave)
+        if entrada is None or entrada["hash"] != hash_archivo(ruta):
+            self.faltantes.append(clave)
+            return cargar_sin_cache(ruta, tam, alpha)
+
+        inicio = entrada["offset"]
+        pixeles = memoryview(self.datos)[inicio:inicio + entrada["bytes"]]
+        imagen = pygame.image.frombuffer(pixeles, (entrada["ancho"], entrada["alto"]), FORMATO)
+        if pygame.display.get_surface() is None:
+            return imagen.copy()
+        # Con el mismo formato que la pantalla la conversión es solo una copia
+        return imagen.convert_alpha() if alpha else imagen.convert()
+
+
+def construir(manifiesto=MANIFIESTO, ruta_pack=RUTA_PACK):
+    """Paso de build: escala cada asset y guarda sus píxeles en el pack."""
+    indice = {}
+    os.makedirs(os.path.dirname(ruta_pack), exist_ok=True)
+    temporal = ruta_pack + ".tmp"
+    with open(temporal, "wb") as archivo:
+        # Los píxeles empiezan después de la cabecera, alineados; el índice va al final
+        archivo.write(b"\0" * _ALINEACION)
+        offset = _ALINEACION
+        for ruta, tam, alpha in manifiesto:
+            imagen = pygame.image.load(ruta)
+            if tam:
+                imagen = pygame.transform.scale(imagen, tam)
+            pixeles = pygame.image.tobytes(imagen, FORMATO)
+            indice[clave_asset(ruta, tam, alpha)] = {
+                "hash": hash_archivo(ruta),
+                "ancho": imagen.get_width(),
+                "alto": imagen.get_height(),
+                "offset": offset,
+                "bytes": len(pixeles),
+            }
+            relleno = -len(pixeles) % _ALINEACION
+            archivo.write(pixeles + b"\0" * relleno)
+            offset += len(pixeles) + relleno
+
+        texto = json.dumps(indice).encode("utf-8")
+        archivo.write(texto)
+        archivo.seek(0)
+        archivo.write(_CABECERA.pack(MAGIA, VERSION, offset, len(texto)))
+    os.replace(temporal, ruta_pack)
+    return indice
+
+
+if __name__ == "__main__":
+    indice = construir()
+    total = sum(entrada["bytes"] for entrada in indice.values())
+    print(f"{len(indice)} assets, {total / 1024 / 1024:.1f} MB en {RUTA_PACK}")
+    sys.exit(0)
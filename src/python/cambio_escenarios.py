@@ -1,26 +1,141 @@
 import pygame
+import queue
+import threading
+from collections import OrderedDict
+
+import temporizadores
+
+
+def cargar_escena(ruta):
+    """Carga el fondo de una escena ya convertido al formato de pantalla."""
+    return pygame.image.load(ruta).convert_alpha()
+
+
+def bytes_superficie(superficie):
+    """Memoria aproximada que ocupa una pygame.Surface."""
+    ancho, alto = superficie.get_size()
+    return ancho * alto * superficie.get_bytesize()
+
+
+class CacheEscenas:
+    """
+    Cache de escenas con expulsión LRU y un presupuesto de memoria.
+    Las escenas se pueden precargar en un hilo de trabajo, así el cambio
+    de escena al tocar un ZonaTeleport es solo una búsqueda en el diccionario.
+    """
+
+    def __init__(self, presupuesto_bytes=256 * 1024 * 1024, cargador=cargar_escena, medir=bytes_superficie):
+        self.presupuesto_bytes = presupuesto_bytes
+        self.cargador = cargador
+        self.medir = medir
+        self.uso_bytes = 0
+        self._escenas = OrderedDict()   # ruta -> (escena, bytes), la más reciente al final
+        self._pendientes = {}           # ruta -> threading.Event mientras el hilo la carga
+        self._lock = threading.Lock()
+        self._cola = queue.Queue()
+        self._hilo = None
+
+    def __contains__(self, ruta):
+        with self._lock:
+            return ruta in self._escenas
+
+    def obtener(self, ruta):
+        """Devuelve la escena de ruta; si no está precargada la carga aquí mismo."""
+        with self._lock:
+            if ruta in self._escenas:
+                self._escenas.move_to_end(ruta)
+                return self._escenas[ruta][0]
+            pendiente = self._pendientes.get(ruta)
+
+        # Ya la está cargando el hilo: esperar lo que le falte
+        if pendiente is not None:
+            pendiente.wait()
+            with self._lock:
+                if ruta in self._escenas:
+                    self._escenas.move_to_end(ruta)
+                    return self._escenas[ruta][0]
+
+        escena = self.cargador(ruta)
+        self._insertar(ruta, escena)
+        return escena
+
+    def precargar(self, ruta):
+        """Pide al hilo de trabajo que cargue ruta si todavía no está en cache."""
+        with self._lock:
+            if ruta in self._escenas or ruta in self._pendientes:
+                return
+            self._pendientes[ruta] = threading.Event()
+            if self._hilo is None:
+                self._hilo = threading.Thread(target=self._trabajar, daemon=True)
+                self._hilo.start()
+        self._cola.put(ruta)
+
+    def _trabajar(self):
+        while True:
+            ruta = self._cola.get()
+            try:
+                self._insertar(ruta, self.cargador(ruta))
+            except Exception:
+                # Si falla, obtener() lo reintenta en el hilo principal y reporta el error
+                pass
+            finally:
+                with self._lock:
+                    self._pendientes.pop(ruta).set()
+
+    def _insertar(self, ruta, escena):
+        tam = self.medir(escena)
+        with self._lock:
+            if ruta in self._escenas:
+                self.uso_bytes -= self._escenas.pop(ruta)[1]
+            self._escenas[ruta] = (escena, tam)
+            self.uso_bytes += tam
+            # Expulsar las menos usadas, sin sacar nunca la recién insertada
+            while self.uso_bytes > self.presupuesto_bytes and len(self._escenas) > 1:
+                _, (_, tam_viejo) = self._escenas.popitem(last=False)
+                self.uso_bytes -= tam_viejo
+
 
 class Teletransporte:
-    def __init__(self, cambios: list):
+    def __init__(self, cambios: list, cache=None, distancia_precarga=200, rueda=None):
         self.cambios = cambios
-        self.cooldown = 0  # en milisegundos
+        self.rueda = rueda if rueda is not None else temporizadores.RUEDA
+        self.cooldown = None  # temporizador del cooldown mientras está activo
+        self.cache = cache if cache is not None else CacheEscenas()
+        # Distancia (px) a una zona a partir de la cual se precarga su destino
+        self.distancia_precarga = distancia_precarga
 
-    def deteccion(self, jugador: object, obstaculos: list, delta_time):
+    def precargar_cercanas(self, jugador: object):
+        d = self.distancia_precarga
+        for tp in self.cambios:
+            if tp.destino is None:
+                continue
+            zona = tp.rect
+            if (jugador.rect.right > zona.left - d and jugador.rect.left < zona.right + d
+                    and jugador.rect.bottom > zona.top - d and jugador.rect.top < zona.bottom + d):
+                self.cache.precargar(tp.destino)
+
+    def _fin_cooldown(self):
+        self.cooldown = None
+
+    def deteccion(self, jugador: object, obstaculos: list, delta_time=None):
+        # delta_time ya no se usa: el cooldown lo lleva la rueda de temporizadores
         nuevo_fondo = None
 
-        # Disminuir cooldown si está activo
-        if self.cooldown > 0:
-            self.cooldown -= delta_time
+        # Precargar en segundo plano los destinos de las zonas cercanas
+        self.precargar_cercanas(jugador)
+
+        if self.cooldown is not None:
             return None
 
         for tp in self.cambios:
-            if tp.rect.colliderect(jugador.rect):
-                # Cambiar fondo y limpiar obstáculos
-                nuevo_fondo = pygame.image.load(tp.destino).convert_alpha()
+            # Las zonas sin destino (todavía sin escena) no hacen nada
+            if tp.destino is not None and tp.rect.colliderect(jugador.rect):
+                # Cambiar fondo (desde la cache) y limpiar obstáculos
+                nuevo_fondo = self.cache.obtener(tp.destino)
                 obstaculos.clear()
 
                 # Activar cooldown de 1 segundo
-                self.cooldown = 1000
+                self.cooldown = self.rueda.despues(1000, self._fin_cooldown)
                 break
 
         return nuevo_fondo
@@ -31,4 +146,3 @@ class ZonaTeleport ():
     def __init__ (self, x, y, width, height, destino):
         self.rect = pygame.Rect(x, y, width, height)
         self.destino = destino
-
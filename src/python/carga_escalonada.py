@@ -0,0 +1,54 @@
+import threading
+
+
+class CargaEscalonada:
+    """
+    Carga de assets en un hilo de trabajo mientras se muestra el menú.
+    Cada tarea tiene un nombre; obtener(nombre) espera solo a esa tarea
+    (y a las que van antes en la cola), no a toda la carga.
+    """
+
+    def __init__(self):
+        self.tareas = []        # (nombre, función) en orden de carga
+        self.resultados = {}
+        self.errores = {}
+        self._listas = {}       # nombre -> threading.Event
+        self._hilo = None
+
+    def agregar(self, nombre, funcion):
+        self.tareas.append((nombre, funcion))
+        self._listas[nombre] = threading.Event()
+
+    def iniciar(self):
+        if self._hilo is None:
+            self._hilo = threading.Thread(target=self._trabajar, daemon=True)
+            self._hilo.start()
+
+    def _trabajar(self):
+        for nombre, funcion in self.tareas:
+            try:
+                self.resultados[nombre] = funcion()
+            except Exception as error:
+                # Se vuelve a lanzar en el hilo principal desde obtener()
+                self.errores[nombre] = error
+            self._listas[nombre].set()
+
+    def lista(self, nombre):
+        return self._listas[nombre].is_set()
+
+    @property
+    def terminada(self):
+        return all(evento.is_set() for evento in self._listas.values())
+
+    def progreso(self):
+        """Fracción de tareas terminadas, entre 0 y 1."""
+        if not self.tareas:
+            return 1.0
+        return sum(evento.is_set() for evento in self._listas.values()) / len(self.tareas)
+
+    def obtener(self, nombre):
+        self.iniciar()
+        self._listas[nombre].wait()
+        if nombre in self.errores:
+            raise self.errores[nombre]
+        return self.resultados[nombre]
@@ -1,22 +1,162 @@
+import numpy as np
 import pygame
 
+
+class RejillaEspacial:
+    """
+    Índice espacial de rejilla uniforme (spatial hash) para pygame.Rect.
+    Cada rect se registra en todas las celdas que cubre, así una consulta
+    solo revisa los rects de las celdas cercanas en lugar de todo el mapa.
+    """
+
+    def __init__(self, tam_celda=128):
+        self.tam_celda = tam_celda
+        self.celdas = {}         # (cx, cy) -> lista de rects
+        self._celdas_de = {}     # id(rect) -> celdas donde está registrado
+
+    @classmethod
+    def desde_celdas(cls, tam_celda, celdas):
+        """Índice ya calculado (p. ej. leído de un nivel compilado): {(cx, cy): [rects]}."""
+        indice = cls(tam_celda)
+        indice.celdas = celdas
+        for celda, rects in celdas.items():
+            for r in rects:
+                indice._celdas_de.setdefault(id(r), []).append(celda)
+        return indice
+
+    def _rango_celdas(self, rect):
+        """Rangos (x, y) de celdas que cubre rect (vacíos si no tiene área)."""
+        t = self.tam_celda
+        return (range(rect.left // t, (rect.right - 1) // t + 1),
+                range(rect.top // t, (rect.bottom - 1) // t + 1))
+
+    def insertar(self, rect):
+        # Un rect sin área nunca colisiona (colliderect devuelve False)
+        if rect.width <= 0 or rect.height <= 0:
+            return
+        rango_x, rango_y = self._rango_celdas(rect)
+        celdas = []
+        for cx in rango_x:
+            for cy in rango_y:
+                self.celdas.setdefault((cx, cy), []).append(rect)
+                celdas.append((cx, cy))
+        self._celdas_de[id(rect)] = celdas
+
+    def quitar(self, rect):
+        celdas = self._celdas_de.pop(id(rect), None)
+        if celdas is None:
+            return
+        for celda in celdas:
+            lista = self.celdas[celda]
+            for i, r in enumerate(lista):
+                if r is rect:
+                    lista[i] = lista[-1]
+                    lista.pop()
+                    break
+            if not lista:
+                del self.celdas[celda]
+
+    def reconstruir(self, rects):
+        self.celdas.clear()
+        self._celdas_de.clear()
+        for r in rects:
+            self.insertar(r)
+
+    def hay_colision(self, rect):
+        """True si rect colisiona con algún rect indexado (sale en el primero)."""
+        celdas = self.celdas
+        rango_x, rango_y = self._rango_celdas(rect)
+        for cx in rango_x:
+            for cy in rango_y:
+                candidatos = celdas.get((cx, cy))
+                if candidatos:
+                    for r in candidatos:
+                        if rect.colliderect(r):
+                            return True
+        return False
+
+    def consultar(self, rect):
+        """Devuelve los rects indexados que colisionan con rect (sin repetidos)."""
+        encontrados = []
+        vistos = set()
+        rango_x, rango_y = self._rango_celdas(rect)
+        for cx in rango_x:
+            for cy in rango_y:
+                for r in self.celdas.get((cx, cy), ()):
+                    if id(r) not in vistos and rect.colliderect(r):
+                        vistos.add(id(r))
+                        encontrados.append(r)
+        return encontrados
+
+
+def _solapes(x, y, ancho, alto, obstaculos):
+    """
+    Matriz (N, M) de solapamiento estricto entre N cuerpos y M obstáculos,
+    como Rect.colliderect. obstaculos es un array (M, 4) de left, top,
+    right, bottom; los tamaños sin área se filtran aparte.
+    """
+    izq, arr, der, aba = obstaculos.T
+    return ((x[:, None] < der) & (x[:, None] + ancho[:, None] > izq)
+            & (y[:, None] < aba) & (y[:, None] + alto[:, None] > arr))
+
+
+def _bordes(x, y, ancho, alto):
+    return np.stack((x, y, x + ancho, y + alto), axis=1)
+
+
 class SistemaColisiones:
     """
     Sistema de colisiones simple y práctico para la beta.
     Mantiene una lista de hitboxes (pygame.Rect en coordenadas del mundo)
-    y ofrece métodos para prevenir movimiento y dibujar debug (offset cámara).
+    indexada en una RejillaEspacial, y ofrece métodos para prevenir
+    movimiento y dibujar debug (offset cámara).
     """
 
-    def __init__(self, hitboxes=None):
+    def __init__(self, hitboxes=None, tam_celda=128, indice=None):
         # hitboxes: lista de pygame.Rect
-        self.hitboxes = hitboxes or []
         self.debug_mode = False
+        # Funciones oyente(rect, agregada) que se llaman cuando cambian las hitboxes
+        # (rect es None si se reemplazaron todas)
+        self.oyentes = []
+        # Rect reutilizable para las pruebas de movimiento (evita copias)
+        self._rect_prueba = pygame.Rect(0, 0, 0, 0)
+        # Bordes de las hitboxes como array y, por celda del índice, sus filas en
+        # ese array, para prevenir_movimiento_lote (se arman al usarlo)
+        self._bordes_hitboxes = None
+        self._filas_por_celda = None
+        if indice is not None:
+            # Índice ya calculado para estas hitboxes (nivel compilado): no se reconstruye
+            self.indice = indice
+            self.hitboxes = hitboxes if hitboxes is not None else []
+        else:
+            self.indice = RejillaEspacial(tam_celda)
+            self.set_hitboxes(hitboxes)
 
     def set_hitboxes(self, hitboxes):
+        """Reemplaza las hitboxes y reconstruye el índice completo."""
         self.hitboxes = hitboxes or []
+        self.indice.reconstruir(self.hitboxes)
+        self._bordes_hitboxes = self._filas_por_celda = None
+        self._avisar(None, True)
+
+    def _avisar(self, rect, agregada):
+        for oyente in self.oyentes:
+            oyente(rect, agregada)
 
     def add_hitbox(self, rect):
         self.hitboxes.append(rect)
+        self.indice.insertar(rect)
+        self._bordes_hitboxes = self._filas_por_celda = None
+        self._avisar(rect, True)
+
+    def remove_hitbox(self, rect):
+        for i, r in enumerate(self.hitboxes):
+            if r is rect:
+                del self.hitboxes[i]
+                break
+        self.indice.quitar(rect)
+        self._bordes_hitboxes = self._filas_por_celda = None
+        self._avisar(rect, False)
 
     def verificar_colision_rectangulos(self, rect1, rect2):
         """True si rect1 colisiona con rect2."""
@@ -30,6 +170,20 @@ class SistemaColisiones:
                 col.append(r)
         return col
 
+    def any_collision(self, rect, dx=0, dy=0):
+        """
+        True si rect desplazado (dx, dy) colisiona con alguna hitbox.
+        Solo revisa las celdas cercanas y sale en la primera colisión,
+        sin construir listas ni copiar rect.
+        """
+        prueba = self._rect_prueba
+        prueba.update(rect.x + dx, rect.y + dy, rect.width, rect.height)
+        return self.indice.hay_colision(prueba)
+
+    def colisiones_con(self, rect):
+        """Devuelve las hitboxes que colisionan con rect."""
+        return self.indice.consultar(rect)
+
     def prevenir_movimiento(self, rect_actual, dx, dy):
         """
         Intenta mover rect_actual por (dx, dy), pero previene la penetración.
@@ -38,28 +192,93 @@ class SistemaColisiones:
         """
         nuevo = rect_actual.copy()
 
-        # Probar movimiento en X
-        if dx != 0:
-            prueba_x = nuevo.copy()
-            prueba_x.x += dx
-            if not self.verificar_colision_multiple(prueba_x, self.hitboxes):
-                nuevo.x += dx
-            else:
-                # no mover en X (se evita penetración)
-                pass
-
-        # Probar movimiento en Y
-        if dy != 0:
-            prueba_y = nuevo.copy()
-            prueba_y.y += dy
-            if not self.verificar_colision_multiple(prueba_y, self.hitboxes):
-                nuevo.y += dy
-            else:
-                # no mover en Y
-                pass
+        # Probar movimiento en X (si colisiona no se mueve en X)
+        if dx != 0 and not self.any_collision(nuevo, dx, 0):
+            nuevo.x += dx
+
+        # Probar movimiento en Y (si colisiona no se mueve en Y)
+        if dy != 0 and not self.any_collision(nuevo, 0, dy):
+            nuevo.y += dy
 
         return nuevo
 
+    def prevenir_movimiento_lote(self, x, y, ancho, alto, dx, dy, entre_cuerpos=False):
+        """
+        prevenir_movimiento para N cuerpos a la vez con NumPy.
+        Recibe arrays (o listas) de enteros de largo N (tamaños no negativos,
+        como los rect de los personajes) y devuelve los arrays
+        (x, y) corregidos, con la misma resolución por ejes: primero X y
+        luego Y desde la X ya resuelta. Con entre_cuerpos=True cada cuerpo
+        además choca con los demás en su posición al inicio del paso.
+        """
+        x, y, ancho, alto, dx, dy = (np.asarray(v, dtype=np.int64) for v in (x, y, ancho, alto, dx, dy))
+
+        # Un rect sin área nunca colisiona (ni como cuerpo ni como obstáculo)
+        con_area = (ancho > 0) & (alto > 0)
+        cuerpos = _bordes(x, y, ancho, alto) if entre_cuerpos else None
+
+        # Fase amplia: por cada cuerpo, las hitboxes de las celdas que cubre su
+        # barrido en X y en Y; la prueba exacta se hace solo sobre esos pares
+        izq, der = np.minimum(x, x + dx), np.maximum(x, x + dx) + ancho
+        arr, aba = np.minimum(y, y + dy), np.maximum(y, y + dy) + alto
+        par_cuerpo, par_hitbox = self._pares_candidatos(izq, arr, der, aba, con_area)
+        hitboxes = self._bordes_hitboxes[par_hitbox]
+        ancho_par, alto_par = ancho[par_cuerpo], alto[par_cuerpo]
+
+        def choca(px, py):
+            px_par, py_par = px[par_cuerpo], py[par_cuerpo]
+            toca = ((px_par < hitboxes[:, 2]) & (px_par + ancho_par > hitboxes[:, 0])
+                    & (py_par < hitboxes[:, 3]) & (py_par + alto_par > hitboxes[:, 1]))
+            resultado = np.zeros(len(px), dtype=bool)
+            resultado[par_cuerpo[toca]] = True
+            if cuerpos is not None:
+                toca = _solapes(px, py, ancho, alto, cuerpos) & con_area
+                np.fill_diagonal(toca, False)   # un cuerpo no choca consigo mismo
+                resultado |= toca.any(axis=1)
+            return resultado & con_area
+
+        # Eje X (si colisiona no se mueve en X)
+        nuevo_x = x + dx
+        x = np.where((dx != 0) & ~choca(nuevo_x, y), nuevo_x, x)
+
+        # Eje Y, desde la X ya resuelta
+        nuevo_y = y + dy
+        y = np.where((dy != 0) & ~choca(x, nuevo_y), nuevo_y, y)
+        return x, y
+
+    def _pares_candidatos(self, izq, arr, der, aba, con_area):
+        """
+        Pares (cuerpo, fila de _bordes_hitboxes) de las hitboxes registradas en
+        las celdas que toca cada caja [izq, der) x [arr, aba). Puede haber
+        pares repetidos (una hitbox en varias celdas); no cambian el resultado.
+        """
+        if self._bordes_hitboxes is None:
+            filas = {}
+            bordes = []
+            for r in self.hitboxes:
+                if r.width > 0 and r.height > 0:
+                    filas[id(r)] = len(bordes)
+                    bordes.append((r.left, r.top, r.right, r.bottom))
+            self._bordes_hitboxes = np.array(bordes, dtype=np.int64).reshape(-1, 4)
+            self._filas_por_celda = {celda: [filas[id(r)] for r in rects if id(r) in filas]
+                                     for celda, rects in self.indice.celdas.items()}
+
+        t = self.indice.tam_celda
+        filas_por_celda = self._filas_por_celda
+        par_cuerpo, par_hitbox = [], []
+        cajas = zip((izq // t).tolist(), ((der - 1) // t).tolist(), (arr // t).tolist(),
+                    ((aba - 1) // t).tolist(), con_area.tolist())
+        for i, (cx0, cx1, cy0, cy1, valido) in enumerate(cajas):
+            if not valido:
+                continue
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    filas = filas_por_celda.get((cx, cy))
+                    if filas:
+                        par_cuerpo.extend([i] * len(filas))
+                        par_hitbox.extend(filas)
+        return np.array(par_cuerpo, dtype=np.intp), np.array(par_hitbox, dtype=np.intp)
+
     def dibujar_debug(self, screen, camara, color=(255, 0, 0), grosor=2):
         """
         Dibuja las hitboxes aplicando el offset de la cámara.
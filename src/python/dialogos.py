@@ -1,37 +1,143 @@
+import weakref
+
 import pygame
 
+import temporizadores
+
+
+class CacheGlifos:
+    """
+    Glifos ya renderizados para una fuente y un color.
+    Se comparte entre todos los diálogos que usan la misma fuente, así cada
+    carácter se renderiza una sola vez en toda la partida. Las caches viven
+    lo que vive su fuente: se indexan por la fuente con una referencia débil
+    y la cache tampoco la mantiene viva.
+    """
+
+    _caches = weakref.WeakKeyDictionary()  # fuente -> {color: CacheGlifos}
+
+    @classmethod
+    def para(cls, fuente, color):
+        por_color = cls._caches.setdefault(fuente, {})
+        if color not in por_color:
+            por_color[color] = cls(fuente, color)
+        return por_color[color]
+
+    def __init__(self, fuente, color):
+        self._fuente = weakref.ref(fuente)
+        self.color = color
+        self.glifos = {}
+
+    @property
+    def fuente(self):
+        return self._fuente()
+
+    def glifo(self, caracter):
+        superficie = self.glifos.get(caracter)
+        if superficie is None:
+            superficie = self.fuente.render(caracter, True, self.color)
+            self.glifos[caracter] = superficie
+        return superficie
+
+    def ancho(self, texto):
+        return sum(self.glifo(c).get_width() for c in texto)
+
+
 class Dialogo:
-    def __init__(self, texto, fuente, x, y, ancho, alto):
+    def __init__(self, texto, fuente, x, y, ancho, alto, velocidad=30, rueda=None):
         self.textos = texto if isinstance(texto, list) else [texto]
         self.indice_texto = 0
         self.fuente = fuente
         self.rect = pygame.Rect(x, y, ancho, alto)
         self.color_caja = (30, 30, 30)
         self.color_texto = (255, 255, 255)
-        self.velocidad = 30 
-        self.texto_actual = ""
-        self.tiempo = 0
+        self.margen = 20
+        self.velocidad = velocidad  # caracteres por segundo
+        self.visibles = 0  # caracteres de la línea actual ya mostrados
         self.en_dialogo = True
+        # La máquina de escribir es un temporizador de la rueda, no se sondea cada frame
+        self.rueda = rueda if rueda is not None else temporizadores.RUEDA
+        self.temporizador = None
+        self.glifos = CacheGlifos.para(fuente, self.color_texto)
+        self._preparar_linea()
+
+    @property
+    def texto_actual(self):
+        return self.textos[self.indice_texto][:self.visibles]
+
+    def _preparar_linea(self):
+        """Calcula el layout (con salto de línea por palabras) de la línea actual."""
+        texto = self.textos[self.indice_texto]
+        self.posiciones = self._maquetar(texto)
+        alto_texto = max([y for _, y in self.posiciones] + [0]) + self.fuente.get_linesize()
+        self.capa_texto = pygame.Surface((self.rect.width - 2 * self.margen, alto_texto), pygame.SRCALPHA)
+        self.visibles = 0
+        self.compuestos = 0  # caracteres ya dibujados sobre capa_texto
+        self._detener_escritura()
+        if texto:
+            self.temporizador = self.rueda.cada(1000 / self.velocidad, self._revelar)
 
-    def actualizar(self, dt):
-        if not self.en_dialogo:
-            return
+    def _revelar(self):
+        self.visibles += 1
+        if self.visibles >= len(self.textos[self.indice_texto]):
+            self._detener_escritura()
 
-        texto_completo = self.textos[self.indice_texto]
-        if len(self.texto_actual) < len(texto_completo):
-            self.tiempo += dt
-            if self.tiempo > 1000 / self.velocidad:
-                self.texto_actual += texto_completo[len(self.texto_actual)]
-                self.tiempo = 0
+    def _detener_escritura(self):
+        if self.temporizador is not None:
+            self.temporizador.cancelar()
+            self.temporizador = None
+
+    def _maquetar(self, texto):
+        """Devuelve la posición (x, y) de cada carácter dentro de la caja."""
+        ancho_maximo = self.rect.width - 2 * self.margen
+        alto_linea = self.fuente.get_linesize()
+        posiciones = []
+        x = y = 0
+        i = 0
+        while i < len(texto):
+            if texto[i] == "\n":
+                posiciones.append((x, y))
+                x, y = 0, y + alto_linea
+                i += 1
+                continue
+            if texto[i] == " ":
+                posiciones.append((x, y))
+                x += self.glifos.ancho(" ")
+                i += 1
+                continue
+
+            # Palabra completa: si no cabe en lo que queda de línea, pasa a la siguiente
+            fin = i
+            while fin < len(texto) and texto[fin] not in " \n":
+                fin += 1
+            if x > 0 and x + self.glifos.ancho(texto[i:fin]) > ancho_maximo:
+                x, y = 0, y + alto_linea
+            for caracter in texto[i:fin]:
+                ancho = self.glifos.ancho(caracter)
+                # Palabras más largas que la caja se cortan por carácter
+                if x > 0 and x + ancho > ancho_maximo:
+                    x, y = 0, y + alto_linea
+                posiciones.append((x, y))
+                x += ancho
+            i = fin
+        return posiciones
 
     def siguiente_linea(self):
         if self.indice_texto < len(self.textos) - 1:
             self.indice_texto += 1
-            self.texto_actual = ""
+            self._preparar_linea()
         else:
             self.en_dialogo = False
+            self._detener_escritura()
 
     def dibujar(self, pantalla):
         pygame.draw.rect(pantalla, self.color_caja, self.rect, border_radius=15)
-        texto_surface = self.fuente.render(self.texto_actual, True, self.color_texto)
-        pantalla.blit(texto_surface, (self.rect.x + 20, self.rect.y + 20))
\ No newline at end of file
+
+        # Componer solo los caracteres revelados desde el último frame
+        texto = self.textos[self.indice_texto]
+        for i in range(self.compuestos, self.visibles):
+            if texto[i] not in " \n":
+                self.capa_texto.blit(self.glifos.glifo(texto[i]), self.posiciones[i])
+        self.compuestos = self.visibles
+
+        pantalla.blit(self.capa_texto, (self.rect.x + self.margen, self.rect.y + self.margen))
@@ -0,0 +1,139 @@
+import struct
+
+import pygame
+
+# Teclas que usa el juego; cada una ocupa un bit de la máscara de un tick
+TECLAS = (
+    pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d,
+    pygame.K_e, pygame.K_m, pygame.K_SPACE, pygame.K_RETURN,
+    pygame.K_ESCAPE, pygame.K_0, pygame.K_9, pygame.K_F12,
+)
+_BITS = {tecla: bit for bit, tecla in enumerate(TECLAS)}
+
+# Formato del log: cabecera y luego, por tick, máscara + eventos
+MAGIA = b"ELOC"
+VERSION = 1
+_CABECERA = struct.Struct("<4sHH")   # magia, versión, hz de la simulación
+_TICK = struct.Struct("<HB")         # máscara de teclas, cantidad de eventos
+_EVENTO = struct.Struct("<BI")       # tipo (0 = QUIT, 1 = KEYDOWN), tecla
+
+_QUIT, _KEYDOWN = 0, 1
+
+
+class EstadoTeclas:
+    """Teclas pulsadas en un tick; se indexa igual que pygame.key.get_pressed()."""
+
+    __slots__ = ("mascara",)
+
+    def __init__(self, mascara=0):
+        self.mascara = mascara
+
+    @classmethod
+    def desde_teclado(cls, pulsadas):
+        mascara = 0
+        for bit, tecla in enumerate(TECLAS):
+            if pulsadas[tecla]:
+                mascara |= 1 << bit
+        return cls(mascara)
+
+    def __getitem__(self, tecla):
+        bit = _BITS.get(tecla)
+        return bit is not None and bool(self.mascara >> bit & 1)
+
+
+class EntradaTeclado:
+    """Entrada en vivo: teclado y cola de eventos de pygame."""
+
+    terminado = False
+
+    def leer(self):
+        """Devuelve (teclas, eventos) del tick actual."""
+        eventos = pygame.event.get()
+        return EstadoTeclas.desde_teclado(pygame.key.get_pressed()), eventos
+
+
+class GrabadorEntrada:
+    """
+    Envuelve otra entrada y graba cada tick en un log binario compacto:
+    la máscara de teclas y los eventos QUIT / KEYDOWN.
+    """
+
+    def __init__(self, fuente, ruta, hz=60):
+        self.fuente = fuente
+        self.archivo = open(ruta, "wb")
+        self.archivo.write(_CABECERA.pack(MAGIA, VERSION, hz))
+        self.ticks = 0
+
+    @property
+    def terminado(self):
+        return self.fuente.terminado
+
+    def leer(self):
+        teclas, eventos = self.fuente.leer()
+        grabables = [e for e in eventos if e.type == pygame.QUIT or e.type == pygame.KEYDOWN]
+        self.archivo.write(_TICK.pack(teclas.mascara, len(grabables)))
+        for evento in grabables:
+            if evento.type == pygame.QUIT:
+                self.archivo.write(_EVENTO.pack(_QUIT, 0))
+                self.archivo.flush()  # el juego sale justo después
+            else:
+                self.archivo.write(_EVENTO.pack(_KEYDOWN, evento.key))
+        self.ticks += 1
+        return teclas, eventos
+
+    def cerrar(self):
+        self.archivo.close()
+
+
+class ReproductorEntrada:
+    """
+    Reproduce un log tick a tick. Da exactamente la misma entrada en el
+    mismo tick, sin importar si se ejecuta headless o dibujando, ni a qué
+    velocidad.
+    """
+
+    def __init__(self, ruta):
+        with open(ruta, "rb") as archivo:
+            datos = archivo.read()
+        magia, version, self.hz = _CABECERA.unpack_from(datos, 0)
+        if magia != MAGIA or version != VERSION:
+            raise ValueError(f"{ruta} no es un log de entrada válido (versión {VERSION})")
+
+        # Se decodifica todo al cargar: leer() es solo avanzar un índice
+        self.ticks = []
+        pos = _CABECERA.size
+        while pos < len(datos):
+            mascara, cantidad = _TICK.unpack_from(datos, pos)
+            pos += _TICK.size
+            eventos = []
+            for _ in range(cantidad):
+                tipo, tecla = _EVENTO.unpack_from(datos, pos)
+                pos += _EVENTO.size
+                if tipo == _QUIT:
+                    eventos.append(pygame.event.Event(pygame.QUIT))
+                else:
+                    eventos.append(pygame.event.Event(pygame.KEYDOWN, key=tecla))
+            self.ticks.append((EstadoTeclas(mascara), eventos))
+        self.indice = 0
+
+    @property
+    def terminado(self):
+        return self.indice >= len(self.ticks)
+
+    def leer(self):
+        # La ventana real solo se atiende para poder cerrarla
+        eventos_reales = [e for e in pygame.event.get() if e.type == pygame.QUIT]
+        if self.terminado:
+            return EstadoTeclas(), eventos_reales
+        teclas, eventos = self.ticks[self.indice]
+        self.indice += 1
+        return teclas, eventos + eventos_reales
+
+
+def crear_entrada(argv, hz=60):
+    """Entrada según la línea de comandos: --grabar ruta / --reproducir ruta."""
+    if "--reproducir" in argv:
+        return ReproductorEntrada(argv[argv.index("--reproducir") + 1])
+    if "--grabar" in argv:
+        return GrabadorEntrada(EntradaTeclado(), argv[argv.index("--grabar") + 1], hz)
+    return EntradaTeclado()
@@ -0,0 +1,66 @@
+import pygame
+
+
+class FondoPorChunks:
+    """
+    Fondo de nivel cortado en chunks de tamaño fijo al cargarlo.
+    Al dibujar solo se hace blit de los chunks que intersectan la vista
+    de la cámara, así el coste por frame depende del tamaño de la pantalla
+    y no del tamaño del mapa.
+    """
+
+    def __init__(self, superficie, tam_chunk=256):
+        self.ancho, self.alto = superficie.get_size()
+        self.tam_chunk = tam_chunk
+        self.bytesize = superficie.get_bytesize()
+        self.columnas = -(-self.ancho // tam_chunk)
+        self.filas = -(-self.alto // tam_chunk)
+
+        # chunks[fila][columna]: copias independientes, la superficie original se puede liberar
+        self.chunks = []
+        for fila in range(self.filas):
+            fila_chunks = []
+            for columna in range(self.columnas):
+                rect = pygame.Rect(columna * tam_chunk, fila * tam_chunk, tam_chunk, tam_chunk)
+                rect = rect.clip(superficie.get_rect())
+                fila_chunks.append(superficie.subsurface(rect).copy())
+            self.chunks.append(fila_chunks)
+
+    def get_size(self):
+        return self.ancho, self.alto
+
+    def get_bytesize(self):
+        return self.bytesize
+
+    def get_rect(self):
+        return pygame.Rect(0, 0, self.ancho, self.alto)
+
+    def dibujar(self, pantalla, camara, zona=None):
+        """
+        Dibuja la parte visible del fondo aplicando el offset de la cámara.
+        Con zona (rect de pantalla) solo se repinta esa parte.
+        """
+        t = self.tam_chunk
+        cam_x, cam_y = int(camara.x), int(camara.y)
+        if zona is None:
+            zona = pantalla.get_rect()
+
+        col_ini = max(0, (cam_x + zona.left) // t)
+        col_fin = min(self.columnas - 1, (cam_x + zona.right - 1) // t)
+        fila_ini = max(0, (cam_y + zona.top) // t)
+        fila_fin = min(self.filas - 1, (cam_y + zona.bottom - 1) // t)
+
+        destino = pygame.Rect(0, 0, t, t)
+        for fila in range(fila_ini, fila_fin + 1):
+            fila_chunks = self.chunks[fila]
+            destino.y = fila * t - cam_y
+            for columna in range(col_ini, col_fin + 1):
+                destino.x = columna * t - cam_x
+                # Solo la parte del chunk que cae dentro de la zona
+                parte = destino.clip(zona)
+                pantalla.blit(fila_chunks[columna], parte, parte.move(-destino.x, -destino.y))
+
+
+def cargar_fondo_por_chunks(ruta, tam_chunk=256):
+    """Cargador para CacheEscenas: decodifica y corta el fondo en chunks."""
+    return FondoPorChunks(pygame.image.load(ruta).convert_alpha(), tam_chunk)
@@ -0,0 +1,324 @@
+import os
+import struct
+import threading
+import zlib
+
+import inventario as inv
+
+# Partidas guardadas en un binario compacto y versionado.
+# Cabecera y después secciones (id, largo, datos); una sección que esta
+# versión no conoce se salta, así se pueden agregar secciones sin romper
+# partidas viejas. Un cambio incompatible sube VERSION.
+# Las partes que viven en C++ (misiones, EntityStore) se exportan ya en
+# binario desde el módulo compilado y se guardan tal cual.
+
+MAGIA = b"GUAR"
+VERSION = 1
+# magia, versión, cantidad de secciones, largo de las secciones, crc32 de las secciones
+_CABECERA = struct.Struct("<4sHHII")
+_SECCION = struct.Struct("<HI")          # id, largo
+_PERSONAJE = struct.Struct("<iiii")      # dinero, movimiento, x, y
+_TEXTO = struct.Struct("<H")
+_ENTERO = struct.Struct("<i")
+_INVENTARIO = struct.Struct("<III")      # capacidad, tam_pila, cantidad de tipos
+
+PERSONAJE, NECESIDADES, INVENTARIO, MISIONES, ESCENA, ENTIDADES = range(1, 7)
+
+RUTA_AUTOGUARDADO = "partidas/autoguardado.sav"
+
+
+class RegistroObjetos:
+    """
+    Objetos de inventario por nombre de tipo. El inventario se guarda por
+    nombre, y al cargar cada nombre se vuelve a convertir en su objeto real
+    (p. ej. el Producto de la Tienda) con este registro.
+    """
+
+    def __init__(self):
+        self._objetos = {}
+
+    def registrar(self, *objetos):
+        for objeto in objetos:
+            self._objetos[str(inv.tipo_de(objeto))] = objeto
+
+    def __call__(self, nombre):
+        objeto = self._objetos.get(nombre)
+        if objeto is None:
+            raise ValueError(f"Objeto de inventario desconocido en la partida: {nombre}")
+        return objeto
+
+
+# Registro del juego: lo llenan los mains con los objetos que existen (catálogo de la tienda)
+OBJETOS = RegistroObjetos()
+
+
+class Instantanea:
+    """
+    Estado de una partida copiado en valores inmutables (tuplas, textos,
+    bytes), así se puede serializar en otro hilo mientras el juego sigue.
+    """
+
+    def __init__(self, personaje, estados=(), inventario=None, misiones=None, escena="", entidades=None):
+        self.personaje = personaje    # (dinero, movimiento, x, y)
+        self.estados = estados        # ((nombre, valor), ...) necesidades
+        self.inventario = inventario  # (capacidad, tam_pila, ((tipo, slots, cantidades), ...))
+        self.misiones = misiones      # bytes de MotorMisiones.exportar_estado()
+        self.escena = escena          # nombre del nivel o escena actual
+        self.entidades = entidades    # bytes de EntityStore.exportar()
+
+
+def _campo_cpp(objeto, nombre):
+    """
+    Propiedad del lado C++ (Personaje) aunque la subclase de Python la tape:
+    en Protagonista, movimiento es el método que mueve al jugador.
+    """
+    for clase in type(objeto).__mro__:
+        campo = clase.__dict__.get(nombre)
+        if isinstance(campo, property):
+            return campo
+    raise AttributeError(nombre)
+
+
+def capturar(jugador, escena="", motor_misiones=None, entidades=None):
+    """Copia el estado en el hilo principal; no serializa nada (es barato)."""
+    movimiento = _campo_cpp(jugador, "movimiento").__get__(jugador)
+    personaje = (jugador.dinero, movimiento, jugador.rect.x, jugador.rect.y)
+    estados = tuple(getattr(jugador, "estados", {}).items())
+    inventario = getattr(jugador, "inventario", None)
+    if inventario is not None:
+        # Los tipos se guardan por nombre; los ejemplares se resuelven al cargar
+        tipos = tuple((str(tipo), slots, cantidades) for tipo, _, slots, cantidades in inventario.estado())
+        inventario = (inventario.capacidad, inventario.tam_pila, tipos)
+    return Instantanea(
+        personaje, estados, inventario,
+        motor_misiones.exportar_estado() if motor_misiones is not None else None,
+        escena,
+        entidades.exportar() if entidades is not None else None,
+    )
+
+
+def _texto(texto):
+    datos = texto.encode("utf-8")
+    return _TEXTO.pack(len(datos)) + datos
+
+
+def _leer_texto(datos, pos):
+    (largo,) = _TEXTO.unpack_from(datos, pos)
+    pos += _TEXTO.size
+    return str(datos[pos:pos + largo], "utf-8"), pos + largo
+
+
+def serializar(instantanea):
+    secciones = [(PERSONAJE, _PERSONAJE.pack(*instantanea.personaje))]
+
+    partes = [_TEXTO.pack(len(instantanea.estados))]
+    for nombre, valor in instantanea.estados:
+        partes += [_texto(nombre), _ENTERO.pack(valor)]
+    secciones.append((NECESIDADES, b"".join(partes)))
+
+    if instantanea.inventario is not None:
+        capacidad, tam_pila, tipos = instantanea.inventario
+        partes = [_INVENTARIO.pack(capacidad, tam_pila, len(tipos))]
+        for tipo, slots, cantidades in tipos:
+            n = len(slots)
+            partes += [_texto(tipo), struct.pack(f"<I{n}I{n}I", n, *slots, *cantidades)]
+        secciones.append((INVENTARIO, b"".join(partes)))
+
+    if instantanea.misiones is not None:
+        secciones.append((MISIONES, instantanea.misiones))
+    secciones.append((ESCENA, instantanea.escena.encode("utf-8")))
+    if instantanea.entidades is not None:
+        secciones.append((ENTIDADES, instantanea.entidades))
+
+    cuerpo = b"".join(_SECCION.pack(id_seccion, len(datos)) + datos for id_seccion, datos in secciones)
+    return _CABECERA.pack(MAGIA, VERSION, len(secciones), len(cuerpo), zlib.crc32(cuerpo)) + cuerpo
+
+
+def deserializar(datos):
+    """Instantanea de unos bytes guardados; cualquier problema de formato es ValueError."""
+    try:
+        return _deserializar(datos)
+    except (struct.error, KeyError, IndexError, UnicodeDecodeError) as error:
+        raise ValueError(f"Partida guardada dañada: {error}") from error
+
+
+def _deserializar(datos):
+    if len(datos) < _CABECERA.size:
+        raise ValueError("Partida guardada incompleta")
+    magia, version, n_secciones, largo, crc = _CABECERA.unpack_from(datos)
+    if magia != MAGIA:
+        raise ValueError("No es una partida guardada")
+    if version != VERSION:
+        raise ValueError(f"Versión de partida no soportada: {version}")
+    cuerpo = memoryview(datos)[_CABECERA.size:_CABECERA.size + largo]
+    if len(cuerpo) != largo or zlib.crc32(cuerpo) != crc:
+        raise ValueError("Partida guardada dañada")
+
+    secciones = {}
+    pos = 0
+    for _ in range(n_secciones):
+        id_seccion, largo_seccion = _SECCION.unpack_from(cuerpo, pos)
+        pos += _SECCION.size
+        secciones[id_seccion] = cuerpo[pos:pos + largo_seccion]
+        pos += largo_seccion
+
+    personaje = _PERSONAJE.unpack(secciones[PERSONAJE])
+
+    estados = []
+    seccion = secciones.get(NECESIDADES)
+    if seccion is not None:
+        (n,) = _TEXTO.unpack_from(seccion)
+        pos = _TEXTO.size
+        for _ in range(n):
+            nombre, pos = _leer_texto(seccion, pos)
+            estados.append((nombre, _ENTERO.unpack_from(seccion, pos)[0]))
+            pos += _ENTERO.size
+
+    inventario = None
+    seccion = secciones.get(INVENTARIO)
+    if seccion is not None:
+        capacidad, tam_pila, n_tipos = _INVENTARIO.unpack_from(seccion)
+        pos = _INVENTARIO.size
+        tipos = []
+        for _ in range(n_tipos):
+            tipo, pos = _leer_texto(seccion, pos)
+            (n,) = struct.unpack_from("<I", seccion, pos)
+            valores = struct.unpack_from(f"<{2 * n}I", seccion, pos + 4)
+            pos += 4 + 8 * n
+            tipos.append((tipo, valores[:n], valores[n:]))
+        inventario = (capacidad, tam_pila, tuple(tipos))
+
+    misiones = bytes(secciones[MISIONES]) if MISIONES in secciones else None
+    escena = bytes(secciones.get(ESCENA, b"")).decode("utf-8")
+    entidades = bytes(secciones[ENTIDADES]) if ENTIDADES in secciones else None
+    return Instantanea(personaje, tuple(estados), inventario, misiones, escena, entidades)
+
+
+def aplicar(instantanea, jugador, motor_misiones=None, entidades=None, resolver=OBJETOS):
+    """
+    Pone el estado guardado en los objetos del juego y devuelve la escena
+    guardada (cambiar de escena le toca a quien llama). resolver(nombre)
+    devuelve el objeto de inventario de un tipo (por defecto, OBJETOS).
+    Lo que puede fallar (objetos desconocidos, misiones que no coinciden)
+    se comprueba antes de tocar al jugador; los errores son ValueError.
+    """
+    estado_inventario = None
+    if instantanea.inventario is not None and hasattr(jugador, "inventario"):
+        capacidad, tam_pila, tipos = instantanea.inventario
+        estado_inventario = []
+        usados = set()
+        for tipo, slots, cantidades in tipos:
+            ejemplar = resolver(tipo)
+            for slot, cantidad in zip(slots, cantidades):
+                if slot >= capacidad or slot in usados or not 0 < cantidad <= tam_pila:
+                    raise ValueError(f"inventario guardado inválido en el slot {slot}")
+                usados.add(slot)
+            estado_inventario.append((inv.tipo_de(ejemplar), ejemplar, slots, cantidades))
+
+    # Cada importación de C++ valida su parte antes de cambiarla, pero no la
+    # del otro: si las entidades fallan, las misiones vuelven a como estaban
+    respaldo_misiones = None
+    if instantanea.misiones is not None and motor_misiones is not None:
+        respaldo_misiones = motor_misiones.exportar_estado()
+        motor_misiones.importar_estado(instantanea.misiones)
+    if instantanea.entidades is not None and entidades is not None:
+        try:
+            entidades.importar(instantanea.entidades)
+        except Exception:
+            if respaldo_misiones is not None:
+                motor_misiones.importar_estado(respaldo_misiones)
+            raise
+
+    jugador.dinero, movimiento, x, y = instantanea.personaje
+    _campo_cpp(jugador, "movimiento").__set__(jugador, movimiento)
+    jugador.rect.topleft = (x, y)
+    jugador.eje_x, jugador.eje_y = x, y
+    jugador.pos_previa = (x, y)
+    if hasattr(jugador, "estados"):
+        jugador.estados.update(instantanea.estados)
+
+    if estado_inventario is not None:
+        inventario = jugador.inventario
+        if inventario.capacidad != capacidad or inventario.tam_pila != tam_pila:
+            inventario = jugador.inventario = inv.Inventario(capacidad, tam_pila)
+        inventario.restaurar(estado_inventario)
+    return instantanea.escena
+
+
+def escribir_atomico(ruta, datos):
+    """Escribe a un temporal, fsync y rename: nunca queda una partida a medias."""
+    carpeta = os.path.dirname(ruta)
+    if carpeta:
+        os.makedirs(carpeta, exist_ok=True)
+    temporal = ruta + ".tmp"
+    with open(temporal, "wb") as archivo:
+        archivo.write(datos)
+        archivo.flush()
+        os.fsync(archivo.fileno())
+    os.replace(temporal, ruta)
+    # Que el rename también llegue al disco (en Windows no se puede abrir la carpeta)
+    if carpeta and hasattr(os, "O_DIRECTORY"):
+        descriptor = os.open(carpeta, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+
+def guardar(ruta, instantanea):
+    escribir_atomico(ruta, serializar(instantanea))
+
+
+def cargar(ruta):
+    with open(ruta, "rb") as archivo:
+        return deserializar(archivo.read())
+
+
+class AutoGuardado:
+    """
+    Guardado en segundo plano. guardar() recibe una Instantanea ya copiada
+    en el hilo principal y vuelve enseguida; un hilo de trabajo la serializa
+    y la escribe. Si llega otra antes de escribir la anterior, solo se
+    escribe la más nueva.
+    """
+
+    def __init__(self, ruta=RUTA_AUTOGUARDADO):
+        self.ruta = ruta
+        self.guardados = 0
+        self.error = None             # último error de escritura (el hilo no lo lanza)
+        self._pendiente = None
+        self._escribiendo = False
+        self._condicion = threading.Condition()
+        self._hilo = None
+
+    def guardar(self, instantanea):
+        with self._condicion:
+            self._pendiente = instantanea
+            self._condicion.notify()
+            if self._hilo is None:
+                self._hilo = threading.Thread(target=self._trabajar, daemon=True)
+                self._hilo.start()
+
+    def esperar(self):
+        """Bloquea hasta que no quede nada por escribir (p. ej. al salir)."""
+        with self._condicion:
+            while self._pendiente is not None or self._escribiendo:
+                self._condicion.wait()
+
+    def _trabajar(self):
+        while True:
+            with self._condicion:
+                while self._pendiente is None:
+                    self._condicion.wait()
+                instantanea, self._pendiente = self._pendiente, None
+                self._escribiendo = True
+            try:
+                guardar(self.ruta, instantanea)
+                self.guardados += 1
+                self.error = None
+            except Exception as error:
+                self.error = error
+            finally:
+                with self._condicion:
+                    self._escribiendo = False
+                    self._condicion.notify_all()
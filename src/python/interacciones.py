@@ -0,0 +1,93 @@
+import colisiones
+
+
+class Interactuable:
+    """Una entidad con la que se puede interactuar y lo que pasa al hacerlo."""
+
+    __slots__ = ("entidad", "accion", "aviso", "zona")
+
+    def __init__(self, entidad, accion, aviso, zona):
+        self.entidad = entidad
+        self.accion = accion    # función accion(entidad)
+        self.aviso = aviso      # texto que se muestra encima ("E")
+        self.zona = zona        # rect de la entidad agrandado por el alcance
+
+
+class RegistroInteracciones:
+    """
+    Registro de NPCs (u objetos) interactuables con un índice de proximidad.
+    Las zonas de interacción se guardan en una RejillaEspacial, así buscar
+    el más cercano al jugador solo revisa las celdas de su alrededor.
+    Los textos de aviso se renderizan una sola vez.
+    """
+
+    def __init__(self, fuente, alcance=20, tam_celda=128, color=(255, 255, 255)):
+        self.fuente = fuente
+        self.alcance = alcance
+        self.color = color
+        self.indice = colisiones.RejillaEspacial(tam_celda)
+        self._por_zona = {}      # id(zona) -> Interactuable
+        self._por_entidad = {}   # id(entidad) -> Interactuable
+        self.avisos = {}         # texto -> superficie ya renderizada
+
+    def registrar(self, entidad, accion, aviso="E"):
+        zona = entidad.rect.inflate(self.alcance, self.alcance)
+        item = Interactuable(entidad, accion, aviso, zona)
+        self._por_zona[id(zona)] = item
+        self._por_entidad[id(entidad)] = item
+        self.indice.insertar(zona)
+        return item
+
+    def quitar(self, entidad):
+        item = self._por_entidad.pop(id(entidad), None)
+        if item is not None:
+            self.indice.quitar(item.zona)
+            del self._por_zona[id(item.zona)]
+
+    def actualizar(self, entidad):
+        """Vuelve a indexar una entidad que se movió."""
+        item = self._por_entidad[id(entidad)]
+        if item.zona.center == entidad.rect.center:
+            return
+        self.indice.quitar(item.zona)
+        item.zona.center = entidad.rect.center
+        self.indice.insertar(item.zona)
+
+    def mas_cercano(self, rect):
+        """Interactuable más cercano cuya zona toca rect, o None."""
+        mejor = None
+        mejor_distancia = None
+        cx, cy = rect.center
+        for zona in self.indice.consultar(rect):
+            zx, zy = zona.center
+            distancia = (zx - cx) ** 2 + (zy - cy) ** 2
+            if mejor is None or distancia < mejor_distancia:
+                mejor, mejor_distancia = self._por_zona[id(zona)], distancia
+        return mejor
+
+    def interactuar(self, rect):
+        """Ejecuta la acción del interactuable más cercano; True si había alguno."""
+        item = self.mas_cercano(rect)
+        if item is None:
+            return False
+        item.accion(item.entidad)
+        return True
+
+    def superficie_aviso(self, texto):
+        superficie = self.avisos.get(texto)
+        if superficie is None:
+            superficie = self.avisos[texto] = self.fuente.render(texto, True, self.color)
+        return superficie
+
+    def aviso(self, rect, camara):
+        """
+        Aviso del interactuable más cercano a rect como (superficie, zona de
+        pantalla) para dibujarlo con blit; None si no hay ninguno en alcance.
+        """
+        item = self.mas_cercano(rect)
+        if item is None:
+            return None
+        superficie = self.superficie_aviso(item.aviso)
+        entidad = item.entidad.rect
+        return superficie, superficie.get_rect(topleft=(entidad.centerx - superficie.get_width() // 2 - camara.x,
+                                                        entidad.top - 35 - camara.y))
@@ -2,24 +2,164 @@ import pygame
 
 
 
+def tipo_de(producto):
+    """Clave de apilado de un objeto: su nombre si lo tiene, si no el propio objeto."""
+    return getattr(producto, "nombre", producto)
+
+
 class Inventario ():
-    def __init__ (self, capacidad):
-        self.contenido = []
-        self.capacidad = capacidad
+    """
+    Inventario por slots con apilado por tipo de objeto.
+    Un índice tipo -> slots y una pila de slots libres hacen que agregar,
+    quitar y contar por tipo sean O(1) (por slot tocado). Invariante: todos
+    los slots de un tipo están llenos salvo el último de su lista.
+    """
+
+    def __init__ (self, capacidad, tam_pila=99):
+        self.capacidad = capacidad  # número de slots
+        self.tam_pila = tam_pila    # máximo de unidades por slot
+        self.tipo_slot = [None] * capacidad
+        self.cantidad_slot = [0] * capacidad
+        self.slots_por_tipo = {}    # tipo -> índices de slots ocupados por ese tipo
+        self.totales = {}           # tipo -> unidades totales
+        self.ejemplares = {}        # tipo -> objeto representativo
+        self.libres = list(range(capacidad - 1, -1, -1))  # pila de slots libres
 
     def abrir_inventario (self, pantalla, interfaz):
-        interfaz.interfaz_inventario (pantalla, interfaz, self.capacidad)
+        return interfaz.interfaz_inventario (pantalla, self.capacidad)
+
+    @property
+    def slots_libres(self):
+        return len(self.libres)
 
-    def agregar_objeto (self, producto: object):
-        if self.capacidad <= 0:
+    @property
+    def contenido(self):
+        """Lista de (objeto, cantidad) por tipo."""
+        return [(self.ejemplares[tipo], total) for tipo, total in self.totales.items()]
+
+    def cantidad(self, producto):
+        return self.totales.get(tipo_de(producto), 0)
+
+    def espacio_para(self, producto):
+        """Unidades de ese tipo que todavía caben."""
+        espacio = len(self.libres) * self.tam_pila
+        slots = self.slots_por_tipo.get(tipo_de(producto))
+        if slots:
+            espacio += self.tam_pila - self.cantidad_slot[slots[-1]]
+        return espacio
+
+    def agregar_objeto (self, producto: object, cantidad=1):
+        if cantidad < 1:
+            return False
+        if cantidad > self.espacio_para(producto):
             print("No se puede agregar el objeto al inventario")
-        else:
-            self.contenido.append(producto)
-            self.capacidad -= 1
+            return False
+
+        tipo = tipo_de(producto)
+        slots = self.slots_por_tipo.setdefault(tipo, [])
+        self.ejemplares.setdefault(tipo, producto)
+        self.totales[tipo] = self.totales.get(tipo, 0) + cantidad
+
+        while cantidad > 0:
+            # Completar el último slot del tipo o abrir uno libre
+            if not slots or self.cantidad_slot[slots[-1]] == self.tam_pila:
+                slot = self.libres.pop()
+                self.tipo_slot[slot] = tipo
+                slots.append(slot)
+            slot = slots[-1]
+            agregadas = min(cantidad, self.tam_pila - self.cantidad_slot[slot])
+            self.cantidad_slot[slot] += agregadas
+            cantidad -= agregadas
+        return True
+
+    def quitar_objeto (self, producto: object, cantidad=1):
+        tipo = tipo_de(producto)
+        if cantidad < 1 or cantidad > self.totales.get(tipo, 0):
+            return False
+
+        slots = self.slots_por_tipo.get(tipo)
+        if not slots:
+            return False
+        self.totales[tipo] -= cantidad
+        while cantidad > 0:
+            slot = slots[-1]
+            quitadas = min(cantidad, self.cantidad_slot[slot])
+            self.cantidad_slot[slot] -= quitadas
+            cantidad -= quitadas
+            if self.cantidad_slot[slot] == 0:
+                # Slot vacío: vuelve a la pila de libres
+                self.tipo_slot[slot] = None
+                slots.pop()
+                self.libres.append(slot)
+
+        if not slots:
+            del self.slots_por_tipo[tipo]
+            del self.totales[tipo]
+            del self.ejemplares[tipo]
+        return True
+
+    def estado (self):
+        """Copia del contenido por tipo: [(tipo, ejemplar, slots, cantidades)] (para guardar)."""
+        return [(tipo, self.ejemplares[tipo], tuple(slots), tuple(self.cantidad_slot[s] for s in slots))
+                for tipo, slots in self.slots_por_tipo.items()]
+
+    def restaurar (self, estado):
+        """Reemplaza el contenido por uno guardado con estado() (mismos slots y orden)."""
+        self.tipo_slot = [None] * self.capacidad
+        self.cantidad_slot = [0] * self.capacidad
+        self.slots_por_tipo, self.totales, self.ejemplares = {}, {}, {}
+        for tipo, ejemplar, slots, cantidades in estado:
+            for slot, cantidad in zip(slots, cantidades):
+                self.tipo_slot[slot] = tipo
+                self.cantidad_slot[slot] = cantidad
+            self.slots_por_tipo[tipo] = list(slots)
+            self.totales[tipo] = sum(cantidades)
+            self.ejemplares[tipo] = ejemplar
+        self.libres = [slot for slot in range(self.capacidad - 1, -1, -1) if self.tipo_slot[slot] is None]
+
+    def vender_objeto (self, producto: object, cantidad=1):
+        return self.quitar_objeto(producto, cantidad)
 
-    def vender_objeto (self, producto: object):
-        self.contenido.remove(producto)
-        self.capacidad += 1
+    def transferir (self, destino, producto: object, cantidad=1):
+        """Mueve cantidad unidades a otro inventario (p. ej. jugador <-> tienda)."""
+        if cantidad < 1 or cantidad > self.cantidad(producto) or cantidad > destino.espacio_para(producto):
+            return False
+        ejemplar = self.ejemplares[tipo_de(producto)]
+        self.quitar_objeto(producto, cantidad)
+        destino.agregar_objeto(ejemplar, cantidad)
+        return True
 
+    def transferir_todo (self, destino, pedido: dict):
+        """
+        Transferencia en bloque: pedido es {objeto: cantidad}.
+        Es todo o nada: si algo no cabe o falta, no se mueve nada.
+        """
+        # Objetos distintos del mismo tipo se suman: las comprobaciones son por tipo
+        por_tipo = {}
+        for producto, cantidad in pedido.items():
+            if cantidad < 1:
+                return False
+            tipo = tipo_de(producto)
+            por_tipo[tipo] = (producto, por_tipo.get(tipo, (producto, 0))[1] + cantidad)
 
+        for tipo, (producto, cantidad) in por_tipo.items():
+            if cantidad > self.totales.get(tipo, 0):
+                return False
+        # Comprobar que todo cabe en el destino antes de mover nada
+        libres = len(destino.libres)
+        for tipo, (producto, cantidad) in por_tipo.items():
+            slots = destino.slots_por_tipo.get(tipo)
+            hueco = destino.tam_pila - destino.cantidad_slot[slots[-1]] if slots else 0
+            extra = max(0, cantidad - hueco)
+            libres -= -(-extra // destino.tam_pila)
+            if libres < 0:
+                return False
 
+        antes_origen, antes_destino = self.estado(), destino.estado()
+        for producto, cantidad in por_tipo.values():
+            if not self.transferir(destino, producto, cantidad):
+                # No debería pasar tras las comprobaciones; si pasa, ambos vuelven a como estaban
+                self.restaurar(antes_origen)
+                destino.restaurar(antes_destino)
+                return False
+        return True
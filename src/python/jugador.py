@@ -1,5 +1,7 @@
 import pygame
 from compilados_py.Release import personaje as per
+from atlas_sprites import AtlasSprites
+import animacion
 class Protagonista (per.Personaje):
     #Clase que se encarga de generar el personaje jugable:
     #Recibe movimiento, dinero, imagen de Sprite, posicion en X y Y, Velocidad
@@ -7,56 +9,51 @@ class Protagonista (per.Personaje):
         super().__init__(movimiento, dinero)
         self.eje_x = eje_x
         self.eje_y = eje_y
-        self.velocidad = velocidad
+        self.velocidad = velocidad  # px por paso de simulación (ver bucle_juego)
         self.flip_x = False
         self.flip_y = False
         
         # Rectángulo de colisión del jugador
         self.rect = pygame.Rect(eje_x, eje_y, 95, 145)
+        # Posición al inicio del último paso, para dibujar interpolado
+        self.pos_previa = (eje_x, eje_y)
         
-        # Sistema de animaciones
-        self.animaciones = animaciones
-        self.frame_index = 0
-        self.animation_speed = 0.1  # Velocidad de cambio de frame
+        # Sistema de animaciones (frames empaquetados en un atlas con todos los flips)
+        self.animaciones = animaciones if isinstance(animaciones, AtlasSprites) else AtlasSprites(animaciones)
         self.current_animation = "idle"
-        self.last_update = pygame.time.get_ticks()
-        
-        # Estados de animación por dirección
-        self.animation_states = {
-            "idle": [0],           # Frame 0 para idle
-            "up": [1],             # Frame 1 para arriba (W)
-            "down": [4],           # Frame 4 para abajo (S)
-            "left": [5, 6],        # Frames 5-6 para izquierda (A) - con flip
-            "right": [5, 6]        # Frames 5-6 para derecha (D) - sin flip
-        }
 
-    def update_animation(self):
-        """Actualiza la animación basada en el tiempo"""
-        current_time = pygame.time.get_ticks()
-        if current_time - self.last_update > self.animation_speed * 1000:
-            self.frame_index += 1
-            self.last_update = current_time
-            
-            # Reiniciar el frame si llegamos al final
-            if self.frame_index >= len(self.animation_states[self.current_animation]):
-                self.frame_index = 0
-    
+        # Estados de animación por dirección (assets/animaciones/protagonista.json),
+        # compartidos por todos; cada personaje solo tiene su slot en el sistema,
+        # que avanza a todos juntos con animacion.SISTEMA.avanzar(dt)
+        self.definicion_animacion = animacion.SISTEMA.definicion("protagonista")
+        self.slot_animacion = animacion.SISTEMA.agregar(self.definicion_animacion)
+
     def set_animation(self, animation_name):
         """Cambia el estado de animación"""
         if animation_name != self.current_animation:
             self.current_animation = animation_name
-            self.frame_index = 0
+            animacion.SISTEMA.cambiar(self.slot_animacion, self.definicion_animacion.estados[animation_name])
     
+    def get_current_frame_index(self):
+        """Obtiene el índice del frame actual de la animación"""
+        return animacion.SISTEMA.frame(self.slot_animacion)
+
+    def liberar(self):
+        """Devuelve su slot al sistema de animación; llamarlo al sacar al personaje de la escena."""
+        if self.slot_animacion is not None:
+            animacion.SISTEMA.quitar(self.slot_animacion)
+            self.slot_animacion = None
+
     def get_current_frame(self):
         """Obtiene el frame actual de la animación"""
-        frame_list = self.animation_states[self.current_animation]
-        if frame_list:
-            return self.animaciones[frame_list[self.frame_index]]
-        return self.animaciones[0]  # Frame por defecto
+        return self.animaciones[self.get_current_frame_index()]
 
-    def movimiento (self, obstaculos=None):
-        teclas = pygame.key.get_pressed()
+    def movimiento (self, obstaculos=None, teclas=None):
+        # teclas: estado de teclas a usar (p. ej. entrada guionizada); por defecto el teclado
+        if teclas is None:
+            teclas = pygame.key.get_pressed()
         current_direction = "idle"
+        self.pos_previa = (self.rect.x, self.rect.y)
         
         # Guardar posición actual
         old_x = self.eje_x
@@ -93,21 +90,25 @@ class Protagonista (per.Personaje):
                     self.rect.y = self.eje_y
                     break
         
-        # Cambiar animación según la dirección
+        # Cambiar animación según la dirección (el avance de frames es por lotes)
         self.set_animation(current_direction)
-        
-        # Actualizar animación
-        self.update_animation()
 
-    def dibujar(self, interfaz, camara):
-        current_frame = self.get_current_frame()
-    
+    def posicion_pantalla(self, camara, alpha=1.0):
+        # Interpolar entre el paso anterior y el actual (alpha = fracción del paso)
+        x = self.pos_previa[0] + (self.rect.x - self.pos_previa[0]) * alpha
+        y = self.pos_previa[1] + (self.rect.y - self.pos_previa[1]) * alpha
+        return x - camara.x, y - camara.y
+
+    def zona_pantalla(self, camara, alpha=1.0):
+        """Zona de pantalla que ocupará el frame actual (sin dibujarlo)."""
+        return self.animaciones.zona(self.get_current_frame_index(), self.posicion_pantalla(camara, alpha))
+
+    def dibujar(self, interfaz, camara, alpha=1.0):
         # Aplicar flip horizontal para las animaciones de izquierda
-        if self.current_animation == "left":
-            imagen_flip = pygame.transform.flip(current_frame, True, self.flip_y)
-        else:
-            imagen_flip = pygame.transform.flip(current_frame, self.flip_x, self.flip_y)
-        
-        interfaz.blit(imagen_flip, (self.rect.x - camara.x, self.rect.y - camara.y))
+        flip_x = True if self.current_animation == "left" else self.flip_x
+
+        # Blit del frame ya volteado desde el atlas (devuelve la zona de pantalla tocada)
+        return self.animaciones.dibujar(interfaz, self.get_current_frame_index(),
+                                        self.posicion_pantalla(camara, alpha), flip_x, self.flip_y)
 
     
\ No newline at end of file
@@ -1,37 +1,62 @@
 import pygame
 import sys
 import jugador as per, npc 
-import dialogos
+import dialogos, dialogos_juego
+import fondo_chunks
+import atlas_sprites
+import animacion
+import temporizadores
+import cache_assets
+import carga_escalonada
+import niveles
+import interacciones as inter
+import bucle_juego
+import perfilador
+import entrada
+import presentacion
+import guardado
+import misiones_juego, tienda_juego
 import time
 
 pygame.init()
 values = (1200, 600)
 screen = pygame.display.set_mode(values)
 pygame.display.set_caption("El Lado Oscuro del Carrito")
-clock = pygame.time.Clock()
 
-aparicion_x, aparicion_y = 250, 350
+# Pack de assets ya escalados (python src/python/cache_assets.py); sin él se carga normal
+assets = cache_assets.CacheAssets()
+
+# --- MENÚ: es lo único que hace falta para el primer frame ---
+fondo_menu = assets.cargar("assets/imagen_fondo_principal.jpg", values, alpha=False)
+screen.blit(fondo_menu, (0, 0))
+pygame.display.update()
+
+# --- NIVEL (hitboxes, zonas, NPCs y fondo; ver niveles.py) ---
+nivel = niveles.cargar_nivel("assets/niveles/pueblo_del_roble.json")
+aparicion_x, aparicion_y = nivel.aparicion
 dinero = 1500
 
 # --- CARGAR ANIMACIONES ---
 def cargar_animaciones():
     animaciones = []
     for frame in range(7):
-        img = pygame.image.load(f"assets/{frame}-Photoroom.png").convert_alpha()
-        img = pygame.transform.scale(img, (110, 130))
-        animaciones.append(img)
-    return animaciones
+        animaciones.append(assets.cargar(f"assets/{frame}-Photoroom.png", (110, 130)))
+    # Un solo atlas (con los flips ya generados) compartido por todos los personajes
+    return atlas_sprites.AtlasSprites(animaciones)
 
-animaciones = cargar_animaciones()
-jugador = per.Protagonista(0, dinero, animaciones, aparicion_x, aparicion_y, 5)
+def cargar_fondo_nivel():
+    fondo = nivel.fondo
+    return fondo_chunks.FondoPorChunks(assets.cargar(fondo["ruta"], tuple(fondo["tam"])), fondo["tam_chunk"])
 
-# --- FONDOS ---
-fondo_menu = pygame.image.load("assets/imagen_fondo_principal.jpg")
-fondo_menu = pygame.transform.scale(fondo_menu, values)
+# El NPC del nivel que atiende la tienda
+datos_vendedor = next(n for n in nivel.npcs if n["nombre"] == "vendedor")
 
-fondo_nivel = pygame.image.load("assets/pueblo_del_roble.png")
-fondo_nivel = pygame.transform.scale(fondo_nivel, (1900, 1600))
-mapa_rect = fondo_nivel.get_rect()
+# --- CARGA DEL NIVEL EN SEGUNDO PLANO (mientras se ve el menú) ---
+carga = carga_escalonada.CargaEscalonada()
+carga.agregar("animaciones", cargar_animaciones)
+carga.agregar("fondo_nivel", cargar_fondo_nivel)
+carga.agregar("sprite_vendedor", lambda: assets.cargar(datos_vendedor["sprite"], tuple(datos_vendedor["tam"])))
+carga.iniciar()
 
 # --- ESTADOS DEL JUEGO ---
 MENU = "menu"
@@ -42,34 +67,109 @@ estado_actual = MENU
 fuente_dialogo = pygame.font.Font(None, 32)
 fuente_interaccion = pygame.font.Font(None, 40)
 
-# --- CREACIÓN DEL NPC ---
-dialogos_vendedor = [
-    "¡Hola, joven consumidor!",
-    "Parece que tienes dinero fresco...",
-    "Aquí todo está en oferta... aunque no por mucho tiempo.",
-    "Recuerda: ¡comprar es invertir en la felicidad del sistema!"
-]
-imagen_vendedor = pygame.image.load("assets/imagen_vendedor.png").convert_alpha()
-sprite_vendedor = pygame.transform.scale(imagen_vendedor, (100, 120))
-vendedor = npc.NPC(0, 9999, 600, 350, dialogos_vendedor, sprite_vendedor)
+# Jugador, vendedor y fondo del nivel se crean al salir del menú
+jugador = None
+vendedor = None
+fondo_nivel = None
+mapa_rect = None
+
+def preparar_nivel():
+    """Espera solo los assets que falten y crea los objetos del nivel."""
+    global jugador, vendedor, fondo_nivel, mapa_rect
+    if jugador is not None:
+        return
+    fondo_nivel = carga.obtener("fondo_nivel")
+    mapa_rect = fondo_nivel.get_rect()
+    jugador = per.Protagonista(0, dinero, carga.obtener("animaciones"), aparicion_x, aparicion_y, 5)
+    vendedor = npc.NPC(0, datos_vendedor["dinero"], *datos_vendedor["pos"],
+                       getattr(dialogos_juego, datos_vendedor["dialogos"]), carga.obtener("sprite_vendedor"))
+    vendedor.nombre = datos_vendedor["nombre"]
+    interacciones.registrar(vendedor, abrir_dialogo)
+    temporizadores.RUEDA.cada(30000, guardar_partida)
 
 # --- ESTADO DEL DIÁLOGO ---
 dialogo_activo = None
 dialogo_en_progreso = False
 
+def abrir_dialogo(personaje):
+    """Acción de interacción de los NPCs que hablan."""
+    global dialogo_activo, dialogo_en_progreso
+    if not dialogo_en_progreso:
+        dialogo_activo = dialogos.Dialogo(personaje.dialogos, fuente_dialogo, 100, 450, 1000, 120)
+        dialogo_en_progreso = True
+        misiones_juego.npc_hablado(motor_misiones, personaje.nombre, jugador)
+
+# --- INTERACCIONES (el NPC más cercano en alcance responde a la E) ---
+interacciones = inter.RegistroInteracciones(fuente_interaccion)
+
+# --- PERFILADOR (overlay con 9, traza de Chrome con F12) ---
+perf = perfilador.Perfilador()
+fuente_perfilador = pygame.font.Font(None, 24)
+
 # --- CÁMARA ---
 camara = pygame.Vector2(0, 0)
+camara_previa = pygame.Vector2(0, 0)  # cámara del paso anterior (para interpolar)
 
-# --- LOOP PRINCIPAL ---
-while True:
-    dt = clock.tick(60)
-    for event in pygame.event.get():
+
+# --- PRESENTACIÓN (solo se actualizan las zonas de pantalla que cambiaron) ---
+presentador = presentacion.Presentador(screen)
+
+
+# --- MISIONES Y TIENDA (los productos se registran para poder cargar el inventario) ---
+motor_misiones = misiones_juego.crear_motor()
+tienda = tienda_juego.crear_tienda()
+guardado.OBJETOS.registrar(*tienda_juego.productos(tienda))
+
+# --- PARTIDA GUARDADA (autoguardado cada 30 s, F5 guarda, F9 carga la última) ---
+autoguardado = guardado.AutoGuardado()
+
+def guardar_partida():
+    # En este hilo solo se copia el estado; serializar y escribir va en el del autoguardado
+    autoguardado.guardar(guardado.capturar(jugador, nivel.nombre, motor_misiones))
+
+def cargar_partida():
+    autoguardado.esperar()
+    try:
+        instantanea = guardado.cargar(autoguardado.ruta)
+    except (OSError, ValueError) as error:
+        print("No se pudo cargar la partida:", error)
+        return
+    if instantanea.escena != nivel.nombre:
+        print("La partida guardada es de otra escena:", instantanea.escena)
+        return
+    try:
+        guardado.aplicar(instantanea, jugador, motor_misiones)
+    except ValueError as error:
+        print("No se pudo cargar la partida:", error)
+
+
+# --- ENTRADA (teclado, o --grabar / --reproducir un log de entrada) ---
+fuente_entrada = entrada.crear_entrada(sys.argv)
+
+
+# --- LÓGICA (paso fijo de simulación) ---
+def actualizar(dt):
+    global estado_actual, dialogo_activo, dialogo_en_progreso
+
+    # Fin de una reproducción: se detiene el bucle
+    if fuente_entrada.terminado:
+        bucle.detener()
+        return
+
+    teclas, eventos = fuente_entrada.leer()
+    for event in eventos:
         if event.type == pygame.QUIT:
             sys.exit()
 
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_9:
+            perf.toggle_overlay()
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F12:
+            perf.exportar_chrome("traza_frames.json")
+
         # --- CAMBIO DE ESTADO ---
         if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
             if estado_actual == MENU:
+                preparar_nivel()
                 estado_actual = JUGANDO
         if event.type == pygame.K_ESCAPE:
                 if estado_actual == JUGANDO:
@@ -77,28 +177,29 @@ while True:
 
         # --- INTERACCIÓN CON NPC ---
         if estado_actual == JUGANDO and event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_e and jugador.rect.colliderect(vendedor.rect):
-                if not dialogo_en_progreso:
-                    dialogo_activo = dialogos.Dialogo(
-                        vendedor.dialogos, fuente_dialogo, 100, 450, 1000, 120
-                    )
-                    dialogo_en_progreso = True
+            if event.key == pygame.K_e:
+                interacciones.interactuar(jugador.rect)
+            elif event.key == pygame.K_F5:
+                guardar_partida()
+            elif event.key == pygame.K_F9:
+                cargar_partida()
 
             elif event.key == pygame.K_SPACE and dialogo_en_progreso and dialogo_activo:
                 dialogo_activo.siguiente_linea()
 
-    # --- DIBUJO Y LÓGICA ---
-    if estado_actual == MENU:
-        screen.blit(fondo_menu, (0, 0))
-
-    elif estado_actual == JUGANDO:
+    if estado_actual == JUGANDO:
         # --- Movimiento del jugador (usa su propio método) ---
-        jugador.movimiento()
+        with perf.tramo("movimiento"):
+            jugador.movimiento(teclas=teclas)
+        # Animaciones y temporizadores (diálogo, ...) avanzan con el paso fijo
+        animacion.SISTEMA.avanzar(dt)
+        temporizadores.RUEDA.avanzar(dt)
 
         # --- Limitar jugador al mapa ---
         jugador.rect.clamp_ip(mapa_rect)
 
         # --- Actualizar cámara ---
+        camara_previa.update(camara)
         camara.x = jugador.rect.centerx - values[0] // 2
         camara.y = jugador.rect.centery - values[1] // 2
 
@@ -106,25 +207,110 @@ while True:
         camara.x = max(0, min(camara.x, mapa_rect.width - values[0]))
         camara.y = max(0, min(camara.y, mapa_rect.height - values[1]))
 
-        # --- DIBUJAR ESCENA ---
-        screen.blit(fondo_nivel, (-camara.x, -camara.y))
-
-        # Dibujar NPC y jugador con coordenadas relativas a cámara
-        screen.blit(vendedor.sprite, (vendedor.rect.x - camara.x, vendedor.rect.y - camara.y))
-        jugador.dibujar(screen, camara)
-
-        # --- MOSTRAR "E" SOLO SI ESTÁ CERCA ---
-        if jugador.rect.colliderect(vendedor.rect.inflate(20, 20)):
-            texto_e = fuente_interaccion.render("E", True, (255, 255, 255))
-            e_x = vendedor.rect.centerx - texto_e.get_width() // 2 - camara.x
-            e_y = vendedor.rect.top - 35 - camara.y
-            screen.blit(texto_e, (e_x, e_y))
-
         # --- DIÁLOGO ---
         if dialogo_en_progreso and dialogo_activo:
-            dialogo_activo.actualizar(dt)
-            dialogo_activo.dibujar(screen)
             if not dialogo_activo.en_dialogo:
                 dialogo_en_progreso = False
 
-    pygame.display.update()
+
+# --- DIBUJO (alpha = fracción del siguiente paso, para interpolar) ---
+def dibujar(alpha):
+    # Pasar de un estado a otro o mostrar/ocultar el overlay redibuja todo
+    presentador.vigilar("estado", estado_actual)
+    presentador.vigilar("overlay", perf.overlay_visible)
+
+    # Primero se registra dónde queda cada cosa; después solo se repintan las
+    # zonas sucias (toda la pantalla si cambió la cámara, nada si no cambió nada)
+    if estado_actual == MENU:
+        # --- PROGRESO DE LA CARGA DEL NIVEL (se borra al terminar) ---
+        progreso = None if carga.terminada else carga.progreso()
+        barra = pygame.Rect(0, values[1] - 8, values[0], 8)
+        presentador.sprite("progreso", barra if progreso is not None else None, progreso)
+
+    elif estado_actual == JUGANDO:
+        vista = camara_previa.lerp(camara, alpha)
+        # Si la cámara se movió cambia toda la pantalla
+        presentador.vigilar("camara", (vista.x, vista.y))
+
+        # NPC y jugador con coordenadas relativas a cámara
+        zona_vendedor = vendedor.sprite.get_rect(topleft=(vendedor.rect.x - vista.x, vendedor.rect.y - vista.y))
+        presentador.sprite("vendedor", zona_vendedor)
+        zona_jugador = jugador.zona_pantalla(vista, alpha)
+        presentador.sprite("jugador", zona_jugador, (jugador.current_animation, jugador.get_current_frame_index()))
+
+        # "E" solo si está cerca
+        aviso = interacciones.aviso(jugador.rect, vista)
+        presentador.sprite("aviso", aviso[1] if aviso else None)
+
+        hay_dialogo = dialogo_en_progreso and dialogo_activo
+        if hay_dialogo:
+            presentador.sprite("dialogo", dialogo_activo.rect,
+                               (dialogo_activo.indice_texto, dialogo_activo.visibles))
+        else:
+            presentador.sprite("dialogo", None)
+
+    # El overlay cambia con cada medición nueva (perf.total)
+    zona_overlay = perf.zona_overlay(fuente_perfilador)
+    presentador.sprite("overlay", zona_overlay, perf.total)
+
+    zonas = presentador.zonas()
+    if estado_actual == MENU:
+        # El menú es estático: solo se restaura debajo de lo que cambió
+        for zona in zonas:
+            screen.blit(fondo_menu, zona, zona)
+        if progreso is not None and any(zona.colliderect(barra) for zona in zonas):
+            pygame.draw.rect(screen, (40, 40, 40), barra)
+            barra.width = int(values[0] * progreso)
+            pygame.draw.rect(screen, (255, 255, 255), barra)
+
+    elif estado_actual == JUGANDO:
+        # --- DIBUJAR ESCENA (solo el fondo de las zonas sucias) ---
+        with perf.tramo("fondo"):
+            for zona in zonas:
+                fondo_nivel.dibujar(screen, vista, zona)
+
+        # Lo que toca una zona se vuelve a dibujar recortado a ella
+        with perf.tramo("personajes"):
+            for zona in zonas:
+                screen.set_clip(zona)
+                if zona.colliderect(zona_vendedor):
+                    screen.blit(vendedor.sprite, zona_vendedor)
+                if zona.colliderect(zona_jugador):
+                    jugador.dibujar(screen, vista, alpha)
+                if aviso and zona.colliderect(aviso[1]):
+                    screen.blit(*aviso)
+
+        # --- DIÁLOGO ---
+        if hay_dialogo:
+            with perf.tramo("dialogo"):
+                for zona in zonas:
+                    if zona.colliderect(dialogo_activo.rect):
+                        screen.set_clip(zona)
+                        dialogo_activo.dibujar(screen)
+
+    if zona_overlay:
+        for zona in zonas:
+            if zona.colliderect(zona_overlay):
+                screen.set_clip(zona)
+                perf.dibujar_overlay(screen)
+    screen.set_clip(None)
+
+    with perf.tramo("display_update"):
+        presentador.presentar()
+
+
+# --- LOOP PRINCIPAL ---
+# --velocidad X reproduce/simula X veces más rápido que el tiempo real
+velocidad = float(sys.argv[sys.argv.index("--velocidad") + 1]) if "--velocidad" in sys.argv else 1.0
+bucle = bucle_juego.BucleJuego(actualizar, dibujar, escala_tiempo=velocidad)
+try:
+    if "--headless" in sys.argv:
+        # Solo simulación, sin dibujar, tan rápido como permita la CPU (--headless [pasos])
+        i = sys.argv.index("--headless")
+        bucle.ejecutar_headless(int(sys.argv[i + 1]) if len(sys.argv) > i + 1 and sys.argv[i + 1].isdigit() else None)
+    else:
+        bucle.ejecutar()
+finally:
+    # Se cierre la ventana, termine la reproducción o se cumplan los pasos de
+    # --headless, el último autoguardado se termina de escribir antes de salir
+    autoguardado.esperar()
@@ -0,0 +1,28 @@
+from compilados_py.Release import personaje as per
+
+# Misiones del juego. El id de cada misión es el orden en que se agrega y
+# las partidas guardadas dependen de él: las nuevas van siempre al final.
+
+
+def crear_motor():
+    motor = per.MotorMisiones()
+    motor.agregar(per.Mision("Habla con el vendedor del pueblo", "Primer contacto", 50,
+                             per.TipoEvento.NPC_HABLADO, "vendedor"))
+    motor.agregar(per.Mision("Escucha tres veces las ofertas del vendedor", "Cliente fiel", 100,
+                             per.TipoEvento.NPC_HABLADO, "vendedor", 3))
+    return motor
+
+
+def npc_hablado(motor, nombre, jugador):
+    """Evento de hablar con un NPC; las recompensas van al dinero del jugador."""
+    return motor.emitir(per.TipoEvento.NPC_HABLADO, nombre, 1, jugador)
+
+
+def compra_rechazada(motor, jugador):
+    """Evento de una compra que no se pudo pagar o no entraba en el inventario."""
+    return motor.emitir(per.TipoEvento.COMPRA_RECHAZADA, "", 1, jugador)
+
+
+def dinero_gastado(motor, cantidad, jugador):
+    """Evento con lo que se cobró en una compra."""
+    return motor.emitir(per.TipoEvento.DINERO_GASTADO, "", cantidad, jugador)
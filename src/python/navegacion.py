@@ -0,0 +1,366 @@
+import heapq
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+# Vecinos de una celda: (dx, dy). Las diagonales solo se usan si las dos
+# celdas ortogonales que cruzan están libres (no se cortan esquinas).
+_VECINOS = ((0, -1), (0, 1), (-1, 0), (1, 0), (-1, -1), (1, -1), (-1, 1), (1, 1))
+_QUIETO = len(_VECINOS)
+
+# Dirección normalizada (x, y) para cada código de _VECINOS (+ quieto)
+_DIRECCIONES = [(dx / math.hypot(dx, dy), dy / math.hypot(dx, dy)) for dx, dy in _VECINOS] + [(0.0, 0.0)]
+
+_LEJOS = np.iinfo(np.int32).max
+
+
+class RejillaNavegacion:
+    """
+    Rejilla de celdas transitables del mapa, hecha a partir de las hitboxes.
+    margen agranda cada hitbox (px) para que una entidad cuyo centro está
+    en una celda libre no meta su rect en un edificio.
+    """
+
+    def __init__(self, ancho, alto, tam_celda=32, margen=0):
+        self.tam_celda = tam_celda
+        self.margen = margen
+        self.columnas = -(-ancho // tam_celda)
+        self.filas = -(-alto // tam_celda)
+        self.bloqueadas = np.zeros((self.filas, self.columnas), dtype=bool)
+
+    @classmethod
+    def desde_colisiones(cls, sistema_col, ancho, alto, tam_celda=32, margen=0):
+        rejilla = cls(ancho, alto, tam_celda, margen)
+        rejilla.reconstruir(sistema_col.hitboxes)
+        return rejilla
+
+    def rango_celdas(self, rect):
+        """Slices (filas, columnas) de las celdas que toca rect agrandado por el margen."""
+        t, m = self.tam_celda, self.margen
+        return (slice(max(0, (rect.top - m) // t), max(0, (rect.bottom + m - 1) // t + 1)),
+                slice(max(0, (rect.left - m) // t), max(0, (rect.right + m - 1) // t + 1)))
+
+    def marcar(self, rect, bloqueada=True):
+        if rect.width > 0 and rect.height > 0:
+            self.bloqueadas[self.rango_celdas(rect)] = bloqueada
+
+    def reconstruir(self, hitboxes):
+        self.bloqueadas[:] = False
+        for rect in hitboxes:
+            self.marcar(rect)
+
+    def celda(self, x, y):
+        """(columna, fila) de un punto del mundo, limitada a la rejilla."""
+        t = self.tam_celda
+        return (min(max(int(x) // t, 0), self.columnas - 1),
+                min(max(int(y) // t, 0), self.filas - 1))
+
+
+class CampoFlujo:
+    """
+    Campo de flujo hacia un objetivo (el jugador), compartido por todos los
+    seguidores. Se recalcula con NumPy solo cuando el objetivo cambia de
+    celda; después cada seguidor avanza con una consulta O(1).
+    """
+
+    def __init__(self, rejilla):
+        self.rejilla = rejilla
+        self.objetivo = None
+        self.recalculos = 0
+        self.distancias = np.full(rejilla.bloqueadas.shape, -1, dtype=np.int32)
+        # Listas planas (fila * columnas + columna) para consultas sin NumPy
+        self._distancias = []
+        self._codigos = []
+
+    def actualizar(self, x, y):
+        """Apunta el campo al punto (x, y); devuelve True si hubo que recalcular."""
+        celda = self.rejilla.celda(x, y)
+        if celda == self.objetivo:
+            return False
+        self.objetivo = celda
+        self._calcular(celda)
+        return True
+
+    def invalidar(self):
+        """Fuerza el recálculo en el próximo actualizar() (p. ej. si cambió la rejilla)."""
+        self.objetivo = None
+
+    def _calcular(self, objetivo):
+        libres = ~self.rejilla.bloqueadas
+        col, fila = objetivo
+
+        # BFS por frentes: cada iteración expande todo el frente a la vez
+        distancias = np.full(libres.shape, -1, dtype=np.int32)
+        distancias[fila, col] = 0
+        frente = np.zeros(libres.shape, dtype=bool)
+        frente[fila, col] = True
+        visitadas = frente.copy()
+        paso = 0
+        while frente.any():
+            paso += 1
+            nuevo = np.zeros_like(frente)
+            nuevo[1:, :] |= frente[:-1, :]
+            nuevo[:-1, :] |= frente[1:, :]
+            nuevo[:, 1:] |= frente[:, :-1]
+            nuevo[:, :-1] |= frente[:, 1:]
+            nuevo &= libres & ~visitadas
+            visitadas |= nuevo
+            distancias[nuevo] = paso
+            frente = nuevo
+        self.distancias = distancias
+
+        # Dirección de cada celda: el vecino alcanzable más cercano al objetivo
+        d = np.where(distancias >= 0, distancias, _LEJOS)
+        pd = np.pad(d, 1, constant_values=_LEJOS)
+        pl = np.pad(libres, 1, constant_values=False)
+        filas, columnas = d.shape
+        candidatos = np.empty((len(_VECINOS), filas, columnas), dtype=np.int32)
+        for k, (dx, dy) in enumerate(_VECINOS):
+            vecino = pd[1 + dy:1 + dy + filas, 1 + dx:1 + dx + columnas]
+            if dx and dy:
+                esquinas = (pl[1:1 + filas, 1 + dx:1 + dx + columnas]
+                            & pl[1 + dy:1 + dy + filas, 1:1 + columnas])
+                vecino = np.where(esquinas, vecino, _LEJOS)
+            candidatos[k] = vecino
+        mejor = candidatos.argmin(axis=0)
+        mejora = candidatos.min(axis=0) < d
+        codigos = np.where(mejora, mejor, _QUIETO)
+
+        self._distancias = distancias.ravel().tolist()
+        self._codigos = codigos.ravel().tolist()
+        self.recalculos += 1
+
+    def _indice(self, x, y):
+        col, fila = self.rejilla.celda(x, y)
+        return fila * self.rejilla.columnas + col
+
+    def direccion(self, x, y):
+        """Dirección normalizada (dx, dy) a seguir desde el punto (x, y)."""
+        if not self._codigos:
+            return 0.0, 0.0
+        return _DIRECCIONES[self._codigos[self._indice(x, y)]]
+
+    def distancia(self, x, y):
+        """Celdas hasta el objetivo desde (x, y); -1 si no se puede llegar."""
+        if not self._distancias:
+            return -1
+        return self._distancias[self._indice(x, y)]
+
+
+def seguir(npc, campo, velocidad, parada=1):
+    """
+    Avanza npc (con eje_x, eje_y y rect) hacia el objetivo del campo;
+    se detiene a parada celdas o menos del objetivo.
+    """
+    x, y = npc.rect.center
+    if 0 <= campo.distancia(x, y) <= parada:
+        return
+    dx, dy = campo.direccion(x, y)
+    npc.eje_x += dx * velocidad
+    npc.eje_y += dy * velocidad
+    npc.rect.topleft = (round(npc.eje_x), round(npc.eje_y))
+
+
+# Costos enteros de A*: paso recto y diagonal (aprox. 10 y 10·√2)
+_COSTO_RECTO, _COSTO_DIAGONAL = 10, 14
+
+
+def _octil(col, fila, col_meta, fila_meta):
+    dx, dy = abs(col - col_meta), abs(fila - fila_meta)
+    return _COSTO_RECTO * max(dx, dy) + (_COSTO_DIAGONAL - _COSTO_RECTO) * min(dx, dy)
+
+
+class GrafoNavegacion:
+    """
+    Grafo de navegación para NPCs con destino propio.
+    Cada escena aporta su RejillaNavegacion (nodos = celdas libres) y las
+    ZonaTeleport conectan una escena con otra. Las rutas se buscan con A*
+    y se guardan en una cache LRU por (celda de inicio, meta). Al agregar
+    una hitbox solo se descartan las rutas que pasan por la región tocada.
+    """
+
+    def __init__(self, max_rutas=1024):
+        self.escenas = {}           # nombre -> RejillaNavegacion
+        self.enlaces = {}           # (escena, col, fila) -> [nodos de llegada en otras escenas]
+        self.max_rutas = max_rutas
+        self.rutas = OrderedDict()  # (inicio, meta) -> (puntos, nodos); puntos es None si no hay ruta
+        self._rutas_por_nodo = {}   # nodo -> claves de rutas que pasan por él
+        self.busquedas = 0          # A* ejecutados (los aciertos de cache no cuentan)
+
+    def agregar_escena(self, nombre, rejilla, sistema_col=None):
+        """Registra una escena; con sistema_col, sus cambios de hitboxes actualizan el grafo."""
+        self.escenas[nombre] = rejilla
+        if sistema_col is not None:
+            sistema_col.oyentes.append(
+                lambda rect, agregada: self.hitbox_cambiada(nombre, sistema_col, rect, agregada))
+
+    def conectar(self, escena, zona, escena_destino, llegada):
+        """Pisar zona (ZonaTeleport) en escena lleva al punto llegada de escena_destino."""
+        rejilla = self.escenas[escena]
+        destino = self.nodo(escena_destino, *llegada)
+        filas, columnas = rejilla.rango_celdas(zona.rect)
+        for fila in range(filas.start, min(filas.stop, rejilla.filas)):
+            for col in range(columnas.start, min(columnas.stop, rejilla.columnas)):
+                self.enlaces.setdefault((escena, col, fila), []).append(destino)
+        self.invalidar_escena(escena)
+
+    def nodo(self, escena, x, y):
+        return (escena, *self.escenas[escena].celda(x, y))
+
+    def centro(self, nodo):
+        escena, col, fila = nodo
+        t = self.escenas[escena].tam_celda
+        return escena, col * t + t // 2, fila * t + t // 2
+
+    # --- Búsqueda ---
+
+    def buscar(self, escena, x, y, escena_meta, x_meta, y_meta):
+        """
+        Ruta de (x, y) en escena a (x_meta, y_meta) en escena_meta como lista
+        de puntos (escena, x, y), o None si no se puede llegar.
+        """
+        inicio = self.nodo(escena, x, y)
+        meta = self.nodo(escena_meta, x_meta, y_meta)
+        clave = (inicio, meta)
+        guardada = self.rutas.get(clave)
+        if guardada is not None:
+            self.rutas.move_to_end(clave)
+            return guardada[0]
+
+        nodos = self._a_estrella(inicio, meta)
+        puntos = [self.centro(n) for n in nodos] if nodos is not None else None
+        self._guardar(clave, puntos, nodos or (inicio, meta))
+        return puntos
+
+    def _vecinos(self, nodo):
+        escena, col, fila = nodo
+        rejilla = self.escenas[escena]
+        bloqueadas = rejilla.bloqueadas
+        for dx, dy in _VECINOS:
+            c, f = col + dx, fila + dy
+            if not (0 <= c < rejilla.columnas and 0 <= f < rejilla.filas):
+                continue
+            if dx and dy:
+                if bloqueadas[fila, c] or bloqueadas[f, col]:
+                    continue
+                yield (escena, c, f), bloqueadas[f, c], _COSTO_DIAGONAL
+            else:
+                yield (escena, c, f), bloqueadas[f, c], _COSTO_RECTO
+        for destino in self.enlaces.get(nodo, ()):
+            yield destino, False, _COSTO_RECTO
+
+    def _a_estrella(self, inicio, meta):
+        """
+        A* sobre las celdas. La meta se acepta aunque su celda esté bloqueada,
+        y desde una celda bloqueada (un NPC que aparece pegado a un edificio)
+        se puede pasar a cualquier vecina para salir de ahí.
+        """
+        self.busquedas += 1
+        escena_meta, col_meta, fila_meta = meta
+
+        def h(nodo):
+            # Fuera de la escena de la meta no hay una estimación admisible simple
+            return _octil(nodo[1], nodo[2], col_meta, fila_meta) if nodo[0] == escena_meta else 0
+
+        costos = {inicio: 0}
+        previos = {inicio: None}
+        abiertos = [(h(inicio), 0, inicio)]
+        while abiertos:
+            _, costo, nodo = heapq.heappop(abiertos)
+            if nodo == meta:
+                camino = []
+                while nodo is not None:
+                    camino.append(nodo)
+                    nodo = previos[nodo]
+                camino.reverse()
+                return camino
+            if costo > costos[nodo]:
+                continue
+            escena, col, fila = nodo
+            atrapado = self.escenas[escena].bloqueadas[fila, col]
+            for vecino, bloqueado, paso in self._vecinos(nodo):
+                if bloqueado and not atrapado and vecino != meta:
+                    continue
+                nuevo = costo + paso
+                if nuevo < costos.get(vecino, nuevo + 1):
+                    costos[vecino] = nuevo
+                    previos[vecino] = nodo
+                    heapq.heappush(abiertos, (nuevo + h(vecino), nuevo, vecino))
+        return None
+
+    # --- Cache de rutas ---
+
+    def _guardar(self, clave, puntos, nodos):
+        self.rutas[clave] = (puntos, nodos)
+        for nodo in nodos:
+            self._rutas_por_nodo.setdefault(nodo, set()).add(clave)
+        while len(self.rutas) > self.max_rutas:
+            vieja, _ = next(iter(self.rutas.items()))
+            self._descartar(vieja)
+
+    def _descartar(self, clave):
+        _, nodos = self.rutas.pop(clave)
+        for nodo in nodos:
+            claves = self._rutas_por_nodo.get(nodo)
+            if claves is not None:
+                claves.discard(clave)
+                if not claves:
+                    del self._rutas_por_nodo[nodo]
+
+    def invalidar_region(self, escena, rect):
+        """
+        Descarta las rutas que pasan por las celdas que toca rect (con el
+        margen) o por su anillo de celdas vecinas: un paso diagonal entre dos
+        celdas del anillo cruza la esquina de una celda tocada, y ese paso
+        queda prohibido aunque la ruta no pase por la región.
+        """
+        rejilla = self.escenas[escena]
+        filas, columnas = rejilla.rango_celdas(rect)
+        for fila in range(max(0, filas.start - 1), min(filas.stop + 1, rejilla.filas)):
+            for col in range(max(0, columnas.start - 1), min(columnas.stop + 1, rejilla.columnas)):
+                for clave in list(self._rutas_por_nodo.get((escena, col, fila), ())):
+                    self._descartar(clave)
+
+    def invalidar_escena(self, escena):
+        """Descarta todas las rutas que tocan la escena (también las que no llegaban)."""
+        for clave, (_, nodos) in list(self.rutas.items()):
+            if any(nodo[0] == escena for nodo in nodos):
+                self._descartar(clave)
+
+    def hitbox_cambiada(self, escena, sistema_col, rect, agregada):
+        rejilla = self.escenas[escena]
+        if rect is not None and agregada:
+            # Agregar una hitbox solo puede cortar rutas que pasan por ella
+            rejilla.marcar(rect)
+            self.invalidar_region(escena, rect)
+        else:
+            # Quitar hitboxes puede acortar cualquier ruta de la escena
+            rejilla.reconstruir(sistema_col.hitboxes)
+            self.invalidar_escena(escena)
+
+
+class Recorrido:
+    """Avance de un NPC por los puntos de una ruta de GrafoNavegacion."""
+
+    def __init__(self, puntos, escena=None):
+        self.puntos = puntos or []
+        self.indice = 0
+        self.escena = escena if escena is not None else (self.puntos[0][0] if self.puntos else None)
+
+    @property
+    def terminado(self):
+        return self.indice >= len(self.puntos)
+
+    def avanzar(self, npc, velocidad):
+        if self.terminado:
+            return
+        escena, x, y = self.puntos[self.indice]
+        if escena != self.escena:
+            # Cruzó una ZonaTeleport: aparece directamente en la otra escena
+            self.escena = escena
+            npc.eje_x, npc.eje_y = x - npc.rect.width / 2, y - npc.rect.height / 2
+            npc.rect.center = (x, y)
+            self.indice += 1
+        elif npc.caminar_hacia(x, y, velocidad):
+            self.indice += 1
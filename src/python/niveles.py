@@ -0,0 +1,158 @@
+import hashlib
+import json
+import os
+import struct
+import sys
+from array import array
+
+import pygame
+
+import cambio_escenarios as tel
+import colisiones
+
+# Niveles definidos como datos.
+# La fuente es un JSON (assets/niveles/*.json) con hitboxes, zonas de
+# teletransporte con su destino, NPCs y la referencia al fondo por chunks.
+# El compilador escribe al lado un .nivel binario que además trae la
+# RejillaEspacial ya calculada: cargarlo es una sola lectura del archivo,
+# sin reconstruir el índice. Si el .nivel falta o no corresponde a su JSON
+# (hash distinto) se carga el JSON y el índice se construye en el momento.
+#
+# Compilar (desde la raíz del repositorio):
+#   python src/python/niveles.py assets/niveles/pueblo_del_roble.json
+
+MAGIA = b"NIVL"
+VERSION = 1
+# magia, versión, tam_celda, cantidad de rects, de celdas, de referencias, largo del JSON
+_CABECERA = struct.Struct("<4sHHIIII")
+
+
+class Nivel:
+    """Datos de un nivel ya listos para usar (rects, índice, zonas y NPCs)."""
+
+    def __init__(self, nombre, hitboxes, indice, teleports, npcs, fondo, aparicion, hash_fuente=None):
+        self.nombre = nombre
+        self.hitboxes = hitboxes      # lista de pygame.Rect
+        self.indice = indice          # colisiones.RejillaEspacial de hitboxes
+        self.teleports = teleports    # lista de ZonaTeleport
+        self.npcs = npcs              # dicts: nombre, pos, dinero, sprite, tam, dialogos (o sigue_al_jugador)
+        self.fondo = fondo            # ruta, tam y tam_chunk del fondo
+        self.aparicion = aparicion
+        self.hash_fuente = hash_fuente
+
+    def sistema_colisiones(self):
+        return colisiones.SistemaColisiones(self.hitboxes, self.indice.tam_celda, indice=self.indice)
+
+
+def ruta_compilada(ruta):
+    return os.path.splitext(ruta)[0] + ".nivel"
+
+
+def _metadatos(datos):
+    """Lo que no es geometría de colisión, tal como viene del JSON."""
+    return {clave: datos.get(clave) for clave in ("nombre", "fondo", "aparicion", "teleports", "npcs")}
+
+
+def _crear_nivel(meta, hitboxes, indice, hash_fuente):
+    teleports = [tel.ZonaTeleport(*zona["rect"], zona.get("destino")) for zona in meta["teleports"] or []]
+    return Nivel(meta["nombre"], hitboxes, indice, teleports, meta["npcs"] or [],
+                 meta["fondo"], tuple(meta["aparicion"] or (0, 0)), hash_fuente)
+
+
+def nivel_desde_json(datos, hash_fuente=None):
+    """Nivel desde la fuente JSON ya parseada (el índice se construye aquí)."""
+    hitboxes = [pygame.Rect(r) for r in datos.get("hitboxes", [])]
+    indice = colisiones.RejillaEspacial(datos.get("tam_celda", 128))
+    indice.reconstruir(hitboxes)
+    return _crear_nivel(_metadatos(datos), hitboxes, indice, hash_fuente)
+
+
+def _arreglo(tipo, datos, inicio, cantidad):
+    arreglo = array(tipo)
+    arreglo.frombytes(datos[inicio:inicio + cantidad * arreglo.itemsize])
+    if sys.byteorder == "big":
+        arreglo.byteswap()   # el archivo es little endian
+    return arreglo, inicio + cantidad * arreglo.itemsize
+
+
+def leer_compilado(datos):
+    """Nivel desde el contenido de un .nivel; ValueError si no es válido."""
+    if len(datos) < _CABECERA.size:
+        raise ValueError("archivo de nivel truncado")
+    magia, version, tam_celda, n_rects, n_celdas, n_refs, largo_meta = _CABECERA.unpack_from(datos, 0)
+    if magia != MAGIA or version != VERSION:
+        raise ValueError(f"no es un nivel compilado válido (versión {VERSION})")
+
+    pos = _CABECERA.size
+    rects, pos = _arreglo("i", datos, pos, n_rects * 4)      # x, y, ancho, alto
+    celdas, pos = _arreglo("i", datos, pos, n_celdas * 4)    # cx, cy, primera referencia, cantidad
+    refs, pos = _arreglo("I", datos, pos, n_refs)            # índice del rect en cada celda
+    meta = json.loads(datos[pos:pos + largo_meta])
+
+    hitboxes = [pygame.Rect(rects[i], rects[i + 1], rects[i + 2], rects[i + 3]) for i in range(0, len(rects), 4)]
+    tabla = {}
+    for i in range(0, len(celdas), 4):
+        inicio, cantidad = celdas[i + 2], celdas[i + 3]
+        tabla[(celdas[i], celdas[i + 1])] = [hitboxes[r] for r in refs[inicio:inicio + cantidad]]
+    indice = colisiones.RejillaEspacial.desde_celdas(tam_celda, tabla)
+    return _crear_nivel(meta, hitboxes, indice, meta.get("hash_fuente"))
+
+
+def cargar_nivel(ruta):
+    """Carga un nivel: el .nivel compilado si está al día, si no el JSON."""
+    with open(ruta, "rb") as archivo:
+        fuente = archivo.read()
+    hash_fuente = hashlib.sha1(fuente).hexdigest()
+    try:
+        with open(ruta_compilada(ruta), "rb") as archivo:
+            nivel = leer_compilado(archivo.read())
+        if nivel.hash_fuente == hash_fuente:
+            return nivel
+    except (OSError, ValueError):
+        pass
+    return nivel_desde_json(json.loads(fuente), hash_fuente)
+
+
+def compilar(ruta, ruta_salida=None):
+    """Escribe el .nivel de ruta (JSON) con el índice espacial ya calculado."""
+    with open(ruta, "rb") as archivo:
+        fuente = archivo.read()
+    datos = json.loads(fuente)
+    nivel = nivel_desde_json(datos)
+
+    rects = array("i")
+    posicion = {}
+    for i, r in enumerate(nivel.hitboxes):
+        rects.extend((r.x, r.y, r.width, r.height))
+        posicion[id(r)] = i
+
+    celdas = array("i")
+    refs = array("I")
+    for (cx, cy), lista in sorted(nivel.indice.celdas.items()):
+        celdas.extend((cx, cy, len(refs), len(lista)))
+        refs.extend(posicion[id(r)] for r in lista)
+
+    meta = _metadatos(datos)
+    meta["hash_fuente"] = hashlib.sha1(fuente).hexdigest()
+    texto = json.dumps(meta).encode("utf-8")
+
+    if sys.byteorder == "big":
+        for arreglo in (rects, celdas, refs):
+            arreglo.byteswap()
+    ruta_salida = ruta_salida or ruta_compilada(ruta)
+    temporal = ruta_salida + ".tmp"
+    with open(temporal, "wb") as archivo:
+        archivo.write(_CABECERA.pack(MAGIA, VERSION, nivel.indice.tam_celda,
+                                     len(nivel.hitboxes), len(celdas) // 4, len(refs), len(texto)))
+        archivo.write(rects.tobytes())
+        archivo.write(celdas.tobytes())
+        archivo.write(refs.tobytes())
+        archivo.write(texto)
+    os.replace(temporal, ruta_salida)
+    return ruta_salida
+
+
+if __name__ == "__main__":
+    for ruta in sys.argv[1:]:
+        print(f"{ruta} -> {compilar(ruta)}")
+    sys.exit(0)
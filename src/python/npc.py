@@ -15,5 +15,20 @@ class NPC (per.Personaje):
         if (entrada[pygame.K_e]) and (self.rect.colliderect(personaje.rect)):
             pass
 
+    def caminar_hacia (self, x, y, velocidad):
+        #Mueve el centro del NPC hacia (x, y); devuelve True al llegar
+        dx = x - self.rect.centerx
+        dy = y - self.rect.centery
+        distancia = (dx * dx + dy * dy) ** 0.5
+        if distancia <= velocidad:
+            self.eje_x += dx
+            self.eje_y += dy
+            self.rect.topleft = (round(self.eje_x), round(self.eje_y))
+            return True
+        self.eje_x += dx / distancia * velocidad
+        self.eje_y += dy / distancia * velocidad
+        self.rect.topleft = (round(self.eje_x), round(self.eje_y))
+        return False
+
     def dibujar (self, surface):
         surface.blit(self.sprite, self.rect)
@@ -0,0 +1,127 @@
+import json
+import time
+from array import array
+
+import pygame
+
+# Tramos del bucle principal que se instrumentan en main.py / pruebas_main.py
+TRAMOS_BUCLE = ("movimiento", "colisiones", "teletransporte", "fondo", "personajes", "dialogo", "display_update")
+
+
+class Tramo:
+    """Context manager preasignado de un tramo: `with perfilador.tramo("fondo"):`."""
+
+    __slots__ = ("perfilador", "id")
+
+    def __init__(self, perfilador, id_tramo):
+        self.perfilador = perfilador
+        self.id = id_tramo
+
+    def __enter__(self):
+        self.perfilador.iniciar(self.id)
+
+    def __exit__(self, *excepcion):
+        self.perfilador.terminar(self.id)
+
+
+class Perfilador:
+    """
+    Instrumentación ligera por tramos con nombre.
+    Cada medición (tramo, inicio, duración) se guarda en un ring buffer de
+    tamaño fijo hecho con arrays preasignados, así medir no crea objetos
+    por frame. Las mediciones se pueden ver en un overlay o exportar como
+    JSON de trace events de Chrome (chrome://tracing, Perfetto).
+    """
+
+    def __init__(self, nombres=TRAMOS_BUCLE, capacidad=8192):
+        self.nombres = list(nombres)
+        self.capacidad = capacidad
+        self.activo = True
+        self.overlay_visible = False
+
+        # Ring buffer: una entrada por medición
+        self.ids = array("i", [0]) * capacidad
+        self.inicios = array("d", [0.0]) * capacidad
+        self.duraciones = array("d", [0.0]) * capacidad
+        self.posicion = 0   # siguiente entrada a escribir
+        self.total = 0      # mediciones registradas desde el inicio
+
+        self._abiertos = array("d", [0.0]) * len(self.nombres)
+        self._t0 = time.perf_counter()
+        self.tramos = {nombre: Tramo(self, i) for i, nombre in enumerate(self.nombres)}
+
+        # Overlay: superficies de texto que se refrescan pocas veces por segundo
+        self._lineas_overlay = []
+        self._ultimo_refresco = 0
+
+    def tramo(self, nombre):
+        return self.tramos[nombre]
+
+    def iniciar(self, id_tramo):
+        if self.activo:
+            self._abiertos[id_tramo] = time.perf_counter()
+
+    def terminar(self, id_tramo):
+        if not self.activo:
+            return
+        fin = time.perf_counter()
+        i = self.posicion
+        self.ids[i] = id_tramo
+        self.inicios[i] = self._abiertos[id_tramo] - self._t0
+        self.duraciones[i] = fin - self._abiertos[id_tramo]
+        self.posicion = (i + 1) % self.capacidad
+        self.total += 1
+
+    def mediciones(self):
+        """Mediciones guardadas, de la más antigua a la más nueva: (nombre, inicio_s, duracion_s)."""
+        cantidad = min(self.total, self.capacidad)
+        primera = (self.posicion - cantidad) % self.capacidad
+        for k in range(cantidad):
+            i = (primera + k) % self.capacidad
+            yield self.nombres[self.ids[i]], self.inicios[i], self.duraciones[i]
+
+    def estadisticas(self):
+        """{nombre: (media_ms, max_ms)} sobre las mediciones del buffer."""
+        sumas, maximos, cuentas = {}, {}, {}
+        for nombre, _, duracion in self.mediciones():
+            sumas[nombre] = sumas.get(nombre, 0) + duracion
+            maximos[nombre] = max(maximos.get(nombre, 0), duracion)
+            cuentas[nombre] = cuentas.get(nombre, 0) + 1
+        return {n: (sumas[n] / cuentas[n] * 1000, maximos[n] * 1000) for n in sumas}
+
+    def exportar_chrome(self, ruta):
+        """Escribe las mediciones como trace events de Chrome (microsegundos)."""
+        eventos = [
+            {"name": nombre, "ph": "X", "ts": inicio * 1e6, "dur": duracion * 1e6, "pid": 1, "tid": 1}
+            for nombre, inicio, duracion in self.mediciones()
+        ]
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump({"traceEvents": eventos, "displayTimeUnit": "ms"}, archivo)
+
+    def toggle_overlay(self):
+        self.overlay_visible = not self.overlay_visible
+
+    def zona_overlay(self, fuente, x=10, y=10, refresco_ms=250):
+        """Prepara las líneas del overlay; devuelve la zona de pantalla que ocupa (None si está oculto)."""
+        if not self.overlay_visible:
+            return None
+        ahora = pygame.time.get_ticks()
+        if ahora - self._ultimo_refresco >= refresco_ms:
+            self._ultimo_refresco = ahora
+            self._lineas_overlay = [
+                fuente.render(f"{nombre:<15} {media:6.2f} ms  max {maximo:6.2f}", True, (255, 255, 0), (0, 0, 0))
+                for nombre, (media, maximo) in self.estadisticas().items()
+            ]
+        zona = pygame.Rect(x, y, 0, 0)
+        for linea in self._lineas_overlay:
+            zona.union_ip(linea.get_rect(topleft=(x, y)))
+            y += linea.get_height()
+        return zona
+
+    def dibujar_overlay(self, pantalla, x=10, y=10):
+        """Dibuja las líneas preparadas por zona_overlay()."""
+        if not self.overlay_visible:
+            return
+        for linea in self._lineas_overlay:
+            pantalla.blit(linea, (x, y))
+            y += linea.get_height()
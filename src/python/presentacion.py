@@ -0,0 +1,92 @@
+import pygame
+
+
+class Presentador:
+    """
+    Presentación por rectángulos sucios.
+    Durante el dibujo se registra qué cambió (sprites que se movieron o
+    cambiaron de frame, la caja de diálogo, el HUD) y presentar() solo
+    pasa esas regiones a pygame.display.update(rects). Si nada cambió no
+    se presenta el frame. Los sprites se registran antes de dibujar, así
+    zonas() dice qué repintar y el resto de la pantalla no se toca. Un cambio que afecta a toda la pantalla (cámara,
+    estado del juego, fondo) marca la pantalla entera.
+    """
+
+    def __init__(self, pantalla):
+        self.area = pantalla.get_rect()
+        self.sucias = []
+        self.todo = True          # el primer frame se presenta entero
+        self._sprites = {}        # clave -> (rect, estado) del frame anterior
+        self._vigilados = {}      # clave -> último valor visto
+        self.presentados = 0
+        self.omitidos = 0
+
+    def marcar(self, rect):
+        if rect is None or self.todo:
+            return
+        rect = rect.clip(self.area)
+        if rect.width and rect.height:
+            self.sucias.append(rect)
+
+    def marcar_todo(self):
+        self.todo = True
+
+    def vigilar(self, clave, valor):
+        """Marca toda la pantalla si valor cambió desde el frame anterior."""
+        if self._vigilados.get(clave, self) != valor:
+            self._vigilados[clave] = valor
+            self.marcar_todo()
+            return True
+        return False
+
+    def sprite(self, clave, rect, estado=None):
+        """
+        Registra dónde quedó dibujado un sprite (None si ya no se dibuja).
+        Si cambió su rect o su estado (frame, texto, ...) se marcan la
+        posición anterior y la nueva. Devuelve True si cambió.
+        """
+        actual = (rect.copy() if rect is not None else None, estado)
+        anterior = self._sprites.get(clave)
+        if anterior == actual:
+            return False
+        if anterior is not None:
+            self.marcar(anterior[0])
+        self.marcar(rect)
+        self._sprites[clave] = actual
+        return True
+
+    def zonas(self):
+        """
+        Zonas de pantalla que hay que repintar este frame (sin solaparse):
+        toda la pantalla, las sucias o ninguna. Se consulta después de
+        registrar los sprites y antes de dibujar, así un frame sin cambios
+        no dibuja nada.
+        """
+        if self.todo:
+            return [self.area]
+        # Las zonas que se tocan se juntan: si no, lo que cae en las dos se
+        # dibujaría dos veces y los bordes con alpha quedarían más opacos
+        zonas = []
+        for rect in self.sucias:
+            rect = rect.copy()
+            i = rect.collidelist(zonas)
+            while i != -1:
+                rect.union_ip(zonas.pop(i))
+                i = rect.collidelist(zonas)
+            zonas.append(rect)
+        self.sucias = zonas
+        return zonas
+
+    def presentar(self):
+        """Actualiza la ventana con lo que cambió; devuelve False si no había nada."""
+        if self.todo:
+            pygame.display.update()
+        elif self.sucias:
+            pygame.display.update(self.sucias)
+        else:
+            self.omitidos += 1
+            return False
+        self.todo = False
+        self.sucias.clear()
+        self.presentados += 1
+        return True
@@ -1,6 +1,21 @@
 import pygame, sys
 import personaje2 as per
-import colisiones, cambio_escenarios as tel
+import cambio_escenarios as tel
+import fondo_chunks
+import atlas_sprites
+import animacion
+import temporizadores
+import cache_assets
+import bucle_juego
+import perfilador
+import entrada
+import presentacion
+import inventario
+import guardado
+import misiones_juego, tienda_juego
+import niveles
+import navegacion
+import interacciones as inter
 import dialogos as dialogos, dialogos_juego as dialogo
 
 # --- CONFIGURACIÓN BÁSICA ---
@@ -8,55 +23,42 @@ pygame.init()
 values = (1200, 600)
 screen = pygame.display.set_mode(values)
 pygame.display.set_caption("El Lado Oscuro del Carrito")
-clock = pygame.time.Clock()
+
+# --- NIVEL (hitboxes, zonas, NPCs y fondo; ver niveles.py) ---
+nivel = niveles.cargar_nivel("assets/niveles/pueblo_del_roble.json")
 
 # --- POSICIÓN INICIAL DEL JUGADOR ---
-aparicion_x, aparicion_y = 250, 350
+aparicion_x, aparicion_y = nivel.aparicion
 dinero = 1500
 
+# Pack de assets ya escalados (python src/python/cache_assets.py); sin él se carga normal
+assets = cache_assets.CacheAssets()
+
 # --- CARGAR ANIMACIONES DEL JUGADOR ---
 def cargar_animaciones():
     animaciones = []
     for frame in range(7):
-        img = pygame.image.load(f"assets/{frame}-Photoroom.png").convert_alpha()
-        img = pygame.transform.scale(img, (110, 130))
-        animaciones.append(img)
-    return animaciones
+        animaciones.append(assets.cargar(f"assets/{frame}-Photoroom.png", (110, 130)))
+    # Un solo atlas (con los flips ya generados) compartido por todos los personajes
+    return atlas_sprites.AtlasSprites(animaciones)
 
 animaciones = cargar_animaciones()
-jugador = per.Protagonista(0, dinero, animaciones, aparicion_x, aparicion_y, 5)
+jugador = per.Protagonista(0, dinero, animaciones, aparicion_x, aparicion_y, 5, inventario.Inventario(10))
+jugador.programar_necesidades()
 
 # --- FONDOS ---
-fondo_menu = pygame.image.load("assets/imagen_fondo_principal.jpg")
-fondo_menu = pygame.transform.scale(fondo_menu, values)
+fondo_menu = assets.cargar("assets/imagen_fondo_principal.jpg", values, alpha=False)
 
-fondo_nivel = pygame.image.load("assets/pueblo_del_roble.png")
-fondo_nivel = pygame.transform.scale(fondo_nivel, (1900, 1600))
+fondo_nivel = assets.cargar(nivel.fondo["ruta"], tuple(nivel.fondo["tam"]))
+fondo_nivel = fondo_chunks.FondoPorChunks(fondo_nivel, nivel.fondo["tam_chunk"])
 mapa_rect = fondo_nivel.get_rect()
 
-# --- HITBOXES DEL MUNDO ---
-hitboxes = [
-    pygame.Rect(530, 230, 250, 240),   # Edificio superior izquierdo
-    pygame.Rect(1115, 230, 245, 250),  # Edificio superior derecho
-    pygame.Rect(530, 680, 230, 220),   # Edificio de la Tienda
-    pygame.Rect(1115, 650, 290, 240),  # Edificio del Banco
-    pygame.Rect(),
-    pygame.Rect()
-]
-
-# -- Zona Teleport
-
-teleports = [
-    tel.ZonaTeleport(605, 470, 80, 20, None),
-    tel.ZonaTeleport(1200, 470, 70, 20, None),
-    tel.ZonaTeleport(605, 900, 80, 20, None),
-    tel.ZonaTeleport(1200, 890, 110, 20, None),
-    tel.ZonaTeleport(),
-    tel.ZonaTeleport()
-]
-
-# --- Sistema de colisiones ---
-sistema_col = colisiones.SistemaColisiones(hitboxes)
+# --- HITBOXES DEL MUNDO Y ZONAS TELEPORT (del nivel) ---
+hitboxes = nivel.hitboxes
+teleports = nivel.teleports
+
+# --- Sistema de colisiones (con el índice que ya trae el nivel) ---
+sistema_col = nivel.sistema_colisiones()
 
 # --- ESTADOS DEL JUEGO ---
 MENU = "menu"
@@ -67,28 +69,116 @@ estado_actual = MENU
 fuente_dialogo = pygame.font.Font(None, 32)
 fuente_interaccion = pygame.font.Font(None, 40)
 
-dialogos_vendedor = dialogo.dialogos_vendedor
-
-imagen_vendedor = pygame.image.load("assets/imagen_vendedor.png").convert_alpha()
-sprite_vendedor = pygame.transform.scale(imagen_vendedor, (100, 120))
-vendedor = per.NPC(0, 9999, 600, 820, dialogos_vendedor, sprite_vendedor)
+datos_vendedor = next(n for n in nivel.npcs if n["nombre"] == "vendedor")
+sprite_vendedor = assets.cargar(datos_vendedor["sprite"], tuple(datos_vendedor["tam"]))
+vendedor = per.NPC(0, datos_vendedor["dinero"], *datos_vendedor["pos"],
+                   getattr(dialogo, datos_vendedor["dialogos"]), sprite_vendedor)
+vendedor.nombre = datos_vendedor["nombre"]
+
+# --- NAVEGACIÓN: el vendedor va y viene entre la tienda y el banco ---
+grafo_nav = navegacion.GrafoNavegacion()
+# Margen de medio sprite para que el vendedor no se meta en los edificios
+rejilla_nav = navegacion.RejillaNavegacion.desde_colisiones(sistema_col, *mapa_rect.size, margen=60)
+grafo_nav.agregar_escena(nivel.nombre, rejilla_nav, sistema_col)
+patrulla_vendedor = [tuple(p) for p in datos_vendedor.get("patrulla", [])]
+siguiente_patrulla = 0
+recorrido_vendedor = None
+
+# --- SEGUIDORES: los NPCs con "sigue_al_jugador" van detrás del jugador ---
+# Un solo campo de flujo hacia el jugador sirve para todos
+campo_jugador = navegacion.CampoFlujo(rejilla_nav)
+# El grafo reconstruye la rejilla al cambiar las hitboxes; el campo se recalcula después
+sistema_col.oyentes.append(lambda rect, agregada: campo_jugador.invalidar())
+seguidores = [per.NPC(0, datos["dinero"], *datos["pos"], [], assets.cargar(datos["sprite"], tuple(datos["tam"])))
+              for datos in nivel.npcs if datos.get("sigue_al_jugador")]
 
 # --- DIÁLOGO ---
 dialogo_activo = None
 dialogo_en_progreso = False
 
+def abrir_dialogo(personaje):
+    """Acción de interacción de los NPCs que hablan."""
+    global dialogo_activo, dialogo_en_progreso
+    if not dialogo_en_progreso:
+        dialogo_activo = dialogos.Dialogo(personaje.dialogos, fuente_dialogo, 100, 450, 1000, 120)
+        dialogo_en_progreso = True
+        misiones_juego.npc_hablado(motor_misiones, personaje.nombre, jugador)
+
+# --- INTERACCIONES (el NPC más cercano en alcance responde a la E) ---
+interacciones = inter.RegistroInteracciones(fuente_interaccion)
+interacciones.registrar(vendedor, abrir_dialogo)
+
 # --- CÁMARA ---
 camara = pygame.Vector2(0, 0)
+camara_previa = pygame.Vector2(0, 0)  # cámara del paso anterior (para interpolar)
+
+# --- PERFILADOR (overlay con 9, traza de Chrome con F12) ---
+perf = perfilador.Perfilador()
+fuente_perfilador = pygame.font.Font(None, 24)
 
 # --- SISTEMA DE TELETRANSPORTE ---
 
-scenary_switch = tel.Teletransporte (teleports)
+# Los destinos se cargan ya cortados en chunks para dibujarlos igual que el nivel
+cache_escenas = tel.CacheEscenas(cargador=fondo_chunks.cargar_fondo_por_chunks)
+scenary_switch = tel.Teletransporte (teleports, cache_escenas)
 
 
-# --- LOOP PRINCIPAL ---
-while True:
-    dt = clock.tick(60)
-    for event in pygame.event.get():
+# --- PRESENTACIÓN (solo se actualizan las zonas de pantalla que cambiaron) ---
+presentador = presentacion.Presentador(screen)
+
+
+# --- MISIONES Y TIENDA (los productos se registran para poder cargar el inventario) ---
+motor_misiones = misiones_juego.crear_motor()
+tienda = tienda_juego.crear_tienda()
+guardado.OBJETOS.registrar(*tienda_juego.productos(tienda))
+
+def comprar_en_tienda(nombre):
+    """Compra una unidad mientras se habla con el vendedor (C compra comida)."""
+    producto = tienda.buscar_por_nombre(nombre)
+    if not tienda_juego.comprar(tienda, jugador, [(producto.id, 1)], motor_misiones):
+        print("No se pudo comprar:", nombre)
+
+# --- PARTIDA GUARDADA (autoguardado cada 30 s, F5 guarda, F9 carga la última) ---
+autoguardado = guardado.AutoGuardado()
+
+def guardar_partida():
+    # En este hilo solo se copia el estado; serializar y escribir va en el del autoguardado
+    autoguardado.guardar(guardado.capturar(jugador, nivel.nombre, motor_misiones))
+
+def cargar_partida():
+    autoguardado.esperar()
+    try:
+        instantanea = guardado.cargar(autoguardado.ruta)
+    except (OSError, ValueError) as error:
+        print("No se pudo cargar la partida:", error)
+        return
+    if instantanea.escena != nivel.nombre:
+        print("La partida guardada es de otra escena:", instantanea.escena)
+        return
+    try:
+        guardado.aplicar(instantanea, jugador, motor_misiones)
+    except ValueError as error:
+        print("No se pudo cargar la partida:", error)
+
+temporizadores.RUEDA.cada(30000, guardar_partida)
+
+
+# --- ENTRADA (teclado, o --grabar / --reproducir un log de entrada) ---
+fuente_entrada = entrada.crear_entrada(sys.argv)
+
+
+# --- LÓGICA (paso fijo de simulación) ---
+def actualizar(dt):
+    global estado_actual, dialogo_activo, dialogo_en_progreso, fondo_nivel
+    global recorrido_vendedor, siguiente_patrulla
+
+    # Fin de una reproducción: se detiene el bucle
+    if fuente_entrada.terminado:
+        bucle.detener()
+        return
+
+    teclas, eventos = fuente_entrada.leer()
+    for event in eventos:
         if event.type == pygame.QUIT:
             sys.exit()
 
@@ -96,6 +186,10 @@ while True:
             # toggle debug con D
             if event.key == pygame.K_0:
                 sistema_col.toggle_debug()
+            elif event.key == pygame.K_9:
+                perf.toggle_overlay()
+            elif event.key == pygame.K_F12:
+                perf.exportar_chrome("traza_frames.json")
 
             if event.key == pygame.K_RETURN and estado_actual == MENU:
                 estado_actual = JUGANDO
@@ -104,27 +198,29 @@ while True:
 
             # --- INTERACCIÓN CON NPC ---
             if estado_actual == JUGANDO:
-                if event.key == pygame.K_e and jugador.rect.colliderect(vendedor.rect):
-                    if not dialogo_en_progreso:
-                        dialogo_activo = dialogos.Dialogo(
-                            vendedor.dialogos, fuente_dialogo, 100, 450, 1000, 120
-                        )
-                        dialogo_en_progreso = True
+                if event.key == pygame.K_e:
+                    interacciones.interactuar(jugador.rect)
+                elif event.key == pygame.K_F5:
+                    guardar_partida()
+                elif event.key == pygame.K_F9:
+                    cargar_partida()
+                elif event.key == pygame.K_c and dialogo_en_progreso:
+                    comprar_en_tienda("Comida")
 
                 elif event.key == pygame.K_SPACE and dialogo_en_progreso and dialogo_activo:
                     dialogo_activo.siguiente_linea()
 
-    # --- DIBUJO Y LÓGICA ---
-    if estado_actual == MENU:
-        screen.blit(fondo_menu, (0, 0))
-
-    elif estado_actual == JUGANDO:
+    if estado_actual == JUGANDO:
         # Guardamos la posición previa del rect (coordenadas del mundo)
         rect_prev = jugador.rect.copy()
 
         # --- Movimiento del jugador (tu método existente) ---
         # (tu Protagonista.movimiento() actualiza eje_x/eje_y y jugador.rect)
-        jugador.movimiento()
+        with perf.tramo("movimiento"):
+            jugador.movimiento(teclas=teclas)
+        # Animaciones y temporizadores (cooldowns, necesidades, diálogo) avanzan con el paso fijo
+        animacion.SISTEMA.avanzar(dt)
+        temporizadores.RUEDA.avanzar(dt)
 
         # Calculamos el delta (dx, dy) en mundo (después de que movimiento() actualizó rect)
         dx = jugador.rect.x - rect_prev.x
@@ -134,7 +230,8 @@ while True:
         # print("prev:", rect_prev.topleft, "dx,dy:", dx, dy)
 
         # Usamos el sistema de colisiones para prevenir movimiento
-        rect_corregido = sistema_col.prevenir_movimiento(rect_prev, dx, dy)
+        with perf.tramo("colisiones"):
+            rect_corregido = sistema_col.prevenir_movimiento(rect_prev, dx, dy)
 
         # Aplicamos la rect_corregido al jugador (sin tocar eje_x/eje_y internos)
         jugador.rect = rect_corregido
@@ -147,55 +244,156 @@ while True:
         jugador.eje_y = jugador.rect.y
 
         # --- Actualizar cámara ---
+        camara_previa.update(camara)
         camara.x = jugador.rect.centerx - values[0] // 2
         camara.y = jugador.rect.centery - values[1] // 2
         camara.x = max(0, min(camara.x, mapa_rect.width - values[0]))
         camara.y = max(0, min(camara.y, mapa_rect.height - values[1]))
 
-        # --- DIBUJAR ESCENA ---
-        screen.blit(fondo_nivel, (-camara.x, -camara.y))
+        # Identificamos el teleport (el cooldown lo lleva la rueda de temporizadores)
+        with perf.tramo("teletransporte"):
+            nuevo_fondo = scenary_switch.deteccion(jugador, hitboxes)
+        if nuevo_fondo:
+            fondo_nivel = nuevo_fondo
+            # deteccion() vacía la lista de hitboxes: reconstruir el índice
+            sistema_col.set_hitboxes(hitboxes)
+
+        # --- SEGUIDORES (se paran a un par de celdas del jugador) ---
+        if seguidores:
+            campo_jugador.actualizar(*jugador.rect.center)
+            for seguidor in seguidores:
+                navegacion.seguir(seguidor, campo_jugador, 3, parada=2)
+
+        # --- PATRULLA DEL VENDEDOR (se queda quieto mientras habla) ---
+        if patrulla_vendedor and not dialogo_en_progreso:
+            if recorrido_vendedor is None or recorrido_vendedor.terminado:
+                destino = patrulla_vendedor[siguiente_patrulla]
+                siguiente_patrulla = (siguiente_patrulla + 1) % len(patrulla_vendedor)
+                ruta = grafo_nav.buscar(nivel.nombre, *vendedor.rect.center, nivel.nombre, *destino)
+                recorrido_vendedor = navegacion.Recorrido(ruta, nivel.nombre)
+            recorrido_vendedor.avanzar(vendedor, 2)
+            interacciones.actualizar(vendedor)
+
+        # --- DIÁLOGO ---
+        if dialogo_en_progreso and dialogo_activo:
+            if not dialogo_activo.en_dialogo:
+                dialogo_en_progreso = False
+
+
+# --- DIBUJO (alpha = fracción del siguiente paso, para interpolar) ---
+def dibujar(alpha):
+    # Pasar de un estado a otro o mostrar/ocultar el overlay redibuja todo
+    presentador.vigilar("estado", estado_actual)
+    presentador.vigilar("overlay", perf.overlay_visible)
+
+    # Primero se registra dónde queda cada cosa; después solo se repintan las
+    # zonas sucias (toda la pantalla si cambió la cámara, nada si no cambió nada)
+    if estado_actual == JUGANDO:
+        vista = camara_previa.lerp(camara, alpha)
+        # Cámara, fondo o debug distintos: cambia toda la pantalla
+        presentador.vigilar("camara", (vista.x, vista.y))
+        presentador.vigilar("fondo", id(fondo_nivel))
+        presentador.vigilar("debug", sistema_col.debug_mode)
+        if sistema_col.debug_mode:
+            # Las líneas de debug cruzan toda la pantalla: se repinta entera
+            presentador.marcar_todo()
+
+        # NPCs y jugador con cámara
+        zona_vendedor = vendedor.sprite.get_rect(topleft=(vendedor.rect.x - vista.x, vendedor.rect.y - vista.y))
+        presentador.sprite("vendedor", zona_vendedor)
+        zonas_seguidores = []
+        for i, seguidor in enumerate(seguidores):
+            zona_seguidor = seguidor.sprite.get_rect(topleft=(seguidor.rect.x - vista.x, seguidor.rect.y - vista.y))
+            presentador.sprite(("seguidor", i), zona_seguidor)
+            zonas_seguidores.append(zona_seguidor)
+        zona_jugador = jugador.zona_pantalla(vista, alpha)
+        presentador.sprite("jugador", zona_jugador, (jugador.current_animation, jugador.get_current_frame_index()))
+
+        # "E" del interactuable más cercano
+        aviso = interacciones.aviso(jugador.rect, vista)
+        presentador.sprite("aviso", aviso[1] if aviso else None)
+
+        hay_dialogo = dialogo_en_progreso and dialogo_activo
+        if hay_dialogo:
+            presentador.sprite("dialogo", dialogo_activo.rect,
+                               (dialogo_activo.indice_texto, dialogo_activo.visibles))
+        else:
+            presentador.sprite("dialogo", None)
+
+    # El overlay cambia con cada medición nueva (perf.total)
+    zona_overlay = perf.zona_overlay(fuente_perfilador)
+    presentador.sprite("overlay", zona_overlay, perf.total)
+
+    zonas = presentador.zonas()
+    if estado_actual == MENU:
+        # El menú es estático: solo se restaura debajo de lo que cambió
+        for zona in zonas:
+            screen.blit(fondo_menu, zona, zona)
 
-        # Dibujar NPC y jugador con cámara
-        screen.blit(vendedor.sprite, (vendedor.rect.x - camara.x, vendedor.rect.y - camara.y))
-        # Se asume que Protagonista.dibujar acepta (surface, camara)
-        try:
-            jugador.dibujar(screen, camara)
-        except TypeError:
-            # Fallback: método dibujar sin camara (antiguo)
-            # dibuja usando jugador.rect que ya está en coordenadas mundo
-            current_frame = jugador.get_current_frame()
-            screen.blit(current_frame, (jugador.rect.x - camara.x, jugador.rect.y - camara.y))
+    elif estado_actual == JUGANDO:
+        # --- DIBUJAR ESCENA (solo el fondo de las zonas sucias) ---
+        with perf.tramo("fondo"):
+            for zona in zonas:
+                fondo_nivel.dibujar(screen, vista, zona)
+
+        # Lo que toca una zona se vuelve a dibujar recortado a ella
+        with perf.tramo("personajes"):
+            for zona in zonas:
+                screen.set_clip(zona)
+                if zona.colliderect(zona_vendedor):
+                    screen.blit(vendedor.sprite, zona_vendedor)
+                for seguidor, zona_seguidor in zip(seguidores, zonas_seguidores):
+                    if zona.colliderect(zona_seguidor):
+                        screen.blit(seguidor.sprite, zona_seguidor)
+                if zona.colliderect(zona_jugador):
+                    jugador.dibujar(screen, vista, alpha)
+                if aviso and zona.colliderect(aviso[1]):
+                    screen.blit(*aviso)
+        screen.set_clip(None)
 
         # --- DIBUJAR HITBOXES (debug) ---
-        sistema_col.dibujar_debug(screen, camara)
+        sistema_col.dibujar_debug(screen, vista)
 
         # dibujar teleports y hitboxes visibles (para debug)
         if sistema_col.debug_mode:
             for rect in hitboxes:
-                r = pygame.Rect(rect.x - camara.x, rect.y - camara.y, rect.width, rect.height)
+                r = pygame.Rect(rect.x - vista.x, rect.y - vista.y, rect.width, rect.height)
                 pygame.draw.rect(screen, (255, 0, 0), r, 2)
-            for rect in teleports:
-                r = pygame.Rect(rect.x - camara.x, rect.y - camara.y, rect.width, rect.height)
+            for tp in teleports:
+                r = pygame.Rect(tp.rect.x - vista.x, tp.rect.y - vista.y, tp.rect.width, tp.rect.height)
                 pygame.draw.rect(screen, (0, 255, 0), r, 2)
 
-        # Identificamos el teleport 
-        delta_time = clock.get_time
-        nuevo_fondo = scenary_switch.deteccion(jugador, hitboxes, delta_time)
-        if nuevo_fondo:
-            fondo_nivel = nuevo_fondo
+        # --- DIÁLOGO ---
+        if hay_dialogo:
+            with perf.tramo("dialogo"):
+                for zona in zonas:
+                    if zona.colliderect(dialogo_activo.rect):
+                        screen.set_clip(zona)
+                        dialogo_activo.dibujar(screen)
 
-        # --- MOSTRAR "E" ---
-        if jugador.rect.colliderect(vendedor.rect.inflate(20, 20)):
-            texto_e = fuente_interaccion.render("E", True, (255, 255, 255))
-            e_x = vendedor.rect.centerx - texto_e.get_width() // 2 - camara.x
-            e_y = vendedor.rect.top - 35 - camara.y
-            screen.blit(texto_e, (e_x, e_y))
+    if zona_overlay:
+        for zona in zonas:
+            if zona.colliderect(zona_overlay):
+                screen.set_clip(zona)
+                perf.dibujar_overlay(screen)
+    screen.set_clip(None)
 
-        # --- DIÁLOGO ---
-        if dialogo_en_progreso and dialogo_activo:
-            dialogo_activo.actualizar(dt)
-            dialogo_activo.dibujar(screen)
-            if not dialogo_activo.en_dialogo:
-                dialogo_en_progreso = False
+    with perf.tramo("display_update"):
+        presentador.presentar()
 
-    pygame.display.update()
+
+# --- LOOP PRINCIPAL ---
+# --velocidad X reproduce/simula X veces más rápido que el tiempo real
+velocidad = float(sys.argv[sys.argv.index("--velocidad") + 1]) if "--velocidad" in sys.argv else 1.0
+bucle = bucle_juego.BucleJuego(actualizar, dibujar, escala_tiempo=velocidad)
+try:
+    if "--headless" in sys.argv:
+        # Solo simulación, sin dibujar, tan rápido como permita la CPU (--headless [pasos])
+        i = sys.argv.index("--headless")
+        bucle.ejecutar_headless(int(sys.argv[i + 1]) if len(sys.argv) > i + 1 and sys.argv[i + 1].isdigit() else None)
+    else:
+        bucle.ejecutar()
+finally:
+    # Se cierre la ventana, termine la reproducción o se cumplan los pasos de
+    # --headless, el último autoguardado se termina de escribir antes de salir
+    autoguardado.esperar()
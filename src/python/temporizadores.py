@@ -0,0 +1,136 @@
+BITS = 6
+RANURAS = 1 << BITS      # ranuras por nivel
+MASCARA = RANURAS - 1
+NIVELES = 4              # con ticks de 1 ms alcanza ~4.6 h sin recolocar
+
+
+class Temporizador:
+    """Un temporizador programado en una RuedaTemporizadores."""
+
+    __slots__ = ("vence", "intervalo", "funcion", "args", "_ranura")
+
+    def __init__(self, vence, intervalo, funcion, args):
+        self.vence = vence            # tick en el que se dispara
+        self.intervalo = intervalo    # ticks entre disparos (None = una sola vez)
+        self.funcion = funcion
+        self.args = args
+        self._ranura = None           # dict de la rueda donde está guardado
+
+    @property
+    def activo(self):
+        return self._ranura is not None
+
+    def cancelar(self):
+        """Lo saca de la rueda; se puede llamar desde su propia función."""
+        if self._ranura is not None:
+            del self._ranura[self]
+            self._ranura = None
+        self.intervalo = None
+
+
+class RuedaTemporizadores:
+    """
+    Rueda de temporizadores jerárquica (estilo kernel de Linux).
+    Hay NIVELES ruedas de RANURAS ranuras: el nivel 0 tiene una ranura por
+    tick y cada nivel siguiente cubre RANURAS veces más tiempo. Los
+    temporizadores lejanos bajan de nivel cuando se acerca su turno, así
+    avanzar un tick solo toca la ranura que vence y el costo por frame
+    depende de los temporizadores que vencen, no de cuántos hay.
+    Los tiempos son en ms de simulación (el dt del bucle de paso fijo).
+    """
+
+    def __init__(self, resolucion=1):
+        self.resolucion = resolucion  # ms por tick
+        self.tick = 0
+        self._resto = 0.0
+        # Cada ranura es un dict usado como conjunto ordenado: cancelar es O(1)
+        # y los que vencen juntos se disparan en el orden en que se programaron
+        self._niveles = [[{} for _ in range(RANURAS)] for _ in range(NIVELES)]
+
+    @property
+    def tiempo(self):
+        """ms de simulación transcurridos."""
+        return self.tick * self.resolucion
+
+    def __len__(self):
+        return sum(len(ranura) for nivel in self._niveles for ranura in nivel)
+
+    def despues(self, ms, funcion, *args):
+        """Llama funcion(*args) una vez dentro de ms."""
+        return self._programar(self._ticks(ms), None, funcion, args)
+
+    def cada(self, ms, funcion, *args):
+        """Llama funcion(*args) cada ms hasta que se cancele."""
+        ticks = self._ticks(ms)
+        return self._programar(ticks, ticks, funcion, args)
+
+    def _ticks(self, ms):
+        return max(1, round(ms / self.resolucion))
+
+    def _programar(self, ticks, intervalo, funcion, args):
+        temporizador = Temporizador(self.tick + ticks, intervalo, funcion, args)
+        self._colocar(temporizador)
+        return temporizador
+
+    def _colocar(self, temporizador):
+        delta = temporizador.vence - self.tick
+        if delta <= 0:
+            # Vence en este mismo tick (al bajar de nivel): va a la ranura actual
+            ranura = self._niveles[0][self.tick & MASCARA]
+        else:
+            nivel = 0
+            while nivel < NIVELES - 1 and delta >= 1 << (BITS * (nivel + 1)):
+                nivel += 1
+            # Más allá del último nivel se guarda en su ranura más lejana y se recoloca al llegar
+            vence = min(temporizador.vence, self.tick + (1 << (BITS * NIVELES)) - 1)
+            ranura = self._niveles[nivel][(vence >> (BITS * nivel)) & MASCARA]
+        ranura[temporizador] = None
+        temporizador._ranura = ranura
+
+    def avanzar(self, dt):
+        """Avanza dt ms y dispara los temporizadores vencidos; devuelve cuántos."""
+        self._resto += dt / self.resolucion
+        ticks = int(self._resto)
+        self._resto -= ticks
+        disparados = 0
+        for _ in range(ticks):
+            disparados += self._avanzar_tick()
+        return disparados
+
+    def _avanzar_tick(self):
+        self.tick += 1
+        tick = self.tick
+
+        # Al completar una vuelta de un nivel se bajan los temporizadores
+        # de la ranura que toca en el nivel de arriba
+        nivel = 1
+        while nivel < NIVELES and (tick & ((1 << (BITS * nivel)) - 1)) == 0:
+            nivel += 1
+        for n in range(nivel - 1, 0, -1):
+            indice = (tick >> (BITS * n)) & MASCARA
+            ranura = self._niveles[n][indice]
+            if ranura:
+                self._niveles[n][indice] = {}
+                for temporizador in ranura:
+                    self._colocar(temporizador)
+
+        vencidos = self._niveles[0][tick & MASCARA]
+        if not vencidos:
+            return 0
+        self._niveles[0][tick & MASCARA] = {}
+        disparados = 0
+        # Una función puede cancelar a otro de la misma ranura: se saca de a uno
+        while vencidos:
+            temporizador = next(iter(vencidos))
+            del vencidos[temporizador]
+            temporizador._ranura = None
+            temporizador.funcion(*temporizador.args)
+            disparados += 1
+            if temporizador.intervalo is not None:
+                temporizador.vence += temporizador.intervalo
+                self._colocar(temporizador)
+        return disparados
+
+
+# Rueda compartida por el juego (se avanza una vez por paso de simulación)
+RUEDA = RuedaTemporizadores()
@@ -0,0 +1,46 @@
+from compilados_py.Release import personaje as per
+import misiones_juego
+
+# Catálogo de la tienda del vendedor
+
+
+def crear_tienda():
+    tienda = per.Tienda()
+    tienda.agregar_producto(per.Bien("Comida", 20.0))
+    tienda.agregar_producto(per.Bien("Agua potable (botella)", 5.0))
+    tienda.agregar_producto(per.Bien("Ropa", 50.0))
+    tienda.agregar_producto(per.Servicio("Internet", 120.0))
+    return tienda
+
+
+def productos(tienda):
+    return [tienda.buscar(id_producto) for id_producto in range(len(tienda))]
+
+
+def comprar(tienda, jugador, carrito, motor=None):
+    """
+    Compra un carrito [(id, cantidad)] para el jugador: se cobra con
+    comprar_carrito y los productos van a su inventario. Es todo o nada.
+    Si se pasa motor, emite DINERO_GASTADO con lo cobrado o COMPRA_RECHAZADA.
+    """
+    tienda.precio_carrito(carrito)  # Productos o cantidades inválidos: lanza antes de tocar nada
+    inventario = jugador.inventario
+    antes = inventario.estado()
+    if all(inventario.agregar_objeto(tienda.buscar(id_producto), cantidad) for id_producto, cantidad in carrito):
+        dinero = jugador.dinero
+        try:
+            comprado = tienda.comprar_carrito(jugador, carrito)
+        except Exception:
+            inventario.restaurar(antes)
+            raise
+        if comprado:
+            gastado = dinero - jugador.dinero
+            if motor is not None and gastado > 0:
+                misiones_juego.dinero_gastado(motor, gastado, jugador)
+            return True
+
+    # No alcanzó el dinero o no entraba en el inventario (o el carrito estaba vacío)
+    inventario.restaurar(antes)
+    if motor is not None:
+        misiones_juego.compra_rechazada(motor, jugador)
+    return False
@@ -1,5 +1,52 @@
 import pygame
 
+
+class BarraEstado:
+    """
+    Widget retenido de una barra de necesidad.
+    Guarda su superficie compuesta (barra + texto) y solo la vuelve a
+    componer cuando cambia el valor que muestra.
+    """
+
+    def __init__(self, nombre, fuente, color_texto, maximo=100, ancho_maximo=200, alto_barra=20):
+        self.nombre = nombre
+        self.fuente = fuente
+        self.color_texto = color_texto
+        self.maximo = maximo
+        self.ancho_maximo = ancho_maximo
+        self.alto_barra = alto_barra
+        self.valor = None
+        self.superficie = None
+
+    def actualizar(self, valor):
+        """Recompone la superficie si valor cambió. Devuelve True si se redibujó."""
+        if valor == self.valor:
+            return False
+        self.valor = valor
+
+        porcentaje = valor / self.maximo
+        porcentaje = max(0, min(1, porcentaje))
+        ancho_actual = int(self.ancho_maximo * porcentaje)
+
+        if porcentaje > 0.6:
+            color_relleno = (0, 255, 0)
+        elif porcentaje > 0.3:
+            color_relleno = (255, 255, 0)
+        else:
+            color_relleno = (255, 0, 0)
+
+        texto = self.fuente.render(f"{self.nombre}: {valor}", True, self.color_texto)
+
+        # El texto va 2 px por encima de la barra, como en el HUD original
+        ancho = self.ancho_maximo + 15 + texto.get_width()
+        alto = max(self.alto_barra + 2, texto.get_height())
+        self.superficie = pygame.Surface((ancho, alto), pygame.SRCALPHA)
+        pygame.draw.rect(self.superficie, (0, 0, 0), (0, 2, self.ancho_maximo, self.alto_barra))
+        pygame.draw.rect(self.superficie, color_relleno, (0, 2, ancho_actual, self.alto_barra))
+        self.superficie.blit(texto, (self.ancho_maximo + 15, 0))
+        return True
+
+
 class UI():
     def __init__(self, pos_x, pos_y):
         self.display_surface = pygame.display.get_surface()
@@ -8,17 +55,32 @@ class UI():
         self.pos_x = pos_x
         self.pos_y = pos_y
 
+        # HUD retenido: widgets por necesidad y layouts de inventario ya calculados
+        self.barras = {}
+        self.layouts_inventario = {}  # (resolución, capacidad) -> (panel, slots)
+
 
     def interfaz_inventario(self, surface, capacidad):
+        clave = (surface.get_size(), capacidad)
+        if clave not in self.layouts_inventario:
+            self.layouts_inventario[clave] = self._componer_inventario(capacidad)
+        panel, slots = self.layouts_inventario[clave]
+
+        surface.blit(panel, (self.pos_x - 4, self.pos_y - 4))
+        return slots
+
+    def _componer_inventario(self, capacidad):
+        """Calcula los slots y compone el panel del inventario una sola vez."""
     # --- Parámetros de interfaz ---
         ancho_interfaz, alto_interfaz = 800, 600
         columnas = 5
         filas = 2
         espaciado = 15  # separación entre slots
-    
-    # --- Fondo del inventario ---
-        pygame.draw.rect(surface, (30, 30, 30), (self.pos_x, self.pos_y, ancho_interfaz, alto_interfaz))
-        pygame.draw.rect(surface, (60, 60, 60), (self.pos_x - 4, self.pos_y - 4, ancho_interfaz + 8, alto_interfaz + 8), 4)
+
+    # --- Fondo del inventario (el panel incluye el borde de 4 px) ---
+        panel = pygame.Surface((ancho_interfaz + 8, alto_interfaz + 8), pygame.SRCALPHA)
+        pygame.draw.rect(panel, (30, 30, 30), (4, 4, ancho_interfaz, alto_interfaz))
+        pygame.draw.rect(panel, (60, 60, 60), (0, 0, ancho_interfaz + 8, alto_interfaz + 8), 4)
 
     # --- Cálculo del tamaño de cada slot ---
         ancho_slot = (ancho_interfaz - (espaciado * (columnas + 1))) // columnas
@@ -26,7 +88,7 @@ class UI():
 
         slots = []
 
-    # --- Dibujar slots en cuadrícula ---
+    # --- Slots en cuadrícula (en coordenadas de pantalla) ---
         for fila in range(filas):
             for columna in range(columnas):
                 indice = fila * columnas + columna
@@ -37,37 +99,23 @@ class UI():
                 pos_y = self.pos_y + espaciado + fila * (alto_slot + espaciado)
 
                 rect = pygame.Rect(pos_x, pos_y, ancho_slot, alto_slot)
-                pygame.draw.rect(surface, (80, 80, 80), rect)        
-                pygame.draw.rect(surface, (150, 150, 150), rect, 2)  
+                en_panel = rect.move(4 - self.pos_x, 4 - self.pos_y)
+                pygame.draw.rect(panel, (80, 80, 80), en_panel)
+                pygame.draw.rect(panel, (150, 150, 150), en_panel, 2)
                 slots.append(rect)
 
-        return slots
+        return panel, slots
 
 
     def barras_estados(self, estados: dict, surface, eje_x, eje_y):
-        maximo = 100
-        ancho_maximo = 200
-        alto_barra = 20
         espacio_vertical = 40
 
         for indice, (nombre, valor_actual) in enumerate(estados.items()):
-            porcentaje = valor_actual / maximo
-            porcentaje = max(0, min(1, porcentaje))
-            ancho_actual = int(ancho_maximo * porcentaje)
+            barra = self.barras.get(nombre)
+            if barra is None:
+                barra = self.barras[nombre] = BarraEstado(nombre, self.font, self.color_texto)
+            # Solo se recompone si el valor cambió (cambio_necesidades)
+            barra.actualizar(valor_actual)
 
             pos_y = eje_y + indice * espacio_vertical
-
-            pygame.draw.rect(surface, (0, 0, 0), (eje_x, pos_y, ancho_maximo, alto_barra))
-
-            if porcentaje > 0.6:
-                color_relleno = (0, 255, 0)
-            elif porcentaje > 0.3:
-                color_relleno = (255, 255, 0)
-            else:
-                color_relleno = (255, 0, 0)
-
-            pygame.draw.rect(surface, color_relleno, (eje_x, pos_y, ancho_actual, alto_barra))
-
-            texto_barras = self.font.render(f"{nombre}: {valor_actual}", True, self.color_texto)
-            surface.blit(texto_barras, (eje_x + ancho_maximo + 15, pos_y - 2))
-
+            surface.blit(barra.superficie, (eje_x, pos_y - 2))
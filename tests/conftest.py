@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Los módulos del juego se importan por nombre desde src/python (como en los mains)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "python"))
@@ -0,0 +1,32 @@
+import pygame
+
+import animacion
+import inventario
+import personaje2
+import temporizadores
+
+
+def test_liberar_devuelve_el_slot_y_corta_las_necesidades():
+    frames = [pygame.Surface((8, 8)) for _ in range(16)]
+    rueda = temporizadores.RuedaTemporizadores()
+    libres = len(animacion.SISTEMA._libres)
+
+    personaje = personaje2.Protagonista(0, 0, frames, 0, 0, 5, inventario.Inventario(1))
+    personaje.programar_necesidades(rueda)
+    slot = personaje.slot_animacion
+    assert animacion.SISTEMA.activo[slot]
+    assert len(rueda) == 1
+
+    personaje.liberar()
+    personaje.liberar()  # liberar dos veces no duplica el slot
+    assert not animacion.SISTEMA.activo[slot]
+    assert len(animacion.SISTEMA._libres) == libres
+    assert len(rueda) == 0
+
+    # Una escena llena que se vacía no hace crecer el sistema
+    capacidad = len(animacion.SISTEMA.estado)
+    for _ in range(3):
+        multitud = [personaje2.Protagonista(0, 0, frames, 0, 0, 5, inventario.Inventario(1)) for _ in range(40)]
+        for vecino in multitud:
+            vecino.liberar()
+    assert len(animacion.SISTEMA.estado) == capacidad
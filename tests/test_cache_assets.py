@@ -0,0 +1,38 @@
+import pygame
+import pytest
+
+import cache_assets
+
+
+@pytest.fixture
+def pack(tmp_path):
+    imagen = pygame.Surface((8, 6), pygame.SRCALPHA)
+    imagen.fill((10, 20, 30, 255))
+    ruta = str(tmp_path / "imagen.png")
+    pygame.image.save(imagen, ruta)
+    ruta_pack = str(tmp_path / "assets.pak")
+    cache_assets.construir([(ruta, (4, 3), True)], ruta_pack)
+    return ruta, ruta_pack
+
+
+def test_pack_valido_carga_desde_la_cache(pack):
+    ruta, ruta_pack = pack
+    cache = cache_assets.CacheAssets(ruta_pack)
+    imagen = cache.cargar(ruta, (4, 3))
+    assert imagen.get_size() == (4, 3)
+    assert imagen.get_at((0, 0)) == (10, 20, 30, 255)
+    assert cache.faltantes == []
+
+
+@pytest.mark.parametrize("largo", [0, 10, 17, 64, 100])
+def test_pack_truncado_carga_normal(pack, largo):
+    ruta, ruta_pack = pack
+    with open(ruta_pack, "rb") as archivo:
+        datos = archivo.read()
+    with open(ruta_pack, "wb") as archivo:
+        archivo.write(datos[:largo])
+
+    cache = cache_assets.CacheAssets(ruta_pack)
+    assert cache.datos is None and cache.indice == {}
+    assert cache.cargar(ruta, (4, 3)).get_size() == (4, 3)
+    assert len(cache.faltantes) == 1
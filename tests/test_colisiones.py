@@ -0,0 +1,40 @@
+import random
+
+import pygame
+
+import colisiones
+
+
+def test_lote_igual_que_prevenir_movimiento_con_casos_aleatorios():
+    azar = random.Random(1234)
+    hitboxes = [pygame.Rect(azar.randrange(-200, 3000), azar.randrange(-200, 3000),
+                            azar.randrange(0, 300), azar.randrange(0, 300)) for _ in range(150)]
+    sistema = colisiones.SistemaColisiones(hitboxes, tam_celda=128)
+
+    for ronda in range(40):
+        # Cambiar las hitboxes entre rondas invalida los arrays de la fase amplia
+        if ronda % 5 == 4:
+            sistema.remove_hitbox(sistema.hitboxes[azar.randrange(len(sistema.hitboxes))])
+            sistema.add_hitbox(pygame.Rect(azar.randrange(0, 2800), azar.randrange(0, 2800),
+                                           azar.randrange(1, 200), azar.randrange(1, 200)))
+        cuerpos = [pygame.Rect(azar.randrange(-100, 3000), azar.randrange(-100, 3000),
+                               azar.choice((0, azar.randrange(1, 150))), azar.randrange(0, 150))
+                   for _ in range(200)]
+        dx = [azar.choice((0, azar.randrange(-200, 201))) for _ in cuerpos]
+        dy = [azar.choice((0, azar.randrange(-200, 201))) for _ in cuerpos]
+
+        nuevo_x, nuevo_y = sistema.prevenir_movimiento_lote(
+            [c.x for c in cuerpos], [c.y for c in cuerpos],
+            [c.width for c in cuerpos], [c.height for c in cuerpos], dx, dy)
+        for cuerpo, mx, my, px, py in zip(cuerpos, dx, dy, nuevo_x.tolist(), nuevo_y.tolist()):
+            assert (px, py) == sistema.prevenir_movimiento(cuerpo, mx, my).topleft
+
+
+def test_lote_con_indice_de_nivel_compilado():
+    hitboxes = [pygame.Rect(100, 100, 50, 50), pygame.Rect(400, 0, 20, 600)]
+    indice = colisiones.RejillaEspacial(64)
+    indice.reconstruir(hitboxes)
+    sistema = colisiones.SistemaColisiones(hitboxes, indice=indice)
+    x, y = sistema.prevenir_movimiento_lote([40, 300], [100, 10], [50, 50], [50, 50], [30, 100], [0, 5])
+    # El primero se frena contra la primera hitbox; el segundo contra la pared en X pero baja en Y
+    assert x.tolist() == [40, 300] and y.tolist() == [100, 15]
@@ -0,0 +1,107 @@
+import zlib
+
+import pygame
+import pytest
+
+import guardado
+import inventario
+import misiones_juego
+import tienda_juego
+from compilados_py.Release import personaje as per
+
+
+class Jugador(per.Personaje):
+    def __init__(self, x=0, y=0):
+        super().__init__(0, 0)
+        self.rect = pygame.Rect(x, y, 80, 120)
+        self.inventario = inventario.Inventario(10)
+        self.estados = {"alimentacion": 100}
+
+
+def partida(tmp_path):
+    tienda = tienda_juego.crear_tienda()
+    registro = guardado.RegistroObjetos()
+    registro.registrar(*tienda_juego.productos(tienda))
+
+    jugador = Jugador(40, 70)
+    jugador.dinero = 321
+    jugador.estados["alimentacion"] = 42
+    jugador.inventario.agregar_objeto(tienda.buscar_por_nombre("Comida"), 120)
+    jugador.inventario.agregar_objeto(tienda.buscar_por_nombre("Ropa"), 2)
+    motor = misiones_juego.crear_motor()
+    misiones_juego.npc_hablado(motor, "vendedor", jugador)
+
+    ruta = str(tmp_path / "partida.sav")
+    guardado.guardar(ruta, guardado.capturar(jugador, "pueblo_del_roble", motor))
+    return ruta, tienda, registro
+
+
+def test_cargar_devuelve_objetos_reales(tmp_path):
+    ruta, tienda, registro = partida(tmp_path)
+
+    jugador = Jugador()
+    motor = misiones_juego.crear_motor()
+    escena = guardado.aplicar(guardado.cargar(ruta), jugador, motor, resolver=registro)
+
+    assert escena == "pueblo_del_roble"
+    assert (jugador.dinero, jugador.rect.topleft, jugador.estados["alimentacion"]) == (371, (40, 70), 42)
+    comida = tienda.buscar_por_nombre("Comida")
+    assert jugador.inventario.cantidad(comida) == 120
+    assert jugador.inventario.cantidad(tienda.buscar_por_nombre("Ropa")) == 2
+    # Los ejemplares son los Producto del catálogo, no sus nombres
+    for _, ejemplar, _, _ in jugador.inventario.estado():
+        assert isinstance(ejemplar, per.Producto)
+    assert jugador.inventario.transferir(inventario.Inventario(5), comida, 10)
+    assert motor.obtener(0).preguntafinal() and not motor.obtener(1).preguntafinal()
+    assert motor.obtener(1).progreso == 1
+
+
+def test_objeto_desconocido_no_toca_al_jugador(tmp_path):
+    ruta, _, _ = partida(tmp_path)
+    jugador = Jugador(5, 5)
+    with pytest.raises(ValueError):
+        guardado.aplicar(guardado.cargar(ruta), jugador, resolver=guardado.RegistroObjetos())
+    assert jugador.rect.topleft == (5, 5) and jugador.dinero == 1500
+
+
+@pytest.mark.parametrize("dano", ["truncada", "bit", "vacia"])
+def test_partida_danada_es_value_error(tmp_path, dano):
+    ruta, _, _ = partida(tmp_path)
+    with open(ruta, "rb") as archivo:
+        datos = archivo.read()
+    if dano == "truncada":
+        datos = datos[:len(datos) // 2]
+    elif dano == "bit":
+        datos = datos[:-3] + bytes([datos[-3] ^ 0x10]) + datos[-2:]
+    else:
+        datos = b""
+    with pytest.raises(ValueError):
+        guardado.deserializar(datos)
+
+
+def test_secciones_internas_invalidas_son_value_error():
+    # crc correcto pero sin la sección del personaje
+    cuerpo = guardado._SECCION.pack(guardado.ESCENA, 1) + b"x"
+    datos = guardado._CABECERA.pack(guardado.MAGIA, guardado.VERSION, 1, len(cuerpo), zlib.crc32(cuerpo)) + cuerpo
+    with pytest.raises(ValueError):
+        guardado.deserializar(datos)
+
+
+def test_entidades_que_no_entran_no_dejan_misiones_a_medias(tmp_path):
+    jugador = Jugador(40, 70)
+    motor = misiones_juego.crear_motor()
+    misiones_juego.npc_hablado(motor, "vendedor", jugador)
+    entidades = per.EntityStore(8)
+    for i in range(5):
+        entidades.agregar(i, i)
+    ruta = str(tmp_path / "partida.sav")
+    guardado.guardar(ruta, guardado.capturar(jugador, "pueblo_del_roble", motor, entidades))
+
+    # Motor sin progreso y un EntityStore donde no caben las 5 entidades
+    otro = Jugador(5, 5)
+    motor_nuevo = misiones_juego.crear_motor()
+    antes = motor_nuevo.exportar_estado()
+    with pytest.raises(ValueError):
+        guardado.aplicar(guardado.cargar(ruta), otro, motor_nuevo, per.EntityStore(2))
+    assert motor_nuevo.exportar_estado() == antes
+    assert otro.rect.topleft == (5, 5) and otro.dinero == 1500
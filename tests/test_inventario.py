@@ -0,0 +1,157 @@
+import inventario
+
+
+class Objeto:
+    def __init__(self, nombre):
+        self.nombre = nombre
+
+
+def invariante(inv):
+    """Todos los slots de un tipo están llenos salvo el último; los libres están vacíos."""
+    for tipo, slots in inv.slots_por_tipo.items():
+        assert all(inv.tipo_slot[s] == tipo for s in slots)
+        assert all(inv.cantidad_slot[s] == inv.tam_pila for s in slots[:-1])
+        assert 0 < inv.cantidad_slot[slots[-1]] <= inv.tam_pila
+        assert inv.totales[tipo] == sum(inv.cantidad_slot[s] for s in slots)
+    assert all(inv.tipo_slot[s] is None and inv.cantidad_slot[s] == 0 for s in inv.libres)
+    ocupados = sum(len(slots) for slots in inv.slots_por_tipo.values())
+    assert ocupados + len(inv.libres) == inv.capacidad
+
+
+def test_apila_repartiendo_entre_slots():
+    inv = inventario.Inventario(4, tam_pila=10)
+    comida = Objeto("Comida")
+
+    assert inv.agregar_objeto(comida, 25)
+    assert inv.cantidad(comida) == 25
+    assert [inv.cantidad_slot[s] for s in inv.slots_por_tipo["Comida"]] == [10, 10, 5]
+    assert inv.slots_libres == 1
+    assert inv.espacio_para(comida) == 15
+    invariante(inv)
+
+    # No cabe: no se agrega nada
+    assert not inv.agregar_objeto(comida, 16)
+    assert inv.cantidad(comida) == 25
+
+    assert inv.quitar_objeto(comida, 12)
+    assert [inv.cantidad_slot[s] for s in inv.slots_por_tipo["Comida"]] == [10, 3]
+    assert inv.slots_libres == 2
+    invariante(inv)
+
+    assert inv.quitar_objeto(comida, 13)
+    assert inv.contenido == []
+    assert inv.slots_libres == 4
+    invariante(inv)
+
+
+def test_objetos_con_el_mismo_nombre_se_agrupan():
+    inv = inventario.Inventario(3, tam_pila=10)
+    una, otra = Objeto("Agua"), Objeto("Agua")
+
+    assert inventario.tipo_de(una) == inventario.tipo_de(otra) == "Agua"
+    assert inventario.tipo_de("piedra") == "piedra"
+    inv.agregar_objeto(una, 4)
+    inv.agregar_objeto(otra, 3)
+    inv.agregar_objeto("piedra", 2)
+
+    assert inv.cantidad(otra) == 7
+    assert len(inv.slots_por_tipo["Agua"]) == 1
+    assert inv.contenido == [(una, 7), ("piedra", 2)]
+    invariante(inv)
+
+
+def test_cantidades_menores_que_uno_se_rechazan():
+    inv = inventario.Inventario(2)
+    comida = Objeto("Comida")
+    inv.agregar_objeto(comida, 5)
+    destino = inventario.Inventario(2)
+
+    for cantidad in (0, -3):
+        assert not inv.agregar_objeto(comida, cantidad)
+        assert not inv.quitar_objeto(comida, cantidad)
+        assert not inv.transferir(destino, comida, cantidad)
+        assert not inv.transferir_todo(destino, {comida: cantidad})
+    assert inv.cantidad(comida) == 5
+    assert destino.contenido == []
+
+
+def test_quitar_un_tipo_desconocido_no_falla():
+    inv = inventario.Inventario(2)
+    assert not inv.quitar_objeto(Objeto("Nada"))
+    assert not inv.quitar_objeto("nada", 3)
+    assert not inv.transferir(inventario.Inventario(2), Objeto("Nada"))
+    invariante(inv)
+
+
+def test_transferir_todo_es_todo_o_nada():
+    origen = inventario.Inventario(4, tam_pila=10)
+    destino = inventario.Inventario(2, tam_pila=10)
+    comida, ropa = Objeto("Comida"), Objeto("Ropa")
+    origen.agregar_objeto(comida, 15)
+    origen.agregar_objeto(ropa, 8)
+    destino.agregar_objeto(ropa, 4)
+    antes_origen, antes_destino = origen.estado(), destino.estado()
+
+    # No cabe (la comida necesita dos slots y solo queda uno)
+    assert not origen.transferir_todo(destino, {comida: 15, ropa: 1})
+    # Falta cantidad en el origen
+    assert not origen.transferir_todo(destino, {ropa: 9})
+    # Dos objetos del mismo tipo se suman y se pasan de lo que hay
+    assert not origen.transferir_todo(destino, {ropa: 5, Objeto("Ropa"): 4})
+    assert origen.estado() == antes_origen
+    assert destino.estado() == antes_destino
+
+    assert origen.transferir_todo(destino, {comida: 9, ropa: 6})
+    assert origen.cantidad(comida) == 6 and origen.cantidad(ropa) == 2
+    assert destino.cantidad(comida) == 9 and destino.cantidad(ropa) == 10
+    invariante(origen)
+    invariante(destino)
+
+
+def test_transferir_todo_deshace_lo_movido_si_falla_a_medias():
+    origen = inventario.Inventario(4, tam_pila=10)
+    destino = inventario.Inventario(4, tam_pila=10)
+    comida, ropa = Objeto("Comida"), Objeto("Ropa")
+    origen.agregar_objeto(comida, 12)
+    origen.agregar_objeto(ropa, 3)
+    antes_origen, antes_destino = origen.estado(), destino.estado()
+
+    transferir = origen.transferir
+
+    def falla_con_la_ropa(destino_, producto, cantidad=1):
+        if inventario.tipo_de(producto) == "Ropa":
+            return False
+        return transferir(destino_, producto, cantidad)
+
+    origen.transferir = falla_con_la_ropa
+    assert not origen.transferir_todo(destino, {comida: 12, ropa: 3})
+    assert origen.estado() == antes_origen
+    assert destino.estado() == antes_destino
+    invariante(origen)
+    invariante(destino)
+
+
+def test_estado_y_restaurar_conservan_slots_y_orden():
+    inv = inventario.Inventario(5, tam_pila=10)
+    comida, agua = Objeto("Comida"), Objeto("Agua")
+    inv.agregar_objeto(comida, 14)
+    inv.agregar_objeto(agua, 3)
+    inv.quitar_objeto(comida, 10)
+    inv.agregar_objeto(agua, 10)
+    estado = inv.estado()
+
+    copia = inventario.Inventario(5, tam_pila=10)
+    copia.agregar_objeto(Objeto("Ropa"), 7)
+    copia.restaurar(estado)
+
+    assert copia.estado() == estado
+    assert copia.tipo_slot == inv.tipo_slot
+    assert copia.cantidad_slot == inv.cantidad_slot
+    assert sorted(copia.libres) == sorted(inv.libres)
+    assert copia.cantidad(Objeto("Ropa")) == 0
+    invariante(copia)
+
+    # Tras restaurar se sigue pudiendo usar con normalidad
+    assert copia.agregar_objeto(agua, 7)
+    assert copia.cantidad(agua) == 20
+    invariante(copia)
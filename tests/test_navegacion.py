@@ -0,0 +1,44 @@
+import pygame
+
+import colisiones
+import navegacion
+
+
+def test_pared_junto_a_una_diagonal_invalida_la_ruta():
+    # Rejilla de 4x4 celdas de 32 px sin obstáculos
+    sistema_col = colisiones.SistemaColisiones([])
+    rejilla = navegacion.RejillaNavegacion.desde_colisiones(sistema_col, 128, 128)
+    grafo = navegacion.GrafoNavegacion()
+    grafo.agregar_escena("prueba", rejilla, sistema_col)
+
+    # De la celda (0, 0) a la (1, 1): un solo paso diagonal
+    ruta = grafo.buscar("prueba", 16, 16, "prueba", 48, 48)
+    assert [(x, y) for _, x, y in ruta] == [(16, 16), (48, 48)]
+
+    # Pared en la celda (1, 0): la ruta no pasa por ella pero su diagonal corta la esquina
+    sistema_col.add_hitbox(pygame.Rect(32, 0, 32, 32))
+    assert rejilla.bloqueadas[0, 1]
+
+    ruta = grafo.buscar("prueba", 16, 16, "prueba", 48, 48)
+    assert grafo.busquedas == 2
+    celdas = [(x // 32, y // 32) for _, x, y in ruta]
+    assert celdas == [(0, 0), (0, 1), (1, 1)]
+
+
+def test_seguir_avanza_por_el_campo_y_para_cerca_del_objetivo():
+    sistema_col = colisiones.SistemaColisiones([pygame.Rect(64, 0, 32, 96)])
+    rejilla = navegacion.RejillaNavegacion.desde_colisiones(sistema_col, 256, 128)
+    campo = navegacion.CampoFlujo(rejilla)
+    campo.actualizar(208, 48)
+
+    class Seguidor:
+        def __init__(self, x, y):
+            self.eje_x, self.eje_y = x, y
+            self.rect = pygame.Rect(x, y, 8, 8)
+
+    seguidor = Seguidor(12, 44)
+    for _ in range(200):
+        navegacion.seguir(seguidor, campo, 2)
+        assert not rejilla.bloqueadas[rejilla.celda(*seguidor.rect.center)[::-1]]
+    # Rodea la pared y se queda a una celda del objetivo
+    assert campo.distancia(*seguidor.rect.center) == 1
@@ -0,0 +1,24 @@
+import pygame
+
+import presentacion
+
+
+def test_zonas_vacias_si_nada_cambio_y_sin_solaparse():
+    pygame.display.init()
+    presentador = presentacion.Presentador(pygame.display.set_mode((200, 100)))
+    assert presentador.zonas() == [presentador.area]
+    presentador.presentar()
+
+    presentador.sprite("a", pygame.Rect(10, 10, 20, 20))
+    presentador.presentar()
+    # El mismo sprite en el mismo lugar: no hay nada que repintar
+    presentador.sprite("a", pygame.Rect(10, 10, 20, 20))
+    assert presentador.zonas() == []
+    assert not presentador.presentar()
+
+    # Se movió un poco: la posición vieja y la nueva se juntan en una sola zona
+    presentador.sprite("a", pygame.Rect(15, 10, 20, 20))
+    presentador.sprite("b", pygame.Rect(150, 50, 10, 10))
+    zonas = presentador.zonas()
+    assert sorted(map(tuple, zonas)) == [(10, 10, 25, 20), (150, 50, 10, 10)]
+    assert all(not z.colliderect(o) for z in zonas for o in zonas if z is not o)
@@ -0,0 +1,124 @@
+import random
+
+import pytest
+
+import temporizadores
+
+# Bordes de los niveles de la rueda (en ticks de 1 ms) y el alcance total
+BORDES = [1 << (temporizadores.BITS * nivel) for nivel in range(1, temporizadores.NIVELES)]
+ALCANCE = 1 << (temporizadores.BITS * temporizadores.NIVELES)
+
+
+class Referencia:
+    """Agenda ingenua: en cada paso busca el menor vencimiento entre todos los activos."""
+
+    def __init__(self):
+        self.tick = 0
+        self.activos = {}  # id -> [vence, intervalo]
+        self.disparos = []
+
+    def programar(self, id_, ticks, intervalo):
+        self.activos[id_] = [self.tick + ticks, intervalo]
+
+    def cancelar(self, id_):
+        self.activos.pop(id_, None)
+
+    def avanzar(self, ticks):
+        hasta = self.tick + ticks
+        while self.activos:
+            vence = min(v for v, _ in self.activos.values())
+            if vence > hasta:
+                break
+            for id_ in [i for i, (v, _) in self.activos.items() if v == vence]:
+                self.disparos.append((vence, id_))
+                intervalo = self.activos[id_][1]
+                if intervalo is None:
+                    del self.activos[id_]
+                else:
+                    self.activos[id_][0] += intervalo
+        self.tick = hasta
+
+
+def retrasos_cerca_de(bordes):
+    return [borde + d for borde in bordes for d in (-2, -1, 0, 1, 2)]
+
+
+def comparar(semilla, retrasos, pasos, por_paso, largo_paso):
+    rng = random.Random(semilla)
+    rueda, referencia = temporizadores.RuedaTemporizadores(), Referencia()
+    disparos, temporizadores_ = [], {}
+
+    def programar():
+        id_ = len(temporizadores_)
+        ticks = rng.choice(retrasos)
+        funcion = lambda: disparos.append((rueda.tick, id_))
+        # Los periódicos, no muy cortos para que la agenda ingenua no tarde demasiado
+        if ticks >= BORDES[0] - 2 and rng.random() < 0.2:
+            temporizadores_[id_] = rueda.cada(ticks, funcion)
+            referencia.programar(id_, ticks, ticks)
+        else:
+            temporizadores_[id_] = rueda.despues(ticks, funcion)
+            referencia.programar(id_, ticks, None)
+
+    for _ in range(pasos):
+        for _ in range(por_paso):
+            programar()
+        # Cancelar algunos activos: muchos ya bajaron de nivel desde que se programaron
+        activos = [i for i, t in temporizadores_.items() if t.activo]
+        for id_ in rng.sample(activos, len(activos) // 10):
+            temporizadores_[id_].cancelar()
+            referencia.cancelar(id_)
+        ticks = rng.randint(1, largo_paso)
+        rueda.avanzar(ticks)
+        referencia.avanzar(ticks)
+        assert rueda.tick == referencia.tick
+        assert sorted(disparos) == sorted(referencia.disparos)
+        assert len(rueda) == len(referencia.activos)
+    return disparos
+
+
+@pytest.mark.parametrize("semilla", range(3))
+def test_rueda_coincide_con_una_agenda_ingenua(semilla):
+    retrasos = sorted(set([1, 2, 3, 63] + retrasos_cerca_de(BORDES)
+                          + [random.Random(semilla).randint(1, 3 * BORDES[-1]) for _ in range(20)]))
+    disparos = comparar(semilla, retrasos, pasos=40, por_paso=6, largo_paso=BORDES[-1] // 4)
+    assert disparos
+
+
+def test_cancelar_un_temporizador_que_ya_bajo_de_nivel():
+    rueda = temporizadores.RuedaTemporizadores()
+    disparos = []
+    lejano = rueda.despues(BORDES[-1] + 5, disparos.append, "lejano")
+    rueda.despues(BORDES[-1] + 5, disparos.append, "testigo")
+
+    # Al llegar al borde del último nivel ambos bajan al nivel 0
+    rueda.avanzar(BORDES[-1])
+    assert lejano._ranura is rueda._niveles[0][(BORDES[-1] + 5) & temporizadores.MASCARA]
+    lejano.cancelar()
+    assert not lejano.activo
+    rueda.avanzar(10)
+    assert disparos == ["testigo"]
+    assert len(rueda) == 0
+
+
+def test_retrasos_mas_alla_del_alcance_de_la_rueda():
+    """Los que superan 2^24 ticks se guardan en la ranura más lejana y se recolocan."""
+    rueda, referencia = temporizadores.RuedaTemporizadores(), Referencia()
+    disparos, programados = [], {}
+    retrasos = [ALCANCE - 1, ALCANCE, ALCANCE + 1, ALCANCE + BORDES[0] + 3, ALCANCE + BORDES[-1] + 7]
+    for id_, ticks in enumerate(retrasos):
+        programados[id_] = rueda.despues(ticks, lambda id_=id_: disparos.append((rueda.tick, id_)))
+        referencia.programar(id_, ticks, None)
+    cancelado = len(retrasos)
+    programados[cancelado] = rueda.despues(ALCANCE + 9, disparos.append, "cancelado")
+
+    rueda.avanzar(ALCANCE + 2)
+    referencia.avanzar(ALCANCE + 2)
+    # Ya se recolocó desde la ranura lejana: cancelarlo ahora también lo saca
+    programados[cancelado].cancelar()
+    rueda.avanzar(BORDES[-1] + 10)
+    referencia.avanzar(BORDES[-1] + 10)
+
+    assert disparos == referencia.disparos
+    assert [tick for tick, _ in disparos] == retrasos
+    assert len(rueda) == 0
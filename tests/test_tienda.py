@@ -0,0 +1,97 @@
+import pygame
+import pytest
+
+import inventario
+import tienda_juego
+from compilados_py.Release import personaje as per
+
+
+class Jugador(per.Personaje):
+    def __init__(self, dinero, capacidad=10):
+        super().__init__(0, 0)
+        self.dinero = dinero
+        self.rect = pygame.Rect(0, 0, 80, 120)
+        self.inventario = inventario.Inventario(capacidad)
+
+
+def motor_compras():
+    motor = per.MotorMisiones()
+    motor.agregar(per.Mision("Gasta 100 de dinero", "Gastador", 0, per.TipoEvento.DINERO_GASTADO, "", 100))
+    motor.agregar(per.Mision("Que te rechacen dos compras", "Sin blanca", 0,
+                             per.TipoEvento.COMPRA_RECHAZADA, "", 2))
+    return motor
+
+
+def test_compra_cobra_agrega_y_emite_lo_gastado():
+    tienda = tienda_juego.crear_tienda()
+    comida = tienda.buscar_por_nombre("Comida")
+    jugador, motor = Jugador(200), motor_compras()
+
+    assert tienda_juego.comprar(tienda, jugador, [(comida.id, 3)], motor)
+    assert jugador.dinero == 140
+    assert jugador.inventario.cantidad(comida) == 3
+    assert motor.obtener(0).progreso == 60
+    assert motor.obtener(1).progreso == 0
+
+
+def test_compra_sin_dinero_se_rechaza_sin_tocar_nada():
+    tienda = tienda_juego.crear_tienda()
+    ropa = tienda.buscar_por_nombre("Ropa")
+    jugador, motor = Jugador(70), motor_compras()
+
+    assert not tienda_juego.comprar(tienda, jugador, [(ropa.id, 2)], motor)
+    assert jugador.dinero == 70
+    assert jugador.inventario.contenido == []
+    assert motor.obtener(0).progreso == 0
+    assert motor.obtener(1).progreso == 1
+
+
+def test_compra_que_no_entra_en_el_inventario_no_cobra():
+    tienda = tienda_juego.crear_tienda()
+    agua = tienda.buscar_por_nombre("Agua potable (botella)")
+    comida = tienda.buscar_por_nombre("Comida")
+    jugador, motor = Jugador(10000, capacidad=1), motor_compras()
+    jugador.inventario.agregar_objeto(agua, 90)
+
+    assert not tienda_juego.comprar(tienda, jugador, [(agua.id, 5), (comida.id, 1)], motor)
+    assert jugador.dinero == 10000
+    assert jugador.inventario.cantidad(agua) == 90
+    assert jugador.inventario.cantidad(comida) == 0
+    assert motor.obtener(1).progreso == 1
+
+
+def test_carrito_invalido_lanza_antes_de_tocar_nada():
+    tienda = tienda_juego.crear_tienda()
+    comida = tienda.buscar_por_nombre("Comida")
+    jugador, motor = Jugador(200), motor_compras()
+
+    with pytest.raises(ValueError):
+        tienda_juego.comprar(tienda, jugador, [(comida.id, 0)], motor)
+    with pytest.raises(IndexError):
+        tienda_juego.comprar(tienda, jugador, [(comida.id, 1), (99, 1)], motor)
+    assert jugador.dinero == 200
+    assert jugador.inventario.contenido == []
+    assert motor.obtener(1).progreso == 0
+
+
+@pytest.mark.parametrize("cantidad", [0, -5])
+def test_emitir_rechaza_cantidades_no_positivas(cantidad):
+    motor = motor_compras()
+    with pytest.raises(ValueError):
+        motor.emitir(per.TipoEvento.DINERO_GASTADO, "", cantidad)
+    assert motor.obtener(0).progreso == 0
+
+
+def test_un_producto_no_se_comparte_entre_tiendas():
+    primera, segunda = per.Tienda(), per.Tienda()
+    primera.agregar_producto(per.Bien("Pan", 2.0))
+    ropa = per.Bien("Ropa", 50.0)
+    assert primera.agregar_producto(ropa) == 1
+
+    with pytest.raises(ValueError):
+        segunda.agregar_producto(ropa)
+    with pytest.raises(ValueError):
+        primera.agregar_producto(ropa)
+    assert ropa.id == 1
+    assert primera.buscar(1) is ropa
+    assert len(segunda) == 0